@@ -2,7 +2,7 @@ import sys
 from logging.config import fileConfig
 from pathlib import Path
 
-from sqlalchemy import engine_from_config, pool
+from sqlalchemy import engine_from_config, pool, text
 from sqlmodel import SQLModel
 
 from alembic import context
@@ -15,6 +15,8 @@ from app.core.config import settings
 
 # 모든 모델을 import하여 SQLModel.metadata에 등록
 from app.api.users.models import User  # noqa: F401
+from app.core.outbox import OutboxEvent  # noqa: F401
+from app.core.sharding import UserDirectory  # noqa: F401
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -71,6 +73,12 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    # 호출자가 연결을 넘기면 그대로 사용 (인덱스 감사의 헤드 스키마 재현 등)
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run_with_connection(connection)
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
@@ -78,12 +86,36 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(
-            connection=connection, target_metadata=target_metadata
-        )
+        _run_with_connection(connection)
+
 
-        with context.begin_transaction():
+def _run_with_connection(connection) -> None:
+    if connection.dialect.name == "postgresql":
+        # 잠금을 오래 기다리는 DDL 뒤로 서비스 쿼리가 줄 서지 않도록 세션 전체에 적용
+        lock_timeout = config.attributes.get("lock_timeout") or settings.MIGRATION_LOCK_TIMEOUT
+        connection.execute(
+            text("SELECT set_config('lock_timeout', :value, false)"),
+            {"value": lock_timeout},
+        )
+        connection.commit()
+
+    if config.attributes.get("dry_run"):
+        # 드라이런: 모든 변경을 하나의 외부 트랜잭션에서 실행한 뒤 롤백
+        # (configure 전에 시작해야 Alembic이 리비전별로 커밋하지 않음)
+        with connection.begin() as transaction:
+            context.configure(
+                connection=connection, target_metadata=target_metadata
+            )
             context.run_migrations()
+            transaction.rollback()
+        return
+
+    context.configure(
+        connection=connection, target_metadata=target_metadata
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
 
 
 if context.is_offline_mode():
@@ -0,0 +1,22 @@
+"""Add login activity columns to users
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+revision: str = "002"
+down_revision: Union[str, Sequence[str], None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+def upgrade() -> None:
+    # nullable 컬럼과 상수 server_default는 테이블 재작성 없이 추가됨 (PostgreSQL 11+)
+    op.add_column("users", sa.Column("last_login_at", sa.DateTime(), nullable=True))
+    op.add_column(
+        "users",
+        sa.Column("login_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+def downgrade() -> None:
+    op.drop_column("users", "login_count")
+    op.drop_column("users", "last_login_at")
@@ -0,0 +1,41 @@
+"""Create outbox_events table
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+revision: str = "003"
+down_revision: Union[str, Sequence[str], None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+def upgrade() -> None:
+    op.create_table(
+        "outbox_events",
+        # SQLite는 INTEGER PRIMARY KEY만 자동 증가하므로 모델과 같은 변형 타입 사용
+        sa.Column(
+            "id",
+            sa.BigInteger().with_variant(sa.Integer(), "sqlite"),
+            autoincrement=True,
+            nullable=False,
+        ),
+        sa.Column("aggregate_type", sa.String(length=50), nullable=False),
+        sa.Column("aggregate_id", sa.Integer(), nullable=False),
+        sa.Column("event_type", sa.String(length=100), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("published_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    # 미발행 이벤트만 담는 부분 인덱스
+    op.create_index(
+        "idx_outbox_unpublished",
+        "outbox_events",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("published_at IS NULL"),
+    )
+def downgrade() -> None:
+    op.drop_index("idx_outbox_unpublished", table_name="outbox_events")
+    op.drop_table("outbox_events")
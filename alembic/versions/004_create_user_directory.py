@@ -0,0 +1,26 @@
+"""Create user_directory table
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+revision: str = "004"
+down_revision: Union[str, Sequence[str], None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+def upgrade() -> None:
+    # 샤딩 시 DATABASE_URL에서만 사용 (샤드 DB에서는 빈 테이블로 남음)
+    op.create_table(
+        "user_directory",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=False),
+        sa.Column("shard_id", sa.String(length=50), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("idx_user_directory_email", "user_directory", ["email"], unique=True)
+def downgrade() -> None:
+    op.drop_index("idx_user_directory_email", table_name="user_directory")
+    op.drop_table("user_directory")
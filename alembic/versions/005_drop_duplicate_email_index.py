@@ -0,0 +1,26 @@
+"""Drop duplicate email index
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+from app.core.migrations import (
+    drop_index_concurrently,
+    index_is_unique,
+    rebuild_index_unique,
+)
+revision: str = "005"
+down_revision: Union[str, Sequence[str], None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+def upgrade() -> None:
+    # create_all로 만든 DB에는 유일 인덱스 ix_users_email과 유일하지 않은 idx_user_email이
+    # 함께 있으므로, 이메일 유일성을 잃지 않도록 idx_user_email을 먼저 유일 인덱스로 교체
+    # (Alembic으로 만든 DB는 이미 유일, 오프라인 SQL은 확인할 수 없어 항상 교체)
+    if not index_is_unique("idx_user_email", "users"):
+        rebuild_index_unique("idx_user_email", "users", ["email"])
+    # 그 뒤 중복이 된 ix_users_email 제거 (Alembic으로 만든 DB에는 없어 IF EXISTS로 건너뜀)
+    drop_index_concurrently("ix_users_email", "users")
+def downgrade() -> None:
+    # 원래 없던 DB에도 중복 인덱스가 생기므로 다시 만들지 않음
+    pass
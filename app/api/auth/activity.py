@@ -0,0 +1,152 @@
+"""로그인 활동 기록 (write-behind).
+
+로그인 경로에 UPDATE를 추가하지 않도록 마지막 로그인 시간과 횟수를
+프로세스 메모리에 모았다가 주기적으로 한 번의 UPDATE 문으로 반영한다.
+프로세스가 비정상 종료되면 최대 한 주기(LOGIN_ACTIVITY_FLUSH_SECONDS)의
+기록이 유실된다.
+"""
+import logging
+import threading
+from datetime import datetime
+
+from sqlalchemy import (
+    DateTime,
+    Engine,
+    Integer,
+    case,
+    column,
+    or_,
+    text,
+    update,
+    values,
+)
+
+from app.api.users.models import User
+from app.core.config import settings
+from app.core.sharding import engine_for_user
+
+logger = logging.getLogger(__name__)
+
+
+class LoginActivityTracker:
+    """로그인 기록을 모아 주기적으로 일괄 반영하는 추적기."""
+
+    def __init__(self, flush_interval: float):
+        self.flush_interval = flush_interval
+        # user_id -> (마지막 로그인 시간, 누적 횟수)
+        self._pending: dict[int, tuple[datetime, int]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def record(self, user_id: int, logged_in_at: datetime | None = None) -> None:
+        """로그인 한 건을 기록 (DB에 쓰지 않음)."""
+        logged_in_at = logged_in_at or datetime.utcnow()
+        with self._lock:
+            last, count = self._pending.get(user_id, (logged_in_at, 0))
+            self._pending[user_id] = (max(last, logged_in_at), count + 1)
+
+    def _merge_back(self, rows: dict[int, tuple[datetime, int]]) -> None:
+        with self._lock:
+            for user_id, (last, count) in rows.items():
+                pending_last, pending_count = self._pending.get(user_id, (last, 0))
+                self._pending[user_id] = (max(last, pending_last), count + pending_count)
+
+    def flush(self) -> int:
+        """대기 중인 기록을 (샤드마다) 한 번의 UPDATE로 반영하고 반영한 사용자 수를 반환."""
+        with self._lock:
+            rows, self._pending = self._pending, {}
+        if not rows:
+            return 0
+
+        # 샤딩 시 사용자 행이 있는 샤드별로 나눠 반영
+        batches: dict[Engine, dict[int, tuple[datetime, int]]] = {}
+        for user_id, row in rows.items():
+            batches.setdefault(engine_for_user(user_id), {})[user_id] = row
+
+        written = 0
+        for target, batch in batches.items():
+            try:
+                self._write(target, batch)
+            except Exception as e:
+                logger.error(f"로그인 기록 반영 실패, 다음 주기에 재시도 - Error: {str(e)}")
+                self._merge_back(batch)
+                continue
+            written += len(batch)
+
+        logger.debug(f"로그인 기록 반영 완료 - {written}명")
+        return written
+
+    @classmethod
+    def _write(cls, target: Engine, rows: dict[int, tuple[datetime, int]]) -> None:
+        with target.begin() as conn:
+            if conn.dialect.name == "postgresql":
+                conn.execute(cls._batched_update(rows))
+            else:
+                # UPDATE ... FROM (VALUES ...)를 지원하지 않는 DB용
+                conn.execute(
+                    text(
+                        "UPDATE users SET "
+                        "last_login_at = CASE WHEN last_login_at IS NULL "
+                        "OR last_login_at < :last_login_at "
+                        "THEN :last_login_at ELSE last_login_at END, "
+                        "login_count = login_count + :login_count "
+                        "WHERE id = :id"
+                    ),
+                    [
+                        {"id": user_id, "last_login_at": last, "login_count": count}
+                        for user_id, (last, count) in rows.items()
+                    ],
+                )
+
+    @staticmethod
+    def _batched_update(rows: dict[int, tuple[datetime, int]]):
+        """UPDATE users ... FROM (VALUES ...) 문 생성."""
+        batch = values(
+            column("id", Integer),
+            column("last_login_at", DateTime),
+            column("login_count", Integer),
+            name="batch",
+        ).data([(user_id, last, count) for user_id, (last, count) in rows.items()])
+        return (
+            update(User)
+            .values(
+                last_login_at=case(
+                    (
+                        or_(
+                            User.last_login_at.is_(None),
+                            User.last_login_at < batch.c.last_login_at,
+                        ),
+                        batch.c.last_login_at,
+                    ),
+                    else_=User.last_login_at,
+                ),
+                login_count=User.login_count + batch.c.login_count,
+            )
+            .where(User.id == batch.c.id)
+        )
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def start(self) -> None:
+        """주기적 반영 스레드 시작."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="login-activity-flush", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """스레드를 멈추고 남은 기록을 반영."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+
+login_activity = LoginActivityTracker(settings.LOGIN_ACTIVITY_FLUSH_SECONDS)
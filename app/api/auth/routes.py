@@ -1,13 +1,12 @@
 import logging
 
 from fastapi import APIRouter, Depends, Request, status
-from sqlmodel import Session
 
 from app.api.auth.schemas import Token, UserLogin
 from app.api.auth.service import AuthService
-from app.api.users.models import User
+from app.api.users.queries import UserRow
 from app.api.users.schemas import UserCreate, UserResponse
-from app.core.database import get_session
+from app.core.database import LazySession, get_session
 from app.core.security import get_current_user
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -20,13 +19,17 @@ logger = logging.getLogger(__name__)
 async def register(
     user: UserCreate,
     request: Request,
-    session: Session = Depends(get_session),
+    session: LazySession = Depends(get_session),
 ):
     """새 사용자를 등록합니다 (회원가입)."""
     request_id = getattr(request.state, "request_id", "unknown")
     logger.info(f"회원가입 요청 - Email: {user.email}, RequestID: {request_id}")
     try:
-        registered_user = AuthService.register(session, user)
+        AuthService.validate_registration(session, user)
+        # 해싱(수백 ms) 동안 연결을 점유하지 않도록 조회 트랜잭션을 끝내고 반환
+        session.release()
+        registered_user = await AuthService.register(session, user)
+        session.release()
         logger.info(f"회원가입 완료 - Email: {user.email}, UserID: {registered_user.id}")
         return registered_user
     except Exception as e:
@@ -38,13 +41,17 @@ async def register(
 async def login(
     user: UserLogin,
     request: Request,
-    session: Session = Depends(get_session),
+    session: LazySession = Depends(get_session),
 ):
     """사용자 로그인 (JWT 토큰 발급)."""
     request_id = getattr(request.state, "request_id", "unknown")
     logger.info(f"로그인 요청 - Email: {user.email}, RequestID: {request_id}")
     try:
-        token = AuthService.login(session, user)
+        db_user = AuthService.get_login_user(session, user)
+        # 검증(수백 ms) 동안 연결을 점유하지 않도록 조회 트랜잭션을 끝내고 반환
+        session.release()
+        token = await AuthService.login(session, user, db_user)
+        session.release()
         logger.info(f"로그인 성공 - Email: {user.email}")
         return token
     except Exception as e:
@@ -55,7 +62,7 @@ async def login(
 @router.get("/me", response_model=UserResponse)
 async def get_me(
     request: Request,
-    current_user: User = Depends(get_current_user),
+    current_user: UserRow = Depends(get_current_user),
 ):
     """현재 로그인한 사용자 정보를 조회합니다."""
     request_id = getattr(request.state, "request_id", "unknown")
@@ -1,45 +1,73 @@
+import logging
 from datetime import timedelta
 
 from fastapi import HTTPException, status
 from sqlmodel import Session
 
+from app.api.auth.activity import login_activity
 from app.api.auth.schemas import UserLogin
 from app.api.users.models import User
+from app.api.users.queries import UserRow
 from app.api.users.schemas import UserCreate
 from app.api.users.service import UserService
 from app.core.config import settings
-from app.core.security import create_access_token, verify_password
+from app.core.security import create_access_token, verify_and_update_password
+
+logger = logging.getLogger(__name__)
 
 
 class AuthService:
     """인증 관련 비즈니스 로직을 처리하는 서비스"""
 
     @staticmethod
-    def register(session: Session, user_data: UserCreate) -> User:
-        """회원가입"""
-        return UserService.create_user(session, user_data)
+    def validate_registration(session: Session, user_data: UserCreate) -> None:
+        """회원가입 전 이메일 중복 확인"""
+        UserService.ensure_email_available(session, user_data.email)
 
     @staticmethod
-    def login(session: Session, login_data: UserLogin) -> dict:
-        """로그인 및 JWT 토큰 발급"""
-        # 이메일로 사용자 조회
-        db_user = UserService.get_user_by_email(session, login_data.email)
+    async def register(session: Session, user_data: UserCreate) -> User:
+        """회원가입 (validate_registration으로 확인한 뒤 호출)"""
+        return await UserService.create_user(session, user_data)
 
+    @staticmethod
+    def get_login_user(session: Session, login_data: UserLogin) -> UserRow:
+        """로그인할 사용자 조회 (없으면 401)"""
+        db_user = UserService.get_user_by_email(session, login_data.email)
         if not db_user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="이메일 또는 패스워드가 올바르지 않습니다",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        return db_user
 
-        # 패스워드 검증
-        if not verify_password(login_data.password, db_user.hashed_password):
+    @staticmethod
+    async def login(session: Session, login_data: UserLogin, db_user: UserRow) -> dict:
+        """get_login_user로 조회한 사용자의 패스워드를 검증하고 JWT 토큰 발급"""
+        # 패스워드 검증 (현재 정책보다 약한 해시면 새 해시도 함께 계산)
+        valid, new_hash = await verify_and_update_password(
+            login_data.password, db_user.hashed_password
+        )
+        if not valid:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="이메일 또는 패스워드가 올바르지 않습니다",
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
+        if new_hash:
+            # 재해시 저장 실패는 로그인을 막지 않음 (다음 로그인에서 다시 시도)
+            try:
+                UserService.upgrade_password_hash(session, db_user, new_hash)
+            except Exception as e:
+                session.rollback()
+                logger.warning(
+                    f"패스워드 해시 갱신 실패 - UserID: {db_user.id}, Error: {str(e)}"
+                )
+
+        # 로그인 기록 (주기적으로 일괄 반영되므로 로그인 경로에 쓰기가 없음)
+        login_activity.record(db_user.id)
+
         # JWT 토큰 생성
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
@@ -49,6 +77,6 @@ class AuthService:
         return {"access_token": access_token, "token_type": "bearer"}
 
     @staticmethod
-    def get_current_user_info(current_user: User) -> User:
+    def get_current_user_info(current_user: UserRow) -> UserRow:
         """현재 로그인한 사용자 정보 반환"""
         return current_user
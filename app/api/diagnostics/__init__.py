@@ -0,0 +1,4 @@
+"""진단 API 패키지."""
+from app.api.diagnostics.routes import router
+
+__all__ = ["router"]
@@ -0,0 +1,69 @@
+import logging
+import os
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.core.admission import admission_controller
+from app.core.config import settings
+from app.core.database import pool_status, shard_engines
+from app.core.hashing import password_hasher
+from app.core.profiling import profile_store
+from app.core.resources import budget
+from app.core.security import get_current_admin, hash_queue_size
+
+router = APIRouter(prefix="/diagnostics", tags=["diagnostics"])
+logger = logging.getLogger(__name__)
+
+
+def _ensure_profiling_enabled() -> None:
+    """프로파일링이 비활성화된 경우 404를 반환."""
+    if not settings.PROFILING_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="프로파일링이 비활성화되어 있습니다",
+        )
+
+
+# 워커 수, 풀 크기, 리미터 상태 등 운영 정보이므로 진단 API는 모두 관리자만 조회
+@router.get("/resources", dependencies=[Depends(get_current_admin)])
+async def get_resources():
+    """프로세스별 리소스 예산과 현재 사용 현황을 조회합니다."""
+    return {
+        "pid": os.getpid(),
+        "budget": budget.as_dict(),
+        "db_pool": pool_status(),
+        "shard_db_pools": {
+            shard_id: pool_status(shard_engine) for shard_id, shard_engine in shard_engines.items()
+        },
+        "hash_queue_size": hash_queue_size(),
+        "password_hashing": password_hasher.policy.as_dict(),
+    }
+
+
+@router.get("/admission", dependencies=[Depends(get_current_admin)])
+async def get_admission():
+    """어드미션 컨트롤 현황과 거절(shed) 횟수를 조회합니다."""
+    return admission_controller.as_dict()
+
+
+@router.get("/profiles", dependencies=[Depends(get_current_admin)])
+async def list_profiles(limit: int = 50):
+    """최근 기록된 요청 프로파일 요약 목록을 조회합니다."""
+    _ensure_profiling_enabled()
+    return [profile.summary() for profile in profile_store.list()[:limit]]
+
+
+@router.get("/profiles/{request_id}", dependencies=[Depends(get_current_admin)])
+async def get_profile(request_id: str, format: Literal["json", "speedscope"] = "json"):
+    """Request ID로 요청 프로파일 상세를 조회합니다."""
+    _ensure_profiling_enabled()
+    profile = profile_store.get(request_id)
+    if not profile:
+        logger.warning(f"프로파일을 찾을 수 없음 - RequestID: {request_id}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="프로파일을 찾을 수 없습니다"
+        )
+    if format == "speedscope":
+        return profile.to_speedscope()
+    return profile.to_dict()
@@ -0,0 +1,267 @@
+"""사용자 백그라운드 작업 (RQ low 큐, `rq worker low`로 실행)."""
+import logging
+import time
+from collections import defaultdict
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+
+from rq import get_current_job
+from sqlalchemy import (
+    ARRAY,
+    Engine,
+    Integer,
+    Row,
+    any_,
+    bindparam,
+    delete,
+    insert,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+
+from app.api.users.models import User
+from app.api.users.service import USER_AGGREGATE, deleted_user_payload
+from app.core.config import settings
+from app.core.database import engine, shard_engines
+from app.core.outbox import add_outbox_events
+from app.core.sharding import UserDirectory, engine_for_user, release_users
+
+logger = logging.getLogger(__name__)
+
+users = User.__table__
+directory = UserDirectory.__table__
+
+
+def _id_filter(target: Engine, user_ids: list[int]):
+    if target.dialect.name == "postgresql":
+        # 배열 파라미터 하나로 보내 청크 크기와 관계없이 같은 SQL(문 캐시 재사용)
+        return users.c.id == any_(bindparam("user_ids", user_ids, type_=ARRAY(Integer)))
+    return users.c.id.in_(user_ids)
+
+
+def _delete_chunk(target: Engine, user_ids: list[int]) -> int:
+    """한 트랜잭션에서 사용자 행을 지우고 삭제 이벤트를 아웃박스에 일괄 기록."""
+    with Session(target) as session:
+        rows = session.execute(
+            delete(users).where(_id_filter(target, user_ids)).returning(users.c.id)
+        ).all()
+        # 이미 삭제된 ID는 건너뜀 (실패한 작업을 같은 ID로 다시 실행해도 안전)
+        add_outbox_events(
+            session,
+            USER_AGGREGATE,
+            "user.deleted",
+            {row.id: deleted_user_payload(row.id) for row in rows},
+        )
+        session.commit()
+    if shard_engines and rows:
+        release_users([row.id for row in rows])
+    return len(rows)
+
+
+def _report(progress: dict[str, int]) -> None:
+    """진행 상황을 job.meta에 저장 (작업 상태 API가 읽음)."""
+    job = get_current_job()
+    if job is not None:
+        job.meta.update(progress)
+        job.save_meta()
+
+
+def purge_users(user_ids: list[int]) -> dict[str, int]:
+    """사용자 일괄 삭제.
+
+    ID를 샤드별로 나눠 USER_PURGE_CHUNK_SIZE개씩 삭제하고, 청크 사이에는
+    USER_PURGE_THROTTLE_SECONDS만큼 쉬어 다른 요청에 DB를 양보한다.
+    삭제된 사용자마다 user.deleted 이벤트가 청크 단위로 기록되어 이벤트 소비자와
+    변경 피드 구독자가 캐시를 한꺼번에 무효화한다. 중간에 실패하면 커밋된 청크는
+    유지되고, 진행 상황(processed, deleted)은 작업 상태에 남는다.
+    """
+    ids = sorted(set(user_ids))
+    groups: dict[Engine, list[int]] = defaultdict(list)
+    for user_id in ids:
+        groups[engine_for_user(user_id)].append(user_id)
+
+    chunk_size = settings.USER_PURGE_CHUNK_SIZE
+    progress = {"total": len(ids), "processed": 0, "deleted": 0}
+    _report(progress)
+    start = time.perf_counter()
+    for target, group in groups.items():
+        for offset in range(0, len(group), chunk_size):
+            if progress["processed"]:
+                time.sleep(settings.USER_PURGE_THROTTLE_SECONDS)
+            chunk = group[offset : offset + chunk_size]
+            progress["deleted"] += _delete_chunk(target, chunk)
+            progress["processed"] += len(chunk)
+            _report(progress)
+
+    logger.info(
+        f"사용자 일괄 삭제 완료 - 요청: {progress['total']}명, "
+        f"삭제: {progress['deleted']}명, 소요 시간: {time.perf_counter() - start:.1f}s"
+    )
+    return progress
+
+
+def _fix_directory_email(user_id: int, email: str) -> bool:
+    """디렉터리 항목의 이메일을 샤드 행의 이메일로 맞춤 (다른 항목이 쓰는 이메일이면 False)."""
+    with Session(engine) as session:
+        try:
+            session.execute(
+                update(directory).where(directory.c.id == user_id).values(email=email)
+            )
+            session.commit()
+            return True
+        except IntegrityError:
+            session.rollback()
+            logger.warning(f"디렉터리 이메일 수정 실패 (이메일 충돌) - UserID: {user_id}")
+            return False
+
+
+def _check_directory_entries(
+    entries: Sequence[Row], cutoff: datetime, dry_run: bool, counts: dict[str, int]
+) -> None:
+    """디렉터리 항목 한 배치를 샤드 행과 비교해 고아 항목을 지우고 이메일을 맞춤."""
+    groups: dict[str, list[Row]] = defaultdict(list)
+    for entry in entries:
+        groups[entry.shard_id].append(entry)
+
+    for shard_id, group in groups.items():
+        shard_engine = shard_engines.get(shard_id)
+        if shard_engine is None:
+            logger.warning(
+                f"알 수 없는 샤드의 디렉터리 항목 - Shard: {shard_id}, Count: {len(group)}"
+            )
+            continue
+        with Session(shard_engine) as shard_session:
+            statement = select(users.c.id, users.c.email).where(
+                users.c.id.in_([entry.id for entry in group])
+            )
+            if not dry_run:
+                # 이메일 변경이 진행 중이면 그 트랜잭션이 끝난 뒤의 이메일을 읽음
+                # (UserService.update_user는 디렉터리를 바꾸기 전에 행을 잠금)
+                statement = statement.with_for_update()
+            emails = dict(shard_session.execute(statement).all())
+
+            # 방금 만든 항목은 샤드 쓰기가 진행 중인 가입일 수 있어 남겨 둠
+            orphans = [
+                entry.id
+                for entry in group
+                if entry.id not in emails and entry.created_at < cutoff
+            ]
+            renamed = [
+                (entry.id, emails[entry.id])
+                for entry in group
+                if entry.id in emails and emails[entry.id] != entry.email
+            ]
+            counts["removed"] += len(orphans)
+            if dry_run:
+                counts["renamed"] += len(renamed)
+                continue
+            if orphans:
+                release_users(orphans)
+            for user_id, email in renamed:
+                if _fix_directory_email(user_id, email):
+                    counts["renamed"] += 1
+                else:
+                    counts["conflicts"] += 1
+
+
+def _restore_directory_entries(
+    shard_id: str, rows: Sequence[Row], dry_run: bool, counts: dict[str, int]
+) -> None:
+    """디렉터리에 없는 샤드 행의 항목을 다시 만듦."""
+    with Session(engine) as session:
+        ids = [row.id for row in rows]
+        statement = select(directory.c.id).where(directory.c.id.in_(ids))
+        known = set(session.scalars(statement))
+        missing = [row for row in rows if row.id not in known]
+        if dry_run:
+            counts["restored"] += len(missing)
+            return
+        for row in missing:
+            try:
+                session.execute(
+                    insert(directory).values(
+                        id=row.id,
+                        email=row.email,
+                        shard_id=shard_id,
+                        created_at=datetime.utcnow(),
+                    )
+                )
+                session.commit()
+                counts["restored"] += 1
+            except IntegrityError:
+                session.rollback()
+                counts["conflicts"] += 1
+                logger.warning(f"디렉터리 항목 복구 실패 (이메일 충돌) - UserID: {row.id}")
+        if missing and engine.dialect.name == "postgresql":
+            # 복구한 ID가 시퀀스보다 크면 다음 가입이 같은 ID를 받지 않도록 시퀀스를 옮김
+            session.execute(
+                text(
+                    "SELECT setval(seq, :max_id) FROM (SELECT pg_get_serial_sequence"
+                    "('user_directory', 'id')::regclass AS seq) AS s "
+                    "WHERE coalesce(pg_sequence_last_value(seq), 0) < :max_id"
+                ),
+                {"max_id": max(row.id for row in missing)},
+            )
+            session.commit()
+
+
+def repair_user_directory(
+    dry_run: bool = False, grace_seconds: float | None = None
+) -> dict[str, int]:
+    """샤드의 users 행을 기준으로 이메일 디렉터리(user_directory)를 맞춤 (샤딩 시).
+
+    가입/이메일 변경/삭제는 디렉터리와 샤드에 따로 커밋하고 실패하면 보상하지만,
+    그 사이에 프로세스가 죽으면 둘이 어긋난다. 이 작업은 샤드 행이 없는 항목을
+    지우고(removed), 이메일이 다른 항목을 샤드 행에 맞추고(renamed), 디렉터리에
+    없는 샤드 행의 항목을 다시 만든다(restored). 이메일이 다른 항목과 겹쳐 고칠 수
+    없는 경우는 conflicts로 센다. dry_run이면 고칠 항목 수만 센다.
+    주기적으로 low 큐에 등록하거나 `python migrate.py repair-directory`로 실행한다.
+    """
+    counts = {"checked": 0, "removed": 0, "renamed": 0, "restored": 0, "conflicts": 0}
+    if not shard_engines:
+        return counts
+
+    if grace_seconds is None:
+        grace_seconds = settings.USER_DIRECTORY_REPAIR_GRACE_SECONDS
+    cutoff = datetime.utcnow() - timedelta(seconds=grace_seconds)
+    batch_size = settings.USER_DIRECTORY_REPAIR_BATCH_SIZE
+    start = time.perf_counter()
+
+    last_id = 0
+    while True:
+        with Session(engine) as session:
+            entries = session.execute(
+                select(directory)
+                .where(directory.c.id > last_id)
+                .order_by(directory.c.id)
+                .limit(batch_size)
+            ).all()
+        if not entries:
+            break
+        last_id = entries[-1].id
+        counts["checked"] += len(entries)
+        _check_directory_entries(entries, cutoff, dry_run, counts)
+
+    for shard_id, shard_engine in shard_engines.items():
+        last_id = 0
+        while True:
+            with Session(shard_engine) as session:
+                rows = session.execute(
+                    select(users.c.id, users.c.email)
+                    .where(users.c.id > last_id)
+                    .order_by(users.c.id)
+                    .limit(batch_size)
+                ).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            _restore_directory_entries(shard_id, rows, dry_run, counts)
+
+    logger.info(
+        f"사용자 디렉터리 정리 {'점검' if dry_run else '완료'} - {counts}, "
+        f"소요 시간: {time.perf_counter() - start:.1f}s"
+    )
+    return counts
@@ -11,12 +11,7 @@ class User(SQLModel, table=True):
     __tablename__ = "users"
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    email: str = Field(
-        unique=True,
-        index=True,
-        max_length=255,
-        description="사용자 이메일 주소",
-    )
+    email: str = Field(max_length=255, description="사용자 이메일 주소")
     hashed_password: str = Field(max_length=255, description="해시된 패스워드")
     name: str = Field(max_length=100, description="사용자 이름")
     created_at: datetime = Field(
@@ -27,8 +22,18 @@ class User(SQLModel, table=True):
         default_factory=datetime.utcnow,
         description="수정 시간",
     )
+    last_login_at: Optional[datetime] = Field(
+        default=None,
+        description="마지막 로그인 시간",
+    )
+    login_count: int = Field(
+        default=0,
+        sa_column_kwargs={"server_default": "0"},
+        description="로그인 횟수",
+    )
 
     __table_args__ = (
-        Index("idx_user_email", "email"),
+        # 이메일 유일성은 이 인덱스 하나로 보장 (마이그레이션 001과 동일)
+        Index("idx_user_email", "email", unique=True),
         Index("idx_user_created_at", "created_at"),
     )
@@ -0,0 +1,53 @@
+"""사용자 읽기 전용 조회 (lean 경로).
+
+자주 호출되는 단건 조회(ID/이메일 조회, 토큰 인증)는 ORM을 거치지 않는다.
+identity map 등록, 속성 계측, SQLModel 객체 생성 없이 Core 문을 실행해 불변
+Row를 그대로 반환한다. Row의 속성 이름은 User와 같아 UserResponse로 바로
+직렬화된다. 수정/삭제처럼 객체를 바꿔야 하는 경로는 계속 ORM(session.get)을 쓴다.
+
+문은 lambda_stmt로 만들어 호출 위치(람다 코드)를 캐시 키로 SQL 구성과 컴파일
+결과를 재사용하고, 호출마다 조회 값만 바인드 파라미터로 바꾼다.
+"""
+from typing import Any
+
+from sqlalchemy import Row, lambda_stmt, select
+from sqlmodel import Session
+
+from app.api.users.models import User
+from app.core.database import shard_engines
+from app.core.sharding import lookup_email, shard_for_user
+
+# 읽기 전용 사용자 행 (users 테이블 한 행, 속성 이름은 User와 같음)
+UserRow = Row[Any]
+
+users = User.__table__
+
+
+def _first(session: Session, statement, shard_id: str | None) -> UserRow | None:
+    # 샤딩 세션은 Core 문의 샤드를 추론하지 않으므로 직접 지정
+    bind_arguments = {"shard_id": shard_id} if shard_id else None
+    return session.execute(statement, bind_arguments=bind_arguments).first()
+
+
+def user_row_by_id(session: Session, user_id: int) -> UserRow | None:
+    """ID로 사용자 행 조회."""
+    shard_id = shard_for_user(user_id) if shard_engines else None
+    return _first(
+        session,
+        lambda_stmt(lambda: select(users).where(users.c.id == user_id)),
+        shard_id,
+    )
+
+
+def user_row_by_email(session: Session, email: str) -> UserRow | None:
+    """이메일로 사용자 행 조회."""
+    shard_id = None
+    if shard_engines:
+        shard_id = lookup_email(email)
+        if shard_id is None:
+            return None
+    return _first(
+        session,
+        lambda_stmt(lambda: select(users).where(users.c.email == email)),
+        shard_id,
+    )
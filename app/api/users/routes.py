@@ -1,13 +1,31 @@
 import logging
+from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
-from sqlmodel import Session
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    status,
+)
+from fastapi.responses import StreamingResponse
 
-from app.api.users.models import User
-from app.api.users.schemas import UserCreate, UserResponse, UserUpdate
+from app.api.users.queries import UserRow
+from app.api.users.schemas import (
+    UserBulkDelete,
+    UserBulkDeleteJob,
+    UserCreate,
+    UserEventPage,
+    UserResponse,
+    UserUpdate,
+)
 from app.api.users.service import UserService
-from app.core.database import get_session
-from app.core.security import get_current_user
+from app.core.change_feed import change_feed, stream_changes
+from app.core.database import LazySession, get_session
+from app.core.outbox import parse_event_cursor, read_events
+from app.core.security import get_current_admin, get_current_user
 
 router = APIRouter(prefix="/users", tags=["users"])
 logger = logging.getLogger(__name__)
@@ -17,13 +35,17 @@ logger = logging.getLogger(__name__)
 async def create_user(
     user: UserCreate,
     request: Request,
-    session: Session = Depends(get_session),
+    session: LazySession = Depends(get_session),
 ):
     """새 사용자를 생성합니다 (관리자용)."""
     request_id = getattr(request.state, "request_id", "unknown")
     logger.info(f"사용자 생성 요청 - Email: {user.email}, RequestID: {request_id}")
     try:
-        created_user = UserService.create_user(session, user)
+        UserService.ensure_email_available(session, user.email)
+        # 해싱(수백 ms) 동안 연결을 점유하지 않도록 조회 트랜잭션을 끝내고 반환
+        session.release()
+        created_user = await UserService.create_user(session, user)
+        session.release()
         logger.info(f"사용자 생성 완료 - ID: {created_user.id}, Email: {created_user.email}")
         return created_user
     except Exception as e:
@@ -31,16 +53,111 @@ async def create_user(
         raise
 
 
+@router.get("/events", response_model=UserEventPage)
+async def list_user_events(
+    request: Request,
+    after: str = Query(default="0", description="이전 응답의 next_cursor"),
+    limit: int = Query(default=100, ge=1, le=1000),
+):
+    """사용자 생성/수정/삭제 이벤트를 커서 이후부터 조회합니다 (증분 소비용)."""
+    request_id = getattr(request.state, "request_id", "unknown")
+    logger.info(f"사용자 이벤트 조회 요청 - After: {after}, RequestID: {request_id}")
+    try:
+        events, next_cursor = read_events(after, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="after는 이전 응답의 next_cursor(스트림 ID)여야 합니다",
+        ) from e
+    return {"events": events, "next_cursor": next_cursor}
+
+
+@router.get("/changes", response_class=StreamingResponse)
+async def stream_user_changes(
+    request: Request,
+    after: str | None = Query(
+        default=None, description="이 커서(이전에 받은 SSE id) 이후부터 전송"
+    ),
+    last_event_id: str | None = Header(default=None),
+):
+    """사용자 변경 이벤트를 Server-Sent Events로 전송합니다.
+
+    재연결 시 브라우저가 보내는 Last-Event-ID(또는 after) 이후의 이벤트를
+    먼저 보낸 뒤 실시간 변경을 이어서 전송합니다. 이어받기는 최선 노력으로,
+    늦게 커밋된 이벤트를 잡기 위해 이미 받은 최근 이벤트를 다시 보낼 수 있으므로
+    클라이언트는 data의 event_id로 중복을 걸러야 합니다.
+    """
+    request_id = getattr(request.state, "request_id", "unknown")
+    if last_event_id is not None:
+        after = last_event_id
+    cursor = None
+    if after is not None:
+        try:
+            cursor = parse_event_cursor(after)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Last-Event-ID는 이전에 받은 이벤트의 id여야 합니다",
+            ) from e
+    change_feed.check_capacity()
+    logger.info(f"사용자 변경 피드 구독 - After: {after}, RequestID: {request_id}")
+    return StreamingResponse(
+        stream_changes(change_feed, cursor),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post(
+    "/bulk-delete",
+    response_model=UserBulkDeleteJob,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def bulk_delete_users(
+    payload: UserBulkDelete,
+    request: Request,
+    admin: UserRow = Depends(get_current_admin),
+):
+    """사용자를 일괄 삭제하는 백그라운드 작업을 등록합니다 (관리자만 가능)."""
+    request_id = getattr(request.state, "request_id", "unknown")
+    logger.info(
+        f"사용자 일괄 삭제 요청 - Count: {len(payload.user_ids)}, "
+        f"Admin: {admin.id}, RequestID: {request_id}"
+    )
+    try:
+        job = UserService.enqueue_bulk_delete(payload.user_ids)
+        logger.info(f"사용자 일괄 삭제 작업 등록 - JobID: {job['job_id']}")
+        return job
+    except Exception as e:
+        logger.error(f"사용자 일괄 삭제 작업 등록 실패 - Error: {str(e)}")
+        raise
+
+
+@router.get("/bulk-delete/{job_id}", response_model=UserBulkDeleteJob)
+async def get_bulk_delete_job(
+    job_id: str,
+    admin: UserRow = Depends(get_current_admin),
+):
+    """사용자 일괄 삭제 작업의 상태와 진행률을 조회합니다 (관리자만 가능)."""
+    job = UserService.get_bulk_delete_job(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="작업을 찾을 수 없습니다"
+        )
+    return job
+
+
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: int,
     request: Request,
-    session: Session = Depends(get_session),
+    session: LazySession = Depends(get_session),
 ):
     """특정 사용자를 조회합니다."""
     request_id = getattr(request.state, "request_id", "unknown")
     logger.info(f"사용자 조회 요청 - UserID: {user_id}, RequestID: {request_id}")
     user = UserService.get_user_by_id(session, user_id)
+    session.release()
     if not user:
         logger.warning(f"사용자를 찾을 수 없음 - UserID: {user_id}")
         raise HTTPException(
@@ -53,12 +170,23 @@ async def get_user(
 @router.get("", response_model=list[UserResponse])
 async def list_users(
     request: Request,
-    session: Session = Depends(get_session),
+    limit: int = Query(default=100, ge=1, le=1000),
+    after_created_at: datetime | None = Query(
+        default=None, description="이전 페이지 마지막 사용자의 created_at"
+    ),
+    after_id: int | None = Query(default=None, description="이전 페이지 마지막 사용자의 id"),
+    session: LazySession = Depends(get_session),
 ):
-    """모든 사용자를 조회합니다."""
+    """사용자를 생성 순서로 조회합니다 (after_created_at/after_id로 다음 페이지)."""
     request_id = getattr(request.state, "request_id", "unknown")
     logger.info(f"사용자 목록 조회 요청 - RequestID: {request_id}")
-    users = UserService.get_all_users(session)
+    if (after_created_at is None) != (after_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="after_created_at과 after_id는 함께 지정해야 합니다",
+        )
+    users = UserService.list_users(session, limit, after_created_at, after_id)
+    session.release()
     logger.info(f"사용자 목록 조회 완료 - 총 {len(users)}명")
     return users
 
@@ -68,8 +196,8 @@ async def update_user(
     user_id: int,
     user_update: UserUpdate,
     request: Request,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    session: LazySession = Depends(get_session),
+    current_user: UserRow = Depends(get_current_user),
 ):
     """사용자 정보를 수정합니다 (본인만 가능)."""
     request_id = getattr(request.state, "request_id", "unknown")
@@ -78,7 +206,10 @@ async def update_user(
         f"CurrentUser: {current_user.id}, RequestID: {request_id}"
     )
     try:
-        updated_user = UserService.update_user(session, user_id, user_update, current_user)
+        updated_user = await UserService.update_user(
+            session, user_id, user_update, current_user
+        )
+        session.release()
         logger.info(f"사용자 정보 수정 완료 - UserID: {user_id}")
         return updated_user
     except Exception as e:
@@ -90,8 +221,8 @@ async def update_user(
 async def delete_user(
     user_id: int,
     request: Request,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    session: LazySession = Depends(get_session),
+    current_user: UserRow = Depends(get_current_user),
 ):
     """사용자를 삭제합니다 (본인만 가능)."""
     request_id = getattr(request.state, "request_id", "unknown")
@@ -101,6 +232,7 @@ async def delete_user(
     )
     try:
         UserService.delete_user(session, user_id, current_user)
+        session.release()
         logger.info(f"사용자 삭제 완료 - UserID: {user_id}")
     except Exception as e:
         logger.error(f"사용자 삭제 실패 - UserID: {user_id}, Error: {str(e)}")
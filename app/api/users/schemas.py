@@ -3,6 +3,8 @@ from typing import Optional
 
 from pydantic import BaseModel, EmailStr, Field
 
+from app.core.config import settings
+
 
 class UserCreate(BaseModel):
     """사용자 생성 스키마."""
@@ -28,6 +30,45 @@ class UserResponse(BaseModel):
     name: str
     created_at: datetime
     updated_at: datetime
+    last_login_at: Optional[datetime] = None
+    login_count: int = 0
 
     class Config:
         from_attributes = True
+
+
+class UserEvent(BaseModel):
+    """사용자 변경 이벤트 스키마."""
+
+    cursor: str
+    event_id: int
+    user_id: int
+    event_type: str
+    payload: dict
+    created_at: datetime
+
+
+class UserEventPage(BaseModel):
+    """사용자 변경 이벤트 페이지 (next_cursor로 이어서 조회)."""
+
+    events: list[UserEvent]
+    next_cursor: str
+
+
+class UserBulkDelete(BaseModel):
+    """사용자 일괄 삭제 요청 스키마."""
+
+    user_ids: list[int] = Field(min_length=1, max_length=settings.USER_PURGE_MAX_IDS)
+
+
+class UserBulkDeleteJob(BaseModel):
+    """사용자 일괄 삭제 작업 상태 스키마."""
+
+    job_id: str
+    status: str  # queued, started, finished, failed 등 RQ 작업 상태
+    total: int = 0
+    processed: int = 0  # 처리한 ID 수 (이미 없던 ID 포함)
+    deleted: int = 0
+    enqueued_at: Optional[datetime] = None
+    ended_at: Optional[datetime] = None
+    error: Optional[str] = None
@@ -1,102 +1,277 @@
+from datetime import datetime
+
 from fastapi import HTTPException, status
+from redis.exceptions import RedisError
+from sqlalchemy import and_, or_, update
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
 
 from app.api.users.models import User
-from app.api.users.schemas import UserCreate, UserUpdate
+from app.api.users.queries import UserRow, user_row_by_email, user_row_by_id
+from app.api.users.schemas import UserCreate, UserResponse, UserUpdate
+from app.core.config import settings
+from app.core.database import shard_engines
+from app.core.exceptions import ServiceOverloadedError
+from app.core.outbox import add_outbox_event
 from app.core.security import get_password_hash
+from app.core.sharding import allocate_user, release_user, rename_email
+
+USER_AGGREGATE = "user"
+PURGE_JOB_FUNC = "app.api.users.jobs.purge_users"
+
+
+def deleted_user_payload(user_id: int) -> dict:
+    """user.deleted 이벤트 payload.
+
+    삭제된 사용자의 이메일/이름이 아웃박스와 이벤트 스트림에 남지 않도록 ID만 담는다.
+    """
+    return {"id": user_id}
+
+
+def _record_user_event(session: Session, user: User, event_type: str, **extra) -> None:
+    """사용자 변경 이벤트를 같은 트랜잭션의 아웃박스에 기록."""
+    if event_type == "user.deleted":
+        payload = deleted_user_payload(user.id)
+    else:
+        payload = UserResponse.model_validate(user).model_dump(mode="json")
+    payload.update(extra)
+    add_outbox_event(session, USER_AGGREGATE, user.id, event_type, payload)
+
+
+def _claim_email(claim, *args):
+    """샤드 디렉터리에 이메일을 등록 (다른 사용자가 쓰는 이메일이면 400)."""
+    try:
+        return claim(*args)
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="이메일이 이미 등록되어 있습니다",
+        ) from None
 
 
 class UserService:
     """사용자 관련 비즈니스 로직을 처리하는 서비스"""
 
     @staticmethod
-    def get_user_by_email(session: Session, email: str) -> User | None:
-        """이메일로 사용자 조회"""
-        return session.exec(select(User).where(User.email == email)).first()
+    def get_user_by_email(session: Session, email: str) -> UserRow | None:
+        """이메일로 사용자 조회 (읽기 전용 행, app.api.users.queries)"""
+        return user_row_by_email(session, email)
 
     @staticmethod
-    def get_user_by_id(session: Session, user_id: int) -> User | None:
-        """ID로 사용자 조회"""
-        return session.get(User, user_id)
+    def get_user_by_id(session: Session, user_id: int) -> UserRow | None:
+        """ID로 사용자 조회 (읽기 전용 행, app.api.users.queries)"""
+        return user_row_by_id(session, user_id)
 
     @staticmethod
-    def get_all_users(session: Session) -> list[User]:
-        """모든 사용자 조회"""
-        return session.exec(select(User)).all()
+    def list_users(
+        session: Session,
+        limit: int,
+        after_created_at: datetime | None = None,
+        after_id: int | None = None,
+    ) -> list[User]:
+        """생성 순서 (created_at, id)로 사용자 목록 조회 (키셋 페이지네이션)
+
+        샤딩 시 모든 샤드에서 같은 조건으로 limit명씩 읽어 합친 뒤 다시 정렬해 자른다.
+        """
+        statement = select(User).order_by(User.created_at, User.id).limit(limit)
+        if after_created_at is not None and after_id is not None:
+            statement = statement.where(
+                or_(
+                    User.created_at > after_created_at,
+                    and_(User.created_at == after_created_at, User.id > after_id),
+                )
+            )
+        users = session.exec(statement).all()
+        return sorted(users, key=lambda user: (user.created_at, user.id))[:limit]
 
     @staticmethod
-    def create_user(session: Session, user_data: UserCreate) -> User:
-        """새 사용자 생성"""
-        # 이메일 중복 확인
-        existing_user = UserService.get_user_by_email(session, user_data.email)
-        if existing_user:
+    def ensure_email_available(session: Session, email: str) -> None:
+        """이메일 중복 확인 (생성 전 빠른 거절용, 최종 확인은 저장 시 유일 인덱스)"""
+        if UserService.get_user_by_email(session, email):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="이메일이 이미 등록되어 있습니다",
             )
 
+    @staticmethod
+    async def create_user(session: Session, user_data: UserCreate) -> User:
+        """새 사용자 생성 (ensure_email_available로 확인한 뒤 호출)"""
         # 패스워드 해싱
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await get_password_hash(user_data.password)
 
         # 사용자 생성
         db_user = User(
             email=user_data.email, hashed_password=hashed_password, name=user_data.name
         )
-        session.add(db_user)
-        session.commit()
-        session.refresh(db_user)
+        if shard_engines:
+            # 디렉터리에서 전역 ID를 발급받아 샤드를 정함 (동시 가입은 여기서 걸러짐)
+            # 샤드 커밋 전에 죽어 남은 항목은 repair_user_directory가 정리함
+            db_user.id, _ = _claim_email(allocate_user, user_data.email)
+        try:
+            session.add(db_user)
+            session.flush()  # 이벤트에 사용할 ID 할당
+            _record_user_event(session, db_user, "user.created")
+            session.commit()
+        except Exception:
+            if shard_engines:
+                session.rollback()
+                release_user(db_user.id)
+            raise
         return db_user
 
     @staticmethod
-    def update_user(
-        session: Session, user_id: int, user_update: UserUpdate, current_user: User
+    def upgrade_password_hash(session: Session, user: UserRow, new_hash: str) -> bool:
+        """검증에 성공한 사용자의 해시를 현재 정책의 해시로 교체
+
+        그 사이 패스워드가 바뀌었으면 덮어쓰지 않도록 기존 해시가 같을 때만 갱신한다.
+        사용자에게 보이는 변경이 아니므로 updated_at과 변경 이벤트는 남기지 않는다.
+        """
+        result = session.execute(
+            update(User)
+            .where(User.id == user.id, User.hashed_password == user.hashed_password)
+            .values(hashed_password=new_hash)
+        )
+        session.commit()
+        return result.rowcount == 1
+
+    @staticmethod
+    async def update_user(
+        session: Session, user_id: int, user_update: UserUpdate, current_user: UserRow
     ) -> User:
-        """사용자 정보 수정"""
-        user = UserService.get_user_by_id(session, user_id)
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="사용자를 찾을 수 없습니다",
-            )
+        """사용자 정보 수정
 
-        # 권한 확인: 본인만 수정 가능
-        if current_user.id != user.id:
+        권한을 먼저 확인하고 새 패스워드는 연결을 빌리기 전에 해싱한 뒤,
+        행 잠금·변경·이벤트 기록을 짧은 트랜잭션 하나로 처리한다.
+        """
+        # 권한 확인: 본인만 수정 가능 (다른 사용자의 행을 잠그지 않도록 조회 전에 확인)
+        if current_user.id != user_id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="다른 사용자의 정보를 수정할 수 없습니다",
             )
 
         # 업데이트 데이터 처리
-        update_data = user_update.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            if value is not None:
-                if field == "password":
-                    # 패스워드는 해싱하여 저장
-                    setattr(user, "hashed_password", get_password_hash(value))
-                else:
-                    setattr(user, field, value)
-
-        session.add(user)
-        session.commit()
-        session.refresh(user)
-        return user
+        update_data = {
+            field: value
+            for field, value in user_update.dict(exclude_unset=True).items()
+            if value is not None
+        }
+        changed_fields = sorted(update_data)
+        if "password" in update_data:
+            # 패스워드는 해싱하여 저장 (해싱 동안 연결과 행 잠금을 잡지 않도록 조회 전에)
+            update_data["hashed_password"] = await get_password_hash(
+                update_data.pop("password")
+            )
 
-    @staticmethod
-    def delete_user(session: Session, user_id: int, current_user: User) -> None:
-        """사용자 삭제"""
-        user = UserService.get_user_by_id(session, user_id)
+        # 같은 사용자의 변경과 이벤트 순서가 커밋 순서와 같도록 트랜잭션 끝까지 행을 잠금
+        user = session.get(User, user_id, with_for_update=True)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="사용자를 찾을 수 없습니다",
             )
 
-        # 권한 확인: 본인만 삭제 가능
-        if current_user.id != user.id:
+        old_email = user.email
+        for field, value in update_data.items():
+            setattr(user, field, value)
+
+        renamed = bool(shard_engines) and user.email != old_email
+        if renamed:
+            _claim_email(rename_email, user.id, user.email)
+        try:
+            session.add(user)
+            _record_user_event(
+                session, user, "user.updated", changed_fields=changed_fields
+            )
+            session.commit()
+        except Exception:
+            if renamed:
+                session.rollback()
+                rename_email(user.id, old_email)
+            raise
+        return user
+
+    @staticmethod
+    def delete_user(session: Session, user_id: int, current_user: UserRow) -> None:
+        """사용자 삭제"""
+        # 권한 확인: 본인만 삭제 가능 (다른 사용자의 행을 잠그지 않도록 조회 전에 확인)
+        if current_user.id != user_id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="다른 사용자를 삭제할 수 없습니다",
             )
 
+        # 같은 사용자의 변경과 이벤트 순서가 커밋 순서와 같도록 트랜잭션 끝까지 행을 잠금
+        user = session.get(User, user_id, with_for_update=True)
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="사용자를 찾을 수 없습니다",
+            )
+
+        _record_user_event(session, user, "user.deleted")
         session.delete(user)
         session.commit()
+        if shard_engines:
+            release_user(user.id)
+
+    @staticmethod
+    def enqueue_bulk_delete(user_ids: list[int]) -> dict:
+        """사용자 일괄 삭제 작업을 low 큐에 등록"""
+        from app.core.redis_queue import low_priority_queue
+
+        ids = sorted(set(user_ids))
+        try:
+            job = low_priority_queue.enqueue(
+                PURGE_JOB_FUNC,
+                ids,
+                job_timeout=settings.USER_PURGE_JOB_TIMEOUT,
+                result_ttl=settings.USER_PURGE_RESULT_TTL_SECONDS,
+                failure_ttl=settings.USER_PURGE_RESULT_TTL_SECONDS,
+                meta={"total": len(ids), "processed": 0, "deleted": 0},
+            )
+            return UserService._bulk_delete_status(job)
+        except RedisError as e:
+            # 큐를 쓸 수 없으면 500 대신 503 (Retry-After)으로 재시도 유도
+            raise ServiceOverloadedError(
+                "job_queue_unavailable", settings.ADMISSION_RETRY_AFTER_SECONDS
+            ) from e
+
+    @staticmethod
+    def get_bulk_delete_job(job_id: str) -> dict | None:
+        """사용자 일괄 삭제 작업 상태 조회 (없거나 다른 종류의 작업이면 None)"""
+        from rq.exceptions import NoSuchJobError
+        from rq.job import Job
+
+        from app.core.redis_queue import redis_conn
+
+        try:
+            job = Job.fetch(job_id, connection=redis_conn)
+            if job.func_name != PURGE_JOB_FUNC:
+                return None
+            return UserService._bulk_delete_status(job)
+        except NoSuchJobError:
+            return None
+        except RedisError as e:
+            raise ServiceOverloadedError(
+                "job_queue_unavailable", settings.ADMISSION_RETRY_AFTER_SECONDS
+            ) from e
+
+    @staticmethod
+    def _bulk_delete_status(job) -> dict:
+        job_status = job.get_status()
+        error = None
+        if job.is_failed:
+            result = job.latest_result()
+            if result is not None and result.exc_string:
+                error = result.exc_string.strip().splitlines()[-1]
+        return {
+            "job_id": job.id,
+            "status": job_status.value if job_status else "unknown",
+            "total": job.meta.get("total", 0),
+            "processed": job.meta.get("processed", 0),
+            "deleted": job.meta.get("deleted", 0),
+            "enqueued_at": job.enqueued_at,
+            "ended_at": job.ended_at,
+            "error": error,
+        }
@@ -0,0 +1,275 @@
+"""어드미션 컨트롤 및 부하 차단.
+
+요청을 조회(read), 쓰기(write), 패스워드 해싱(auth) 등급으로 나눠 등급별·경로별
+동시 처리 수와 대기열 길이를 제한한다. 로그인/가입은 CPU를 가장 많이 쓰므로 DB 풀이
+아니라 해싱 스레드 수를 기준으로 따로 제한한다. DB 풀이나 해싱 용량이 부족하면 풀 대기(pool_timeout)까지
+기다리지 않고 바로 503 + Retry-After로 거절하며, 쓰기 요청을 먼저 거절해
+저렴한 조회 요청을 우선 처리한다.
+"""
+import asyncio
+import contextlib
+import logging
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.database import busiest_pool_status
+from app.core.exception_handlers import service_unavailable_response
+from app.core.exceptions import ServiceOverloadedError
+from app.core.middleware import get_request_id
+from app.core.resources import budget
+
+logger = logging.getLogger(__name__)
+
+READ = "read"
+WRITE = "write"
+AUTH = "auth"
+
+# 요청마다 패스워드를 해싱/검증하는 경로 (auth 등급)
+HASH_ROUTES = {
+    ("POST", "/api/v1/auth/login"),
+    ("POST", "/api/v1/auth/register"),
+    ("POST", "/api/v1/users"),
+}
+
+# 클라이언트가 남은 대기 시간을 알려주는 헤더 (초)
+DEADLINE_HEADER = "x-request-timeout"
+
+# 어드미션 컨트롤 대상에서 제외할 경로 (프로브, 문서, 장시간 스트림)
+# 변경 피드는 연결 내내 슬롯을 잡으므로 구독자 수 한도로 따로 제한함
+EXEMPT_PATHS = {
+    "/",
+    "/health",
+    "/livez",
+    "/readyz",
+    "/docs",
+    "/redoc",
+    "/openapi.json",
+    "/api/v1/users/changes",
+}
+
+# 현재 요청의 마감 시각 (time.monotonic 기준, 요청 밖이면 None)
+deadline_var: ContextVar[float | None] = ContextVar("request_deadline", default=None)
+
+
+def remaining_time() -> float | None:
+    """현재 요청 마감까지 남은 시간(초)."""
+    deadline = deadline_var.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def ensure_deadline(stage: str) -> None:
+    """마감 시간이 지났으면 비싼 작업을 시작하기 전에 거절."""
+    remaining = remaining_time()
+    if remaining is not None and remaining <= 0:
+        raise ServiceOverloadedError(
+            f"{stage}_deadline_exceeded", settings.ADMISSION_RETRY_AFTER_SECONDS
+        )
+
+
+class AdmissionMetrics:
+    """허용/거절 횟수 카운터.
+
+    거절 횟수는 (요청 등급 또는 단계, 사유)별로 센다. 요청 처리 도중
+    발생한 거절은 예외 핸들러가 "app" 단계로 기록한다.
+    """
+
+    def __init__(self):
+        self.admitted: Counter = Counter()
+        self.shed: Counter = Counter()
+
+    def as_dict(self) -> dict:
+        return {
+            "admitted": dict(self.admitted),
+            "shed": {f"{name}:{reason}": count for (name, reason), count in self.shed.items()},
+            "shed_total": sum(self.shed.values()),
+        }
+
+
+admission_metrics = AdmissionMetrics()
+
+
+class ConcurrencyLimiter:
+    """대기열 길이와 마감 시간이 있는 동시 실행 제한기 (이벤트 루프 전용)."""
+
+    def __init__(self, name: str, limit: int, max_queue: int):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, timeout: float) -> None:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            raise ServiceOverloadedError(
+                f"{self.name}_queue_full", settings.ADMISSION_RETRY_AFTER_SECONDS
+            )
+        if timeout <= 0:
+            raise ServiceOverloadedError(
+                f"{self.name}_deadline_exceeded", settings.ADMISSION_RETRY_AFTER_SECONDS
+            )
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # release()가 슬롯을 넘겨주면 active는 그대로 유지됨
+            await asyncio.wait_for(asyncio.shield(waiter), timeout)
+        except (TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # 타임아웃과 동시에 슬롯을 받은 경우 반납
+                self.release()
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            raise ServiceOverloadedError(
+                f"{self.name}_deadline_exceeded", settings.ADMISSION_RETRY_AFTER_SECONDS
+            ) from e
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def as_dict(self) -> dict:
+        return {"limit": self.limit, "active": self.active, "queued": self.queued}
+
+
+class AdmissionController:
+    """요청 등급과 경로에 따라 제한기를 선택하고 과부하 여부를 판단."""
+
+    def __init__(self):
+        self.class_limiters = {
+            READ: ConcurrencyLimiter(
+                READ, settings.ADMISSION_READ_CONCURRENCY, settings.ADMISSION_READ_QUEUE
+            ),
+            WRITE: ConcurrencyLimiter(
+                WRITE, settings.ADMISSION_WRITE_CONCURRENCY, settings.ADMISSION_WRITE_QUEUE
+            ),
+            AUTH: ConcurrencyLimiter(
+                AUTH,
+                settings.ADMISSION_AUTH_CONCURRENCY or budget.hash_workers * 2,
+                settings.ADMISSION_AUTH_QUEUE,
+            ),
+        }
+        self.route_limiters = {
+            path: ConcurrencyLimiter(path, limit, settings.ADMISSION_ROUTE_QUEUE)
+            for path, limit in settings.ADMISSION_ROUTE_LIMITS.items()
+        }
+
+    @staticmethod
+    def classify(method: str, path: str) -> str:
+        if (method, path) in HASH_ROUTES:
+            return AUTH
+        return READ if method in ("GET", "HEAD", "OPTIONS") else WRITE
+
+    @staticmethod
+    def check_capacity(request_class: str) -> None:
+        """DB 풀과 해싱 스레드 풀이 포화 상태이면 즉시 거절."""
+        from app.core.security import hash_queue_size
+
+        # 샤딩 시 샤드 하나의 풀만 포화되어도 그 샤드로 가는 요청은 풀 대기에 걸림
+        pool = busiest_pool_status()
+        utilization = pool["checked_out"] / max(pool["max_connections"], 1)
+        if utilization >= 1.0:
+            raise ServiceOverloadedError(
+                "db_pool_exhausted", settings.ADMISSION_RETRY_AFTER_SECONDS
+            )
+        if request_class == READ:
+            return
+        if utilization >= settings.ADMISSION_WRITE_SHED_POOL_RATIO:
+            raise ServiceOverloadedError(
+                "db_pool_reserved_for_reads", settings.ADMISSION_RETRY_AFTER_SECONDS
+            )
+        # 해싱 작업(실행 중 + 대기 중)이 스레드 수의 4배면 새 해싱은 마감 안에 끝나기 어려움
+        if request_class == AUTH and hash_queue_size() >= budget.hash_workers * 4:
+            raise ServiceOverloadedError(
+                "hash_capacity_exhausted", settings.ADMISSION_RETRY_AFTER_SECONDS
+            )
+
+    def as_dict(self) -> dict:
+        return {
+            "classes": {name: limiter.as_dict() for name, limiter in self.class_limiters.items()},
+            "routes": {path: limiter.as_dict() for path, limiter in self.route_limiters.items()},
+            **admission_metrics.as_dict(),
+        }
+
+
+admission_controller = AdmissionController()
+
+
+def _request_deadline(scope: Scope) -> float:
+    """클라이언트 헤더와 기본값 중 더 짧은 마감 시각을 계산."""
+    budget_seconds = settings.ADMISSION_MAX_WAIT_SECONDS
+    header = Headers(scope=scope).get(DEADLINE_HEADER)
+    if header:
+        with contextlib.suppress(ValueError):
+            budget_seconds = min(budget_seconds, float(header))
+    return time.monotonic() + budget_seconds
+
+
+class AdmissionControlMiddleware:
+    """요청 허용 여부를 결정하는 ASGI 미들웨어.
+
+    RequestIDMiddleware 안쪽에 배치한다. 요청 마감 시각을 컨텍스트에 저장해
+    이후 단계(해싱 등)가 남은 시간을 확인할 수 있게 한다.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.controller = admission_controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        deadline = _request_deadline(scope)
+        token = deadline_var.set(deadline)
+        request_class = self.controller.classify(scope["method"], scope["path"])
+        limiters = [self.controller.class_limiters[request_class]]
+        route_limiter = self.controller.route_limiters.get(scope["path"])
+        if route_limiter is not None:
+            limiters.append(route_limiter)
+
+        acquired: list[ConcurrencyLimiter] = []
+        try:
+            try:
+                self.controller.check_capacity(request_class)
+                for limiter in limiters:
+                    await limiter.acquire(deadline - time.monotonic())
+                    acquired.append(limiter)
+            except ServiceOverloadedError as e:
+                admission_metrics.shed[(request_class, e.reason)] += 1
+                logger.warning(
+                    f"요청 거절 (과부하) - Path: {scope['path']}, Reason: {e.reason}"
+                )
+                response = service_unavailable_response(
+                    get_request_id() or "unknown", e.reason, e.retry_after
+                )
+                await response(scope, receive, send)
+                return
+
+            admission_metrics.admitted[request_class] += 1
+            await self.app(scope, receive, send)
+        finally:
+            for limiter in reversed(acquired):
+                limiter.release()
+            deadline_var.reset(token)
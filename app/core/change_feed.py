@@ -0,0 +1,267 @@
+"""사용자 변경 피드 (Server-Sent Events).
+
+워커마다 알림 연결 하나(PostgreSQL LISTEN 또는 Redis SUBSCRIBE)만 열고,
+받은 변경 이벤트를 메모리 큐로 모든 구독자에게 나눠준다. 구독자는 풀의
+DB 세션을 잡지 않으며, Last-Event-ID로 재연결하면 outbox_events 테이블에서
+놓친 이벤트를 짧은 조회로 채운 뒤 실시간 알림을 이어서 받는다. SSE id는
+이어받기 커서(app.core.outbox.EventCursor)로, 샤딩하지 않으면 이벤트 ID와 같고
+샤딩 시에는 샤드마다 마지막으로 보낸 이벤트 ID를 담는다.
+"""
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator
+from typing import Any
+
+from sqlalchemy import Engine
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import shard_engines, user_shards
+from app.core.exceptions import ServiceOverloadedError
+from app.core.outbox import (
+    EventCursor,
+    advance_event_cursor,
+    change_feed_backend,
+    current_event_cursor,
+    format_event_cursor,
+    load_events_after,
+)
+
+logger = logging.getLogger(__name__)
+
+# 알림 연결이 끊겼을 때 재연결 대기 시간 (초)
+_RECONNECT_MIN_SECONDS = 0.5
+_RECONNECT_MAX_SECONDS = 30.0
+# 재연결 시 클라이언트(EventSource)가 기다릴 시간 (밀리초)
+_CLIENT_RETRY_MS = 3000
+
+
+class Subscriber:
+    """SSE 연결 하나의 수신 버퍼."""
+
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue(queue_size)
+
+    def push(self, message: dict[str, Any]) -> bool:
+        """메시지를 버퍼에 넣고, 넘치면 False."""
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def close(self) -> None:
+        """버퍼를 비우고 종료 표시(None)를 넣어 스트림을 끝냄."""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+def _connect_listener(listen_engine: Engine):
+    """LISTEN 전용 PostgreSQL 연결 생성 (풀과 별개, 자동 커밋)."""
+    import psycopg2
+    import psycopg2.extensions
+
+    dsn = listen_engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+    conn = psycopg2.connect(dsn)
+    conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+    with conn.cursor() as cursor:
+        cursor.execute(f'LISTEN "{settings.CHANGE_FEED_CHANNEL}"')
+    return conn
+
+
+class ChangeFeedHub:
+    """워커의 알림 연결 하나를 여러 SSE 구독자에게 나눠주는 허브 (이벤트 루프 전용)."""
+
+    def __init__(self, max_subscribers: int, queue_size: int):
+        self.max_subscribers = max_subscribers
+        self.queue_size = queue_size
+        self._subscribers: set[Subscriber] = set()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def check_capacity(self) -> None:
+        """구독자 수가 한도에 도달했으면 거절."""
+        if len(self._subscribers) >= self.max_subscribers:
+            raise ServiceOverloadedError(
+                "change_feed_full", settings.ADMISSION_RETRY_AFTER_SECONDS
+            )
+
+    def subscribe(self) -> Subscriber:
+        """구독자를 등록하고 필요하면 알림 수신을 시작."""
+        self.check_capacity()
+        subscriber = Subscriber(self.queue_size)
+        self._subscribers.add(subscriber)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(
+                self._run(), name="change-feed-listener"
+            )
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+
+    def dispatch(self, message: dict[str, Any]) -> None:
+        """이벤트를 모든 구독자에게 전달. 버퍼가 넘친 구독자는 연결을 끊음."""
+        for subscriber in list(self._subscribers):
+            if not subscriber.push(message):
+                logger.warning("변경 피드 구독자 버퍼 초과 - 연결 종료 (재연결 시 이어받음)")
+                self._subscribers.discard(subscriber)
+                subscriber.close()
+
+    def _dispatch_raw(self, raw: str | bytes) -> None:
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            logger.error(f"변경 피드 알림 해석 실패 - Payload: {raw!r}")
+            return
+        self.dispatch(message)
+
+    def _disconnect_all(self) -> None:
+        """알림이 끊긴 동안 놓친 이벤트가 있을 수 있으므로 모든 구독자를 재연결시킴."""
+        for subscriber in list(self._subscribers):
+            subscriber.close()
+        self._subscribers.clear()
+
+    async def _listen_postgres(self) -> None:
+        loop = asyncio.get_running_loop()
+        lost: asyncio.Future = loop.create_future()
+        connections = []
+
+        def on_readable(conn) -> None:
+            try:
+                conn.poll()
+            except Exception as e:
+                if not lost.done():
+                    lost.set_exception(e)
+                return
+            while conn.notifies:
+                self._dispatch_raw(conn.notifies.pop(0).payload)
+
+        try:
+            # 샤딩 시 이벤트를 쓰는 모든 샤드에서 알림을 받음
+            for _, shard_engine in user_shards():
+                conn = await asyncio.to_thread(_connect_listener, shard_engine)
+                connections.append(conn)
+                loop.add_reader(conn.fileno(), on_readable, conn)
+            logger.info(f"변경 피드 LISTEN 시작 - Channel: {settings.CHANGE_FEED_CHANNEL}")
+            await lost
+        finally:
+            for conn in connections:
+                loop.remove_reader(conn.fileno())
+                conn.close()
+
+    async def _listen_redis(self) -> None:
+        from app.core.redis_queue import get_async_redis_connection
+
+        client = get_async_redis_connection()
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(settings.CHANGE_FEED_CHANNEL)
+            logger.info(f"변경 피드 SUBSCRIBE 시작 - Channel: {settings.CHANGE_FEED_CHANNEL}")
+            async for message in pubsub.listen():
+                self._dispatch_raw(message["data"])
+        finally:
+            await pubsub.aclose()
+            await client.aclose()
+
+    async def _run(self) -> None:
+        listen = (
+            self._listen_postgres
+            if change_feed_backend() == "postgres"
+            else self._listen_redis
+        )
+        delay = _RECONNECT_MIN_SECONDS
+        while self._subscribers:
+            try:
+                await listen()
+                delay = _RECONNECT_MIN_SECONDS
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"변경 피드 알림 연결 실패 - Error: {str(e)}")
+                self._disconnect_all()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, _RECONNECT_MAX_SECONDS)
+
+    def stop(self) -> None:
+        """알림 수신을 중단하고 모든 구독자 연결을 종료."""
+        self._disconnect_all()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+def _format_event(message: dict[str, Any], cursor: EventCursor) -> str:
+    return (
+        f"id: {format_event_cursor(cursor)}\n"
+        f"event: {message['event_type']}\n"
+        f"data: {json.dumps(message)}\n\n"
+    )
+
+
+async def stream_changes(
+    hub: ChangeFeedHub, cursor: EventCursor | None
+) -> AsyncIterator[str]:
+    """SSE 스트림 생성기.
+
+    실시간 알림을 먼저 구독한 뒤 커서 이후의 이벤트를 DB에서 채우므로
+    그 사이에 커밋된 이벤트도 빠지지 않는다. 이 연결 안의 중복은 이벤트 ID로 거른다.
+    이어받을 때는 이전 연결이 보낸 뒤에 커밋된 낮은 ID를 잡기 위해 커서보다
+    CHANGE_FEED_RESUME_LOOKBACK만큼 앞선 이벤트부터 다시 보내므로, 클라이언트는
+    재연결 직후 이미 받은 이벤트를 다시 받을 수 있다 (data의 event_id로 중복 제거).
+    이 범위보다 더 늦게 커밋된 이벤트는 놓칠 수 있어 이어받기는 최선 노력이다.
+    """
+    subscriber = hub.subscribe()
+    try:
+        yield f"retry: {_CLIENT_RETRY_MS}\n\n"
+
+        backfilled: set[int] = set()
+        resume = cursor is not None
+        if cursor is None:
+            # 샤딩 시 처음 구독하면 모든 샤드의 현재 위치를 기준으로 삼아야 재연결 때
+            # 아직 이벤트를 받지 않은 샤드의 지난 이벤트를 처음부터 다시 받지 않음
+            cursor = await run_in_threadpool(current_event_cursor) if shard_engines else {}
+        lookback = settings.CHANGE_FEED_RESUME_LOOKBACK
+        while resume:
+            # 세션은 이 조회 동안만 사용하고 바로 반납
+            messages = await run_in_threadpool(
+                load_events_after,
+                cursor,
+                settings.CHANGE_FEED_BACKFILL_BATCH,
+                lookback,
+            )
+            # 다음 배치부터는 이미 구독 중인 실시간 알림이 늦은 커밋을 전달함
+            lookback = 0
+            for message in messages:
+                backfilled.add(message["event_id"])
+                advance_event_cursor(cursor, message["event_id"])
+                yield _format_event(message, cursor)
+            if len(messages) < settings.CHANGE_FEED_BACKFILL_BATCH:
+                break
+
+        while True:
+            try:
+                message = await asyncio.wait_for(
+                    subscriber.queue.get(), settings.CHANGE_FEED_HEARTBEAT_SECONDS
+                )
+            except TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if message is None:
+                return
+            if message["event_id"] in backfilled:
+                continue
+            advance_event_cursor(cursor, message["event_id"])
+            yield _format_event(message, cursor)
+    finally:
+        hub.unsubscribe(subscriber)
+
+
+change_feed = ChangeFeedHub(
+    settings.CHANGE_FEED_MAX_SUBSCRIBERS, settings.CHANGE_FEED_QUEUE_SIZE
+)
@@ -1,23 +1,52 @@
 import logging
+import time
+from collections.abc import Callable
+from typing import Any
 
 from sqlalchemy import event
 from sqlalchemy.engine import Engine
 from sqlmodel import Session, SQLModel, create_engine
 
 from app.core.config import settings
+from app.core.resources import budget
 
 logger = logging.getLogger(__name__)
 
+# 샤딩 시 샤드 DB에 두는 테이블 (나머지는 DATABASE_URL에 둠)
+SHARDED_TABLES = ("users", "outbox_events")
+
+
+def _create_engine(url: str) -> Engine:
+    return create_engine(
+        url,
+        echo=settings.DATABASE_ECHO,  # SQL 쿼리 로깅
+        pool_pre_ping=True,  # 연결 상태 확인
+        pool_size=budget.db_pool_size,  # 커넥션 풀 크기 (워커 수로 나눈 프로세스 몫)
+        max_overflow=budget.db_max_overflow,  # 최대 추가 연결 수
+        pool_recycle=3600,  # 1시간마다 연결 재생성
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,  # 연결 대기 시간 (초)
+    )
+
+
 # PostgreSQL 데이터베이스 엔진 생성
-engine = create_engine(
-    settings.DATABASE_URL,
-    echo=settings.DATABASE_ECHO,  # SQL 쿼리 로깅
-    pool_pre_ping=True,  # 연결 상태 확인
-    pool_size=settings.DATABASE_POOL_SIZE,  # 커넥션 풀 크기
-    max_overflow=settings.DATABASE_MAX_OVERFLOW,  # 최대 추가 연결 수
-    pool_recycle=3600,  # 1시간마다 연결 재생성
-    pool_timeout=30,  # 연결 대기 시간 (초)
-)
+engine = _create_engine(settings.DATABASE_URL)
+
+# 사용자 샤드 엔진 (샤드 ID -> 엔진, 비어 있으면 샤딩하지 않음)
+# 샤드마다 별도 DB 서버이므로 각자 같은 크기의 풀을 가짐
+shard_engines: dict[str, Engine] = {
+    f"shard_{index}": _create_engine(url)
+    for index, url in enumerate(settings.DATABASE_SHARD_URLS)
+}
+
+
+def all_engines() -> list[Engine]:
+    """전역 엔진과 모든 샤드 엔진."""
+    return [engine, *shard_engines.values()]
+
+
+def user_shards() -> list[tuple[str | None, Engine]]:
+    """users/outbox_events 테이블이 있는 (샤드 ID, 엔진) 목록 (샤딩하지 않으면 전역 엔진)."""
+    return list(shard_engines.items()) or [(None, engine)]
 
 
 # SQLAlchemy 이벤트 리스너 - 연결 시 로깅
@@ -34,6 +63,61 @@ def receive_checkout(dbapi_conn, connection_record, connection_proxy):
     logger.debug("데이터베이스 연결 체크아웃")
 
 
+# SQL 실행 시간 구독자 (프로파일링과 쿼리 계측이 하나의 타이밍 리스너를 공유)
+# 인자: (conn, cursor, statement, parameters, executemany, start, end)
+QueryTimer = Callable[[Any, Any, str, Any, bool, float, float], None]
+_query_timers: list[QueryTimer] = []
+
+
+def add_query_timer(callback: QueryTimer) -> None:
+    """SQL 실행이 끝날 때마다 실행 구간과 함께 호출될 콜백을 등록."""
+    _query_timers.append(callback)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """SQL 실행 시작 시간을 기록."""
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """SQL 실행 구간을 등록된 구독자에게 전달."""
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    start, end = starts.pop(), time.perf_counter()
+    for callback in _query_timers:
+        callback(conn, cursor, statement, parameters, executemany, start, end)
+
+
+# 샤드 엔진에서 실행된 SQL도 같은 요청에 포함
+for _engine in all_engines():
+    event.listen(_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def pool_status(target: Engine | None = None) -> dict:
+    """현재 프로세스의 커넥션 풀 사용 현황 (기본은 전역 엔진)."""
+    pool = (target or engine).pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_connections": budget.db_max_connections,
+    }
+
+
+def busiest_pool_status() -> dict:
+    """전역 엔진과 샤드 엔진 중 사용률이 가장 높은 풀의 현황.
+
+    요청이 어느 샤드를 쓸지 미리 알 수 없으므로, 한 샤드의 풀만 포화되어도 과부하로 본다.
+    """
+    return max(
+        (pool_status(target) for target in all_engines()),
+        key=lambda status: status["checked_out"] / max(status["max_connections"], 1),
+    )
+
+
 def create_db_and_tables():
     """데이터베이스 및 테이블 생성.
 
@@ -45,13 +129,49 @@ def create_db_and_tables():
         "SQLModel.metadata.create_all()을 사용 중입니다. "
         "프로덕션에서는 'alembic upgrade head'를 사용하세요."
     )
-    SQLModel.metadata.create_all(engine)
+    if not shard_engines:
+        SQLModel.metadata.create_all(engine)
+    else:
+        sharded = [SQLModel.metadata.tables[name] for name in SHARDED_TABLES]
+        SQLModel.metadata.create_all(
+            engine,
+            tables=[table for table in SQLModel.metadata.sorted_tables if table not in sharded],
+        )
+        for shard_engine in shard_engines.values():
+            SQLModel.metadata.create_all(shard_engine, tables=sharded)
     logger.info("데이터베이스 테이블 생성 완료")
 
 
+class LazySession(Session):
+    """연결을 늦게 빌리고 일찍 돌려주는 세션.
+
+    Session은 첫 SQL 실행 시점에만 풀에서 연결을 체크아웃한다. 여기에
+    ``release()``를 더해 서비스 호출이 끝나면 응답 직렬화 전에 연결을 풀에
+    반환한다. ``expire_on_commit=False``로 만들어 반환 후에도 로드된 값은
+    그대로 읽을 수 있다.
+    """
+
+    def release(self) -> None:
+        """트랜잭션을 종료하고 연결을 풀에 반환.
+
+        로드된 객체는 detached 상태로 값을 유지하며, 세션은 다음 SQL 실행 시
+        다시 연결을 체크아웃한다. 커밋되지 않은 변경은 버려진다.
+        """
+        self.close()
+
+
+def create_session() -> LazySession:
+    """요청용 세션 생성 (샤딩 시 쿼리를 샤드로 라우팅하는 세션)."""
+    if shard_engines:
+        from app.core.sharding import ShardedLazySession
+
+        return ShardedLazySession.create()
+    return LazySession(engine, expire_on_commit=False)
+
+
 def get_session():
-    """데이터베이스 세션 생성."""
-    with Session(engine) as session:
+    """데이터베이스 세션 생성 (연결은 첫 SQL 실행 시 체크아웃)."""
+    with create_session() as session:
         logger.debug("데이터베이스 세션 생성")
         try:
             yield session
@@ -4,9 +4,59 @@ import logging
 from fastapi import Request, status
 from fastapi.responses import JSONResponse
 
+from app.core.config import settings
+from app.core.exceptions import ServiceOverloadedError
+
 logger = logging.getLogger(__name__)
 
 
+def service_unavailable_response(
+    request_id: str, reason: str, retry_after: int
+) -> JSONResponse:
+    """과부하 시 반환하는 503 응답."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "detail": "Service Unavailable",
+            "reason": reason,
+            "request_id": request_id,
+        },
+        headers={"Retry-After": str(retry_after), "X-Request-ID": request_id},
+    )
+
+
+async def overload_exception_handler(
+    request: Request, exc: ServiceOverloadedError
+) -> JSONResponse:
+    """과부하 예외 핸들러."""
+    from app.core.admission import admission_metrics
+
+    admission_metrics.shed[("app", exc.reason)] += 1
+    request_id = getattr(request.state, "request_id", "unknown")
+    logger.warning(
+        f"요청 거절 (과부하) - Path: {request.url.path}, "
+        f"RequestID: {request_id}, Reason: {exc.reason}"
+    )
+    return service_unavailable_response(request_id, exc.reason, exc.retry_after)
+
+
+async def pool_timeout_exception_handler(
+    request: Request, exc: Exception
+) -> JSONResponse:
+    """커넥션 풀 대기 시간 초과 핸들러 (500 대신 503 반환)."""
+    from app.core.admission import admission_metrics
+
+    admission_metrics.shed[("app", "db_pool_timeout")] += 1
+    request_id = getattr(request.state, "request_id", "unknown")
+    logger.error(
+        f"커넥션 풀 대기 시간 초과 - Path: {request.url.path}, "
+        f"RequestID: {request_id}, Error: {str(exc)}"
+    )
+    return service_unavailable_response(
+        request_id, "db_pool_timeout", settings.ADMISSION_RETRY_AFTER_SECONDS
+    )
+
+
 async def http_exception_handler(request: Request, exc: Exception) -> JSONResponse:
     """HTTP 예외 핸들러."""
     request_id = getattr(request.state, "request_id", "unknown")
@@ -0,0 +1,10 @@
+"""애플리케이션 예외."""
+
+
+class ServiceOverloadedError(Exception):
+    """DB 풀이나 해싱 용량이 부족해 요청을 처리할 수 없음 (503)."""
+
+    def __init__(self, reason: str, retry_after: int = 1):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
@@ -0,0 +1,257 @@
+"""패스워드 해싱 정책.
+
+고정 비용(bcrypt 12 rounds)은 하드웨어에 따라 해싱 시간이 크게 달라진다.
+시작 시 현재 호스트에서 해싱 시간을 측정해 목표 시간(PASSWORD_HASH_TARGET_MS)에
+맞는 bcrypt rounds 또는 메모리 예산 안의 argon2id 파라미터를 고른다.
+
+해시 문자열에는 방식과 파라미터가 함께 기록되므로 ($2b$12$..., $argon2id$v=19$m=...)
+정책이 바뀌어도 기존 해시는 그대로 검증된다. 현재 정책보다 약한 해시는 로그인
+성공 시 새 정책으로 다시 해시해 저장한다 (AuthService.login).
+
+여러 워커를 띄울 때는 워커들이 동시에 측정하면 서로 CPU를 나눠 써 시간이 부풀려지므로
+마스터가 fork 전에 한 번 측정하고 워커는 그 정책을 물려받는다 (app.server).
+PASSWORD_HASH_POLICY로 정책을 고정하면 측정하지 않는다.
+"""
+import importlib.util
+import logging
+import math
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from passlib.context import CryptContext
+
+from app.core.config import Settings, settings
+from app.core.resources import budget
+
+logger = logging.getLogger(__name__)
+
+# 보안 하한과 상한 (OWASP Password Storage Cheat Sheet, RFC 9106)
+# bcrypt는 측정 결과와 관계없이 기본값(12)보다 낮추지 않음
+MIN_BCRYPT_ROUNDS = 12
+MAX_BCRYPT_ROUNDS = 16
+MIN_ARGON2_MEMORY_KIB = 19 * 1024  # 이 메모리에서는 time_cost 2 이상
+STRONG_ARGON2_MEMORY_KIB = 46 * 1024  # 이 메모리 이상이면 time_cost 1 허용
+MAX_ARGON2_MEMORY_KIB = 64 * 1024
+MAX_ARGON2_TIME_COST = 10
+
+_CALIBRATION_SAMPLES = 3
+_CALIBRATION_PASSWORD = "calibration-password"
+
+
+def argon2_available() -> bool:
+    """argon2 백엔드(argon2-cffi)가 설치되어 있는지 여부."""
+    return importlib.util.find_spec("argon2") is not None
+
+
+@dataclass(frozen=True)
+class HashPolicy:
+    """새 해시를 만들 방식과 비용."""
+
+    scheme: str  # "bcrypt" 또는 "argon2"
+    bcrypt_rounds: int = 12
+    argon2_memory_kib: int = 0
+    argon2_time_cost: int = 0
+    argon2_parallelism: int = 1
+    estimated_ms: float | None = None  # 측정으로 추정한 해시 1회 시간
+
+    def context_config(self) -> dict[str, Any]:
+        """CryptContext 설정 (기본 방식이 아닌 방식은 기존 해시 검증에만 쓰임)."""
+        schemes = [self.scheme]
+        for scheme in ("bcrypt", "argon2"):
+            if scheme not in schemes and (scheme != "argon2" or argon2_available()):
+                schemes.append(scheme)
+        config: dict[str, Any] = {
+            "schemes": schemes,
+            "deprecated": "auto",
+            "bcrypt__default_rounds": self.bcrypt_rounds,
+        }
+        if self.scheme == "argon2":
+            config.update(
+                {
+                    "argon2__type": "ID",
+                    "argon2__memory_cost": self.argon2_memory_kib,
+                    "argon2__rounds": self.argon2_time_cost,
+                    "argon2__parallelism": self.argon2_parallelism,
+                }
+            )
+        return config
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+# 측정 전 (또는 측정을 끈 경우) 정책: passlib 기본값과 같은 bcrypt 12
+DEFAULT_POLICY = HashPolicy("bcrypt", bcrypt_rounds=12)
+
+
+def _time_hash(context: CryptContext) -> float:
+    """해시 1회 시간 중앙값 (밀리초)."""
+    samples = []
+    for _ in range(_CALIBRATION_SAMPLES):
+        start = time.perf_counter()
+        context.hash(_CALIBRATION_PASSWORD)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def _calibrate_bcrypt(target_ms: float) -> HashPolicy:
+    """rounds가 1 늘 때마다 시간이 두 배가 되므로 한 번 측정해 환산."""
+    probe_rounds = MIN_BCRYPT_ROUNDS
+    probe_ms = _time_hash(
+        CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=probe_rounds)
+    )
+    rounds = probe_rounds + round(math.log2(target_ms / probe_ms))
+    rounds = min(max(rounds, MIN_BCRYPT_ROUNDS), MAX_BCRYPT_ROUNDS)
+    return HashPolicy(
+        "bcrypt",
+        bcrypt_rounds=rounds,
+        estimated_ms=round(probe_ms * 2 ** (rounds - probe_rounds), 1),
+    )
+
+
+def _calibrate_argon2(target_ms: float, memory_kib: int) -> HashPolicy:
+    """메모리를 예산만큼 쓰고 time_cost로 목표 시간을 맞춤.
+
+    time_cost 1로도 목표를 넘으면 하한까지 메모리를 절반씩 줄인다.
+    """
+    while True:
+        probe_ms = _time_hash(
+            CryptContext(
+                schemes=["argon2"],
+                argon2__type="ID",
+                argon2__memory_cost=memory_kib,
+                argon2__rounds=1,
+                argon2__parallelism=1,
+            )
+        )
+        if probe_ms <= target_ms or memory_kib // 2 < MIN_ARGON2_MEMORY_KIB:
+            break
+        memory_kib //= 2
+
+    min_time_cost = 1 if memory_kib >= STRONG_ARGON2_MEMORY_KIB else 2
+    time_cost = min(max(round(target_ms / probe_ms), min_time_cost), MAX_ARGON2_TIME_COST)
+    # 기존 bcrypt 해시는 기본 방식이 아니므로 rounds와 관계없이 argon2로 재해시됨
+    return HashPolicy(
+        "argon2",
+        argon2_memory_kib=memory_kib,
+        argon2_time_cost=time_cost,
+        estimated_ms=round(probe_ms * time_cost, 1),
+    )
+
+
+def pinned_policy(values: dict[str, Any]) -> HashPolicy:
+    """PASSWORD_HASH_POLICY 값으로 정책 생성 (하한보다 약하면 ValueError)."""
+    policy = HashPolicy(**values)
+    if policy.scheme not in ("bcrypt", "argon2"):
+        raise ValueError(f"알 수 없는 해시 방식: {policy.scheme}")
+    if policy.scheme == "bcrypt" and not (
+        MIN_BCRYPT_ROUNDS <= policy.bcrypt_rounds <= MAX_BCRYPT_ROUNDS
+    ):
+        raise ValueError(
+            f"bcrypt rounds는 {MIN_BCRYPT_ROUNDS}~{MAX_BCRYPT_ROUNDS}여야 합니다: "
+            f"{policy.bcrypt_rounds}"
+        )
+    if policy.scheme == "argon2" and (
+        policy.argon2_memory_kib < MIN_ARGON2_MEMORY_KIB or policy.argon2_time_cost < 1
+    ):
+        raise ValueError(f"argon2 파라미터가 하한보다 약합니다: {values}")
+    return policy
+
+
+def calibrate(config: Settings = settings, hash_workers: int = budget.hash_workers) -> HashPolicy:
+    """현재 호스트에서 해싱 시간을 측정해 정책을 결정."""
+    target_ms = config.PASSWORD_HASH_TARGET_MS
+    if target_ms <= 0:
+        return DEFAULT_POLICY
+
+    scheme = config.PASSWORD_HASH_SCHEME
+    if scheme == "auto":
+        scheme = "argon2" if argon2_available() else "bcrypt"
+    if scheme == "argon2" and not argon2_available():
+        logger.warning("argon2-cffi가 설치되어 있지 않아 bcrypt를 사용합니다")
+        scheme = "bcrypt"
+
+    if scheme == "bcrypt":
+        return _calibrate_bcrypt(target_ms)
+
+    # 해싱 스레드가 모두 동시에 argon2를 실행해도 프로세스 메모리 예산 안에 들도록 나눔
+    memory_kib = min(
+        config.PASSWORD_HASH_MEMORY_BUDGET_MB * 1024 // max(hash_workers, 1),
+        MAX_ARGON2_MEMORY_KIB,
+    )
+    if memory_kib < MIN_ARGON2_MEMORY_KIB:
+        logger.warning(
+            f"argon2 메모리 예산 부족 ({memory_kib} KiB/해시) - bcrypt를 사용합니다"
+        )
+        return _calibrate_bcrypt(target_ms)
+    return _calibrate_argon2(target_ms, memory_kib)
+
+
+class PasswordHasher:
+    """현재 정책의 CryptContext를 가진 해셔 (정책을 바꿔도 같은 context 객체 유지)."""
+
+    def __init__(self, policy: HashPolicy):
+        self.policy = policy
+        self.context = CryptContext(**policy.context_config())
+        self.configured = False
+
+    def apply(self, policy: HashPolicy) -> None:
+        """정책을 교체 (이후 새 해시와 재해시 판단에 적용)."""
+        self.context.load(policy.context_config())
+        self.policy = policy
+
+    def needs_upgrade(self, hashed: str) -> bool:
+        """해시가 현재 정책보다 약한지 여부.
+
+        passlib의 needs_update는 argon2 파라미터가 조금만 달라도 True라서, 측정
+        오차로 인스턴스마다 time_cost가 다르면 로그인마다 재해시가 반복된다.
+        여기서는 방식이 다르거나 비용이 더 낮을 때만 재해시한다.
+        """
+        policy = self.policy
+        scheme = self.context.identify(hashed)
+        if scheme != policy.scheme:
+            return True
+        parsed = self.context.handler(scheme).from_string(hashed)
+        if scheme == "bcrypt":
+            return parsed.rounds < policy.bcrypt_rounds
+        return (
+            parsed.type != "id"
+            or parsed.memory_cost < policy.argon2_memory_kib
+            or parsed.rounds < policy.argon2_time_cost
+        )
+
+    def verify_and_update(self, secret: str, hashed: str) -> tuple[bool, str | None]:
+        """검증하고, 성공했는데 해시가 현재 정책보다 약하면 새 해시도 반환."""
+        if not self.context.verify(secret, hashed):
+            return False, None
+        if self.needs_upgrade(hashed):
+            return True, self.context.hash(secret)
+        return True, None
+
+    def configure(self, config: Settings = settings) -> HashPolicy:
+        """정책을 정하고 적용 (프로세스당 1회).
+
+        이미 정해졌으면 (fork 전에 마스터가 측정한 경우) 그대로 두고,
+        PASSWORD_HASH_POLICY가 있으면 측정 없이 그 정책을 쓴다.
+        """
+        if self.configured:
+            return self.policy
+        start = time.perf_counter()
+        if config.PASSWORD_HASH_POLICY:
+            policy = pinned_policy(config.PASSWORD_HASH_POLICY)
+            source = "고정"
+        else:
+            policy = calibrate(config)
+            source = "측정"
+        self.apply(policy)
+        self.configured = True
+        logger.info(
+            f"패스워드 해싱 정책 ({source}) - {policy.as_dict()}, "
+            f"소요 시간: {(time.perf_counter() - start) * 1000:.0f}ms"
+        )
+        return policy
+
+
+password_hasher = PasswordHasher(DEFAULT_POLICY)
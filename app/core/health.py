@@ -0,0 +1,117 @@
+"""준비 상태(readiness) 점검.
+
+프로브마다 DB/Redis에 요청을 보내지 않도록 백그라운드 스레드가 주기적으로
+의존성을 점검하고 결과를 캐시한다. /readyz는 캐시된 결과만 읽는다.
+"""
+import logging
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import all_engines, pool_status
+
+logger = logging.getLogger(__name__)
+
+
+def _check_db() -> dict[str, Any]:
+    # 샤딩 시 샤드 하나라도 응답하지 않으면 해당 사용자 요청이 실패하므로 모두 점검
+    for target in all_engines():
+        with target.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    return {"ok": True, "pool": pool_status()}
+
+
+def _check_redis() -> dict[str, Any]:
+    from app.core.redis_queue import redis_conn
+
+    redis_conn.ping()
+    return {"ok": True}
+
+
+def _check_queue_backlog() -> dict[str, Any]:
+    from app.core.redis_queue import (
+        default_queue,
+        high_priority_queue,
+        low_priority_queue,
+    )
+
+    backlog = {
+        queue.name: queue.count
+        for queue in (default_queue, high_priority_queue, low_priority_queue)
+    }
+    total = sum(backlog.values())
+    limit = settings.HEALTH_QUEUE_BACKLOG_LIMIT
+    return {"ok": limit <= 0 or total <= limit, "backlog": backlog, "total": total}
+
+
+class HealthMonitor:
+    """의존성 점검 결과를 주기적으로 갱신하는 모니터."""
+
+    CHECKS = {
+        "db": _check_db,
+        "redis": _check_redis,
+        "queue": _check_queue_backlog,
+    }
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._results: dict[str, dict[str, Any]] = {}
+        self._checked_at = 0.0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def run_checks(self) -> None:
+        """모든 점검을 실행하고 결과를 교체."""
+        results = {}
+        for name, check in self.CHECKS.items():
+            start = time.perf_counter()
+            try:
+                result = check()
+            except Exception as e:
+                result = {"ok": False, "error": str(e)}
+            result["latency_ms"] = round((time.perf_counter() - start) * 1000, 3)
+            if not result["ok"] and self._results.get(name, {}).get("ok", True):
+                logger.warning(f"의존성 점검 실패 - Check: {name}, Result: {result}")
+            results[name] = result
+        # 딕셔너리 교체는 원자적이므로 읽는 쪽에 잠금이 필요 없음
+        self._results = results
+        self._checked_at = time.monotonic()
+
+    def snapshot(self) -> tuple[bool, dict[str, Any]]:
+        """캐시된 결과로 준비 여부를 판단 (I/O 없음)."""
+        results = self._results
+        age = time.monotonic() - self._checked_at
+        # 점검 스레드가 멈췄다면 오래된 결과를 믿지 않음
+        fresh = bool(results) and age <= self.interval * 3
+        ready = fresh and all(result["ok"] for result in results.values())
+        return ready, {
+            "checks": results,
+            "age_seconds": round(age, 3) if results else None,
+            "stale": not fresh,
+        }
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.run_checks()
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        """점검 스레드 시작."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="health-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """점검 스레드 종료."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+health_monitor = HealthMonitor(settings.HEALTH_CHECK_INTERVAL_SECONDS)
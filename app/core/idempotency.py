@@ -0,0 +1,230 @@
+"""Idempotency-Key 지원.
+
+재시도된 POST 요청이 중복 이메일 조회와 bcrypt 해싱을 반복하지 않도록
+첫 응답(상태 코드 + 본문)을 Redis에 보관했다가 그대로 돌려준다.
+서비스 계층은 이 동작을 알 필요가 없다.
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+
+from fastapi.responses import JSONResponse
+from redis.exceptions import RedisError
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.middleware import get_request_id
+from app.core.redis_queue import get_async_redis_connection
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "idempotency-key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+# 요청마다 달라지므로 저장하지 않는 응답 헤더
+_VOLATILE_HEADERS = {b"x-request-id", b"x-process-time", b"x-db-query-count", b"date"}
+
+_STATE_IN_FLIGHT = "in_flight"
+_STATE_DONE = "done"
+_POLL_INTERVAL = 0.05
+
+
+def _error_response(status_code: int, detail: str, **headers: str) -> JSONResponse:
+    request_id = get_request_id() or "unknown"
+    return JSONResponse(
+        status_code=status_code,
+        content={"detail": detail, "request_id": request_id},
+        headers={"X-Request-ID": request_id, **headers},
+    )
+
+
+class IdempotencyMiddleware:
+    """Idempotency-Key 헤더가 있는 POST 요청의 첫 응답을 저장하고 재생하는 ASGI 미들웨어.
+
+    - 첫 요청: 처리 중 표시(SET NX)를 남기고 실행한 뒤 5xx가 아니면 응답을 저장
+    - 동시 중복 요청: 첫 요청의 결과가 저장될 때까지 기다렸다가 재생
+    - 이후 재시도: DB나 bcrypt를 거치지 않고 저장된 응답을 재생
+    같은 키를 다른 본문으로 재사용하면 422를 반환한다. Redis 장애 시에는
+    멱등성 없이 그대로 처리한다.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.paths = set(settings.IDEMPOTENCY_PATHS)
+        self._redis = None
+
+    @property
+    def redis(self):
+        if self._redis is None:
+            self._redis = get_async_redis_connection()
+        return self._redis
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"] not in self.paths
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        idempotency_key = headers.get(IDEMPOTENCY_HEADER)
+        if not idempotency_key:
+            await self.app(scope, receive, send)
+            return
+
+        body = await self._read_body(receive)
+        fingerprint = hashlib.sha256(body).hexdigest()
+        # 인증 주체가 다르면 같은 키라도 다른 요청으로 취급
+        principal = hashlib.sha256(
+            headers.get("authorization", "").encode()
+        ).hexdigest()[:16]
+        cache_key = f"idempotency:{scope['path']}:{principal}:{idempotency_key}"
+
+        try:
+            acquired = await self.redis.set(
+                cache_key,
+                json.dumps({"state": _STATE_IN_FLIGHT, "fingerprint": fingerprint}),
+                nx=True,
+                ex=settings.IDEMPOTENCY_LOCK_SECONDS,
+            )
+        except RedisError as e:
+            logger.error(f"Idempotency 저장소 사용 불가 - Error: {str(e)}")
+            await self.app(scope, self._replay_receive(body), send)
+            return
+
+        if acquired:
+            await self._execute(scope, body, send, cache_key, fingerprint)
+        else:
+            await self._replay(scope, receive, send, cache_key, fingerprint)
+
+    @staticmethod
+    async def _read_body(receive: Receive) -> bytes:
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        return b"".join(chunks)
+
+    @staticmethod
+    def _replay_receive(body: bytes) -> Receive:
+        sent = False
+
+        async def receive() -> Message:
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return {"type": "http.disconnect"}
+
+        return receive
+
+    async def _execute(
+        self, scope: Scope, body: bytes, send: Send, cache_key: str, fingerprint: str
+    ) -> None:
+        """첫 요청을 실행하고 응답을 저장."""
+        status_code = 500
+        response_headers: list[tuple[bytes, bytes]] = []
+        response_body: list[bytes] = []
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_headers
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_headers = [
+                    (name, value)
+                    for name, value in message.get("headers", [])
+                    if name.lower() not in _VOLATILE_HEADERS
+                ]
+            elif message["type"] == "http.response.body":
+                response_body.append(message.get("body", b""))
+            await send(message)
+
+        stored = False
+        try:
+            # 앱 예외(앱 내부의 RedisError 포함)는 키를 정리한 뒤 그대로 전파
+            await self.app(scope, self._replay_receive(body), send_wrapper)
+            if status_code < 500:
+                record = {
+                    "state": _STATE_DONE,
+                    "fingerprint": fingerprint,
+                    "status": status_code,
+                    "headers": [
+                        [name.decode("latin-1"), value.decode("latin-1")]
+                        for name, value in response_headers
+                    ],
+                    "body": base64.b64encode(b"".join(response_body)).decode(),
+                }
+                try:
+                    await self.redis.set(
+                        cache_key, json.dumps(record), ex=settings.IDEMPOTENCY_TTL_SECONDS
+                    )
+                    stored = True
+                except RedisError as e:
+                    logger.error(f"Idempotency 응답 저장 실패 - Error: {str(e)}")
+        finally:
+            if not stored:
+                # 서버 오류는 재시도할 수 있도록 처리 중 표시를 제거
+                try:
+                    await self.redis.delete(cache_key)
+                except RedisError as e:
+                    logger.error(f"Idempotency 키 정리 실패 - Error: {str(e)}")
+
+    async def _replay(
+        self, scope: Scope, receive: Receive, send: Send, cache_key: str, fingerprint: str
+    ) -> None:
+        """저장된 응답을 재생하거나, 처리 중이면 결과를 기다림."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.IDEMPOTENCY_WAIT_SECONDS
+        while True:
+            try:
+                raw = await self.redis.get(cache_key)
+            except RedisError as e:
+                logger.error(f"Idempotency 저장소 조회 실패 - Error: {str(e)}")
+                raw = None
+            record = json.loads(raw) if raw else None
+
+            if record is None:
+                # 첫 요청이 서버 오류로 키를 지웠거나 만료됨: 새 요청으로 처리하도록 안내
+                response = _error_response(
+                    409, "동일한 Idempotency-Key 요청이 실패했습니다. 다시 시도하세요",
+                    **{"Retry-After": "1"},
+                )
+                break
+            if record["fingerprint"] != fingerprint:
+                response = _error_response(
+                    422, "Idempotency-Key가 다른 요청 본문에 재사용되었습니다"
+                )
+                break
+            if record["state"] == _STATE_DONE:
+                logger.info(f"Idempotent 응답 재생 - Path: {scope['path']}")
+                await send(
+                    {
+                        "type": "http.response.start",
+                        "status": record["status"],
+                        "headers": [
+                            (name.encode("latin-1"), value.encode("latin-1"))
+                            for name, value in record["headers"]
+                        ]
+                        + [(REPLAYED_HEADER.lower().encode(), b"true")],
+                    }
+                )
+                await send(
+                    {"type": "http.response.body", "body": base64.b64decode(record["body"])}
+                )
+                return
+            if loop.time() >= deadline:
+                response = _error_response(
+                    409, "동일한 Idempotency-Key 요청이 처리 중입니다",
+                    **{"Retry-After": "1"},
+                )
+                break
+            await asyncio.sleep(_POLL_INTERVAL)
+
+        await response(scope, receive, send)
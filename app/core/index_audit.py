@@ -0,0 +1,299 @@
+"""인덱스 감사.
+
+SQLModel 메타데이터, Alembic 헤드 스키마, 실제 DB의 인덱스를 비교해
+정의 불일치, 중복(다른 인덱스가 이미 같은 조회를 지원) 인덱스,
+사용되지 않는 인덱스(pg_stat_user_indexes.idx_scan = 0)를 찾고,
+중복 인덱스를 지우는 마이그레이션을 생성한다.
+"""
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import Engine, create_engine, inspect, text
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+@dataclass(frozen=True)
+class IndexInfo:
+    """인덱스 하나의 정의 (PRIMARY KEY와 UNIQUE 제약이 만든 인덱스 포함)."""
+
+    table: str
+    name: str
+    columns: tuple[str, ...]
+    unique: bool
+    primary: bool = False
+    constraint: bool = False  # 제약 조건이 소유한 인덱스 (DROP INDEX 불가)
+    where: str | None = None  # 부분 인덱스 조건
+
+
+@dataclass
+class IndexUsage:
+    """실제 DB의 인덱스 사용 통계 (PostgreSQL)."""
+
+    scans: int
+    size_bytes: int
+
+
+@dataclass
+class AuditReport:
+    """감사 결과."""
+
+    missing_in_db: list[IndexInfo] = field(default_factory=list)
+    unexpected_in_db: list[IndexInfo] = field(default_factory=list)
+    metadata_vs_head: list[str] = field(default_factory=list)
+    redundant: list[tuple[IndexInfo, IndexInfo]] = field(default_factory=list)
+    unused: list[tuple[IndexInfo, IndexUsage]] = field(default_factory=list)
+    usage: dict[str, IndexUsage] = field(default_factory=dict)
+
+
+def _load_models() -> None:
+    """메타데이터에 모든 테이블을 등록."""
+    from app.api.users.models import User  # noqa: F401
+    from app.core.outbox import OutboxEvent  # noqa: F401
+    from app.core.sharding import UserDirectory  # noqa: F401
+
+
+def metadata_indexes() -> dict[str, list[IndexInfo]]:
+    """SQLModel 메타데이터에 정의된 인덱스."""
+    _load_models()
+    result: dict[str, list[IndexInfo]] = {}
+    for table in SQLModel.metadata.sorted_tables:
+        indexes = [
+            IndexInfo(
+                table.name,
+                f"{table.name}_pkey",
+                tuple(column.name for column in table.primary_key.columns),
+                unique=True,
+                primary=True,
+                constraint=True,
+            )
+        ]
+        for index in table.indexes:
+            where = index.dialect_options["postgresql"].get("where")
+            indexes.append(
+                IndexInfo(
+                    table.name,
+                    index.name,
+                    tuple(column.name for column in index.columns),
+                    unique=bool(index.unique),
+                    where=str(where) if where is not None else None,
+                )
+            )
+        result[table.name] = indexes
+    return result
+
+
+def _reflect_indexes(engine: Engine, tables: list[str]) -> dict[str, list[IndexInfo]]:
+    inspector = inspect(engine)
+    result: dict[str, list[IndexInfo]] = {}
+    for table in tables:
+        if not inspector.has_table(table):
+            continue
+        pk = inspector.get_pk_constraint(table)
+        indexes = [
+            IndexInfo(
+                table,
+                pk.get("name") or f"{table}_pkey",
+                tuple(pk["constrained_columns"]),
+                unique=True,
+                primary=True,
+                constraint=True,
+            )
+        ]
+        for constraint in inspector.get_unique_constraints(table):
+            indexes.append(
+                IndexInfo(
+                    table,
+                    constraint["name"],
+                    tuple(constraint["column_names"]),
+                    unique=True,
+                    constraint=True,
+                )
+            )
+        constraint_names = {index.name for index in indexes}
+        for index in inspector.get_indexes(table):
+            # PostgreSQL은 UNIQUE 제약의 인덱스를 get_indexes에도 보고함
+            if index["name"] in constraint_names or index.get("duplicates_constraint"):
+                continue
+            where = index.get("dialect_options", {}).get("postgresql_where")
+            indexes.append(
+                IndexInfo(
+                    table,
+                    index["name"],
+                    tuple(column for column in index["column_names"] if column),
+                    unique=bool(index["unique"]),
+                    where=str(where) if where is not None else None,
+                )
+            )
+        result[table] = indexes
+    return result
+
+
+def head_indexes(tables: list[str]) -> dict[str, list[IndexInfo]]:
+    """Alembic 헤드까지 적용한 스키마의 인덱스 (메모리 SQLite에 마이그레이션을 재현)."""
+    from alembic.config import Config
+
+    from alembic import command
+
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    alembic_cfg = Config(str(PROJECT_ROOT / "alembic.ini"))
+    alembic_cfg.set_main_option("script_location", str(PROJECT_ROOT / "alembic"))
+    with engine.begin() as connection:
+        alembic_cfg.attributes["connection"] = connection
+        command.upgrade(alembic_cfg, "head")
+    indexes = _reflect_indexes(engine, tables)
+    # SQLite는 부분 인덱스 조건과 기본 키 이름을 보고하지 않으므로 비교에서 제외
+    return {
+        table: [
+            IndexInfo(index.table, index.name, index.columns, index.unique, index.primary)
+            for index in table_indexes
+            if not index.primary
+        ]
+        for table, table_indexes in indexes.items()
+    }
+
+
+def index_usage(engine: Engine) -> dict[str, IndexUsage]:
+    """인덱스별 스캔 횟수와 크기 (PostgreSQL, 통계 초기화 이후 누적)."""
+    if engine.dialect.name != "postgresql":
+        return {}
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text(
+                "SELECT indexrelname, idx_scan, pg_relation_size(indexrelid) "
+                "FROM pg_stat_user_indexes"
+            )
+        ).all()
+    return {name: IndexUsage(scans, size) for name, scans, size in rows}
+
+
+def find_redundant(indexes: list[IndexInfo]) -> list[tuple[IndexInfo, IndexInfo]]:
+    """다른 인덱스가 대신할 수 있는 인덱스 목록 ((중복 인덱스, 대신하는 인덱스)).
+
+    A의 컬럼이 B의 선두 컬럼과 같고 조건이 같으면 A로 하는 조회를 B가 처리할 수
+    있다. 유일성을 보장하는 인덱스는 같은 컬럼의 유일 인덱스가 따로 있을 때만
+    중복으로 본다. 제약 조건이 소유한 인덱스는 지우지 않는다.
+    """
+    redundant: list[tuple[IndexInfo, IndexInfo]] = []
+    dropped: set[str] = set()
+    # 유지할 우선순위: 기본 키 > 제약 > 유일 > 컬럼이 많은 순
+    ranked = sorted(
+        indexes,
+        key=lambda index: (index.primary, index.constraint, index.unique, len(index.columns)),
+        reverse=True,
+    )
+    for candidate in reversed(ranked):
+        if candidate.constraint:
+            continue
+        for keeper in ranked:
+            if keeper is candidate or keeper.name in dropped:
+                continue
+            if keeper.where != candidate.where:
+                continue
+            if keeper.columns[: len(candidate.columns)] != candidate.columns:
+                continue
+            if candidate.unique and not (keeper.unique and keeper.columns == candidate.columns):
+                continue
+            redundant.append((candidate, keeper))
+            dropped.add(candidate.name)
+            break
+    return redundant
+
+
+def audit(engine: Engine) -> AuditReport:
+    """메타데이터, Alembic 헤드, 실제 DB를 비교."""
+    report = AuditReport()
+    expected = metadata_indexes()
+    tables = list(expected)
+    live = _reflect_indexes(engine, tables)
+    head = head_indexes(tables)
+    report.usage = index_usage(engine)
+
+    for table in tables:
+        expected_by_name = {index.name: index for index in expected[table] if not index.primary}
+        head_by_name = {index.name: index for index in head.get(table, [])}
+        for name in sorted(expected_by_name.keys() | head_by_name.keys()):
+            model_index, head_index = expected_by_name.get(name), head_by_name.get(name)
+            if model_index is None:
+                report.metadata_vs_head.append(f"{table}.{name}: 마이그레이션에만 있음")
+            elif head_index is None:
+                report.metadata_vs_head.append(f"{table}.{name}: 모델에만 있음 (마이그레이션 필요)")
+            elif (model_index.columns, model_index.unique) != (head_index.columns, head_index.unique):
+                report.metadata_vs_head.append(f"{table}.{name}: 모델과 마이그레이션 정의가 다름")
+
+        live_indexes = live.get(table, [])
+        live_by_name = {index.name: index for index in live_indexes}
+        for name, index in expected_by_name.items():
+            if name not in live_by_name:
+                report.missing_in_db.append(index)
+        report.unexpected_in_db.extend(
+            index
+            for index in live_indexes
+            if not index.primary and index.name not in expected_by_name
+        )
+        report.redundant.extend(find_redundant(live_indexes))
+        for index in live_indexes:
+            usage = report.usage.get(index.name)
+            if usage is not None and usage.scans == 0 and not index.unique:
+                report.unused.append((index, usage))
+    return report
+
+
+def _next_revision() -> tuple[str, str]:
+    """(다음 리비전 번호, 현재 헤드 번호)."""
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    alembic_cfg = Config(str(PROJECT_ROOT / "alembic.ini"))
+    alembic_cfg.set_main_option("script_location", str(PROJECT_ROOT / "alembic"))
+    head = ScriptDirectory.from_config(alembic_cfg).get_current_head()
+    return f"{int(head) + 1:03d}", head
+
+
+def _index_args(index: IndexInfo) -> str:
+    args = f'"{index.name}", "{index.table}", {json.dumps(list(index.columns))}'
+    if index.unique:
+        args += ", unique=True"
+    if index.where:
+        args += f", where={json.dumps(index.where)}"
+    return args
+
+
+def write_drop_migration(indexes: list[IndexInfo]) -> Path:
+    """인덱스들을 CONCURRENTLY로 지우는 마이그레이션 파일 생성 (downgrade는 재생성)."""
+    revision, head = _next_revision()
+    path = PROJECT_ROOT / "alembic" / "versions" / f"{revision}_drop_redundant_indexes.py"
+    upgrades = "\n".join(
+        f'    drop_index_concurrently("{index.name}", "{index.table}")' for index in indexes
+    )
+    downgrades = "\n".join(
+        f"    create_index_concurrently({_index_args(index)})" for index in reversed(indexes)
+    )
+    path.write_text(
+        f'''"""Drop redundant indexes
+Revision ID: {revision}
+Revises: {head}
+Create Date: {date.today().isoformat()}
+"""
+from typing import Sequence, Union
+from app.core.migrations import create_index_concurrently, drop_index_concurrently
+revision: str = "{revision}"
+down_revision: Union[str, Sequence[str], None] = "{head}"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+def upgrade() -> None:
+    # 다른 인덱스가 같은 조회를 처리하므로 쓰기마다 유지할 필요 없음
+{upgrades}
+def downgrade() -> None:
+{downgrades}
+''',
+        encoding="utf-8",
+    )
+    return path
@@ -3,8 +3,12 @@ import logging
 import sys
 from pathlib import Path
 
+from app.core.config import settings
 from app.core.middleware import get_request_id
 
+# 접근 로그에서 제외할 프로브 경로
+PROBE_PATHS = {"/health", "/livez", "/readyz"}
+
 
 class RequestIDFilter(logging.Filter):
     """로그에 Request ID를 추가하는 필터."""
@@ -14,6 +18,18 @@ class RequestIDFilter(logging.Filter):
         return True
 
 
+class ProbeAccessLogFilter(logging.Filter):
+    """헬스 프로브 요청을 uvicorn 접근 로그에서 제외하는 필터."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # uvicorn 접근 로그 인자: (client_addr, method, path, http_version, status)
+        args = record.args
+        if isinstance(args, tuple) and len(args) >= 3:
+            path = str(args[2]).split("?", 1)[0]
+            return path not in PROBE_PATHS
+        return True
+
+
 def setup_logging():
     """로깅 설정을 초기화."""
     # 로그 디렉토리 생성
@@ -67,6 +83,8 @@ def setup_logging():
     uvicorn_access_logger.handlers.clear()
     uvicorn_access_logger.addHandler(console_handler)
     uvicorn_access_logger.addHandler(file_handler)
+    if not settings.HEALTH_PROBE_LOGGING:
+        uvicorn_access_logger.addFilter(ProbeAccessLogFilter())
 
     return root_logger
 
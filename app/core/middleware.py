@@ -1,11 +1,26 @@
 """미들웨어 설정."""
 import time
 import uuid
+import zlib
 from contextvars import ContextVar
 from typing import Callable
 
 from fastapi import Request, Response
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - 선택 의존성
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - 선택 의존성
+    zstandard = None
 
 # Request ID를 저장하는 컨텍스트 변수
 request_id_var: ContextVar[str] = ContextVar("request_id", default="")
@@ -44,6 +59,173 @@ class ResponseTimeMiddleware(BaseHTTPMiddleware):
         return response
 
 
+class _GzipEncoder:
+    encoding = "gzip"
+
+    def __init__(self):
+        self._compressor = zlib.compressobj(
+            settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, zlib.MAX_WBITS | 16
+        )
+
+    def compress(self, data: bytes) -> bytes:
+        # 스트리밍 중에는 청크마다 flush하여 클라이언트가 바로 받을 수 있게 함
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class _BrotliEncoder:
+    encoding = "br"
+
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+class _ZstdEncoder:
+    encoding = "zstd"
+
+    def __init__(self):
+        compressor = zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL)
+        self._compressor = compressor.compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+# 서버 선호 순서대로 사용 가능한 인코더
+_ENCODERS = {
+    encoder.encoding: encoder
+    for encoder, available in (
+        (_BrotliEncoder, brotli is not None),
+        (_ZstdEncoder, zstandard is not None),
+        (_GzipEncoder, True),
+    )
+    if available
+}
+
+
+def _select_encoder(accept_encoding: str):
+    """Accept-Encoding 헤더에서 사용할 인코더를 선택."""
+    accepted: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    for encoding, encoder in _ENCODERS.items():
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoder
+    return None
+
+
+class CompressionMiddleware:
+    """gzip/brotli/zstd 응답 압축 미들웨어 (순수 ASGI).
+
+    최소 크기와 Content-Type 허용 목록을 만족하는 응답만 압축한다.
+    스트리밍 응답은 전체를 버퍼링하지 않고 청크 단위로 압축해 전달한다.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MINIMUM_SIZE
+        self.content_types = set(settings.COMPRESSION_CONTENT_TYPES)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoder_class = _select_encoder(
+            Headers(scope=scope).get("accept-encoding", "")
+        )
+        if encoder_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message | None = None
+        encoder = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, encoder, passthrough
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if encoder is None:
+                # 첫 번째 본문 청크에서 압축 여부 결정
+                headers = MutableHeaders(scope=start_message)
+                content_length = headers.get("content-length")
+                size = int(content_length) if content_length else None
+                if size is None and not more_body:
+                    size = len(body)
+                if not self._should_compress(start_message, headers, size):
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                encoder = encoder_class()
+                headers["Content-Encoding"] = encoder.encoding
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del headers["Content-Length"]
+                    await send(start_message)
+                else:
+                    compressed = encoder.finish(body)
+                    headers["Content-Length"] = str(len(compressed))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+                body = encoder.compress(body)
+                await send({"type": "http.response.body", "body": body, "more_body": True})
+                return
+
+            body = encoder.compress(body) if more_body else encoder.finish(body)
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _should_compress(
+        self, message: Message, headers: MutableHeaders, size: int | None
+    ) -> bool:
+        if message["status"] < 200 or message["status"] in (204, 304):
+            return False
+        if "content-encoding" in headers:
+            return False
+        media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        if media_type not in self.content_types:
+            return False
+        return size is None or size >= self.minimum_size
+
+
 def get_request_id() -> str:
     """현재 요청의 Request ID를 반환."""
     return request_id_var.get()
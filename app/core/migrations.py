@@ -0,0 +1,318 @@
+"""무중단 마이그레이션 헬퍼.
+
+마이그레이션 스크립트(alembic/versions)에서 사용한다. 큰 테이블에서도 쓰기를
+막지 않도록 PostgreSQL에서는 인덱스를 CONCURRENTLY로 만들고/지우며,
+백필은 키 범위 단위로 나눠 배치마다 커밋하고 배치 사이에 쉰다.
+
+CONCURRENTLY 작업과 배치 백필은 트랜잭션 밖(autocommit_block)에서 실행되므로
+앞선 DDL이 먼저 커밋된다. 이런 작업은 별도 리비전으로 분리하는 것이 좋다.
+
+migrate.py upgrade --dry-run으로 실행하면 모든 변경을 롤백되는 트랜잭션 안에서
+수행하고, 인덱스 생성과 백필은 소요 시간만 추정해 보고한다. 드라이런도 실제 DB에
+연결해 DDL과 백필 첫 배치를 실행하므로 롤백될 때까지 잠금을 잡는다
+(운영 DB에서는 한가한 시간에 lock_timeout을 짧게 두고 실행).
+
+migrate.py sql(오프라인 모드)에서는 DB 연결 없이 SQL만 출력하므로 잠금 대기 시간
+복원, INVALID 인덱스 정리, 백필 키 범위 계산처럼 조회가 필요한 단계는 건너뛰거나
+조회 없이 같은 효과를 내는 SQL로 대신한다.
+"""
+import logging
+import math
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from typing import Any
+
+from sqlalchemy import inspect, text
+
+from alembic import context, op
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 드라이런 추정 결과 (migrate.py가 실행 후 출력)
+migration_report: list[dict[str, Any]] = []
+
+
+def _option(name: str, default: Any) -> Any:
+    """migrate.py가 Alembic Config에 넘긴 실행 옵션."""
+    value = context.config.attributes.get(name)
+    return default if value is None else value
+
+
+def is_dry_run() -> bool:
+    """드라이런(추정만 하고 롤백) 모드인지 여부 (오프라인 SQL 출력에는 해당 없음)."""
+    return not context.is_offline_mode() and bool(_option("dry_run", False))
+
+
+def _is_postgres() -> bool:
+    # 오프라인 모드에는 연결이 없으므로 마이그레이션 컨텍스트의 방언으로 판단
+    return op.get_context().dialect.name == "postgresql"
+
+
+def _report(step: str, **info: Any) -> None:
+    entry = {"step": step, **info}
+    migration_report.append(entry)
+    logger.info(f"마이그레이션 추정 - {entry}")
+
+
+@contextmanager
+def lock_timeout(timeout: str) -> Iterator[None]:
+    """블록 안의 DDL이 잠금을 timeout 이상 기다리면 실패하도록 설정 (PostgreSQL).
+
+    ACCESS EXCLUSIVE 잠금을 기다리는 DDL 뒤로 모든 조회/쓰기가 줄을 서는 것을 막는다.
+    """
+    if not _is_postgres():
+        yield
+        return
+    if context.is_offline_mode():
+        # 이전 값을 조회할 수 없으므로 env.py가 세션에 거는 기본값으로 되돌림
+        default = _option("lock_timeout", settings.MIGRATION_LOCK_TIMEOUT)
+        op.execute(text(f"SET lock_timeout = '{timeout}'"))
+        try:
+            yield
+        finally:
+            op.execute(text(f"SET lock_timeout = '{default}'"))
+        return
+    bind = op.get_bind()
+    previous = bind.execute(text("SHOW lock_timeout")).scalar()
+    bind.execute(text("SELECT set_config('lock_timeout', :value, false)"), {"value": timeout})
+    try:
+        yield
+    finally:
+        bind.execute(
+            text("SELECT set_config('lock_timeout', :value, false)"), {"value": previous}
+        )
+
+
+def _table_stats(table_name: str) -> tuple[int, int | None]:
+    """테이블의 (추정 행 수, 디스크 크기 바이트)."""
+    bind = op.get_bind()
+    if _is_postgres():
+        rows, size = bind.execute(
+            text(
+                "SELECT reltuples::bigint, pg_total_relation_size(oid) "
+                "FROM pg_class WHERE oid = to_regclass(:table)"
+            ),
+            {"table": table_name},
+        ).one()
+        return max(rows, 0), size
+    return bind.execute(text(f"SELECT count(*) FROM {table_name}")).scalar(), None
+
+
+def _estimate_index_build(table_name: str, columns: Sequence[str]) -> float:
+    """표본 정렬 시간을 전체 행 수로 환산한 인덱스 생성 시간 추정 (초)."""
+    bind = op.get_bind()
+    column_list = ", ".join(columns)
+    if _is_postgres():
+        # 1% 블록 표본을 정렬해 걸린 시간 x 100, CONCURRENTLY는 테이블을 두 번 읽음
+        start = time.perf_counter()
+        bind.execute(
+            text(
+                f"SELECT count(*) FROM (SELECT {column_list} FROM {table_name} "
+                f"TABLESAMPLE SYSTEM (1) ORDER BY {column_list}) AS sample"
+            )
+        )
+        return (time.perf_counter() - start) * 100 * 2
+    start = time.perf_counter()
+    bind.execute(
+        text(
+            f"SELECT count(*) FROM (SELECT {column_list} FROM {table_name} "
+            f"ORDER BY {column_list}) AS sample"
+        )
+    )
+    return time.perf_counter() - start
+
+
+def _drop_invalid_index(index_name: str) -> None:
+    """이전에 실패한 CONCURRENTLY 생성이 남긴 INVALID 인덱스를 제거."""
+    invalid = op.get_bind().execute(
+        text(
+            "SELECT 1 FROM pg_index "
+            "WHERE indexrelid = to_regclass(:index) AND NOT indisvalid"
+        ),
+        {"index": index_name},
+    ).first()
+    if invalid:
+        logger.warning(f"INVALID 인덱스 제거 후 다시 생성 - Index: {index_name}")
+        op.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}"))
+
+
+def create_index_concurrently(
+    index_name: str,
+    table_name: str,
+    columns: Sequence[str],
+    unique: bool = False,
+    where: str | None = None,
+) -> None:
+    """쓰기를 막지 않고 인덱스 생성 (PostgreSQL은 CONCURRENTLY, 그 외는 일반 생성)."""
+    if is_dry_run():
+        rows, size = _table_stats(table_name)
+        _report(
+            f"create index {index_name}",
+            rows=rows,
+            table_bytes=size,
+            estimated_seconds=round(_estimate_index_build(table_name, columns), 3),
+        )
+        return
+
+    condition = text(where) if where else None
+    if not _is_postgres():
+        op.create_index(
+            index_name,
+            table_name,
+            list(columns),
+            unique=unique,
+            sqlite_where=condition,
+            if_not_exists=True,
+        )
+        return
+
+    with op.get_context().autocommit_block():
+        # 오프라인 SQL에서는 INVALID 여부를 조회할 수 없어 정리 단계를 건너뜀
+        if not context.is_offline_mode():
+            _drop_invalid_index(index_name)
+        op.create_index(
+            index_name,
+            table_name,
+            list(columns),
+            unique=unique,
+            postgresql_where=condition,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def drop_index_concurrently(index_name: str, table_name: str) -> None:
+    """쓰기를 막지 않고 인덱스 삭제 (PostgreSQL은 CONCURRENTLY, 그 외는 일반 삭제)."""
+    if is_dry_run():
+        _report(f"drop index {index_name}", estimated_seconds=0.0)
+        return
+    if not _is_postgres():
+        op.drop_index(index_name, table_name=table_name, if_exists=True)
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            index_name,
+            table_name=table_name,
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def index_is_unique(index_name: str, table_name: str) -> bool | None:
+    """인덱스가 유일 인덱스인지 여부 (인덱스가 없거나 오프라인이라 알 수 없으면 None)."""
+    if context.is_offline_mode():
+        return None
+    bind = op.get_bind()
+    if _is_postgres():
+        return bind.execute(
+            text(
+                "SELECT indisunique FROM pg_index WHERE indexrelid = to_regclass(:index)"
+            ),
+            {"index": index_name},
+        ).scalar()
+    for index in inspect(bind).get_indexes(table_name):
+        if index["name"] == index_name:
+            return bool(index["unique"])
+    return None
+
+
+def rebuild_index_unique(
+    index_name: str, table_name: str, columns: Sequence[str]
+) -> None:
+    """인덱스를 같은 이름의 유일 인덱스로 교체 (없으면 새로 생성).
+
+    PostgreSQL에서는 임시 이름으로 유일 인덱스를 CONCURRENTLY 만든 뒤 기존 인덱스를
+    지우고 이름을 바꾸므로 교체하는 동안에도 같은 열을 덮는 인덱스가 남아 있다.
+    중단 후 다시 실행해도 이어서 진행된다.
+    """
+    if not _is_postgres():
+        drop_index_concurrently(index_name, table_name)
+        create_index_concurrently(index_name, table_name, columns, unique=True)
+        return
+
+    replacement = f"{index_name}_unique"
+    create_index_concurrently(replacement, table_name, columns, unique=True)
+    drop_index_concurrently(index_name, table_name)
+    if is_dry_run():
+        # 드라이런에서는 임시 인덱스를 만들지 않았으므로 이름 변경도 보고만 함
+        _report(f"rename index {replacement}", estimated_seconds=0.0)
+        return
+    # 이름 변경은 인덱스에 짧은 잠금만 잡음 (대기 시간은 세션의 lock_timeout으로 제한)
+    op.execute(text(f"ALTER INDEX IF EXISTS {replacement} RENAME TO {index_name}"))
+
+
+def backfill_in_batches(
+    table_name: str,
+    assignments: str,
+    where: str = "1 = 1",
+    key: str = "id",
+    batch_size: int | None = None,
+    throttle_seconds: float | None = None,
+) -> int:
+    """키 범위 단위로 나눠 UPDATE하고 배치마다 커밋 (갱신한 행 수 반환).
+
+    where에는 아직 채워지지 않은 행만 고르는 조건(예: "col IS NULL")을 주어야
+    중단 후 다시 실행해도 같은 행을 반복해서 갱신하지 않는다.
+    """
+    batch_size = batch_size or _option("batch_size", settings.MIGRATION_BATCH_SIZE)
+    throttle_seconds = (
+        throttle_seconds
+        if throttle_seconds is not None
+        else _option("throttle_seconds", settings.MIGRATION_THROTTLE_SECONDS)
+    )
+    if context.is_offline_mode():
+        # 키 범위를 조회할 수 없으므로 한 문장으로 출력 (큰 테이블은 온라인으로 실행)
+        logger.warning(f"오프라인 SQL은 백필을 배치로 나누지 않음 - Table: {table_name}")
+        with op.get_context().autocommit_block():
+            op.execute(text(f"UPDATE {table_name} SET {assignments} WHERE {where}"))
+        return 0
+
+    bind = op.get_bind()
+    low, high = bind.execute(
+        text(f"SELECT min({key}), max({key}) FROM {table_name} WHERE {where}")
+    ).one()
+    if low is None:
+        logger.info(f"백필 대상 없음 - Table: {table_name}")
+        return 0
+
+    statement = text(
+        f"UPDATE {table_name} SET {assignments} "
+        f"WHERE {key} >= :low AND {key} < :high AND ({where})"
+    )
+    total_batches = math.ceil((high - low + 1) / batch_size)
+
+    if is_dry_run():
+        # 배치 하나를 실제로 실행해 시간을 재고 (전체가 롤백됨) 나머지는 환산
+        rows = bind.execute(
+            text(f"SELECT count(*) FROM {table_name} WHERE {where}")
+        ).scalar()
+        start = time.perf_counter()
+        bind.execute(statement, {"low": low, "high": low + batch_size})
+        batch_seconds = time.perf_counter() - start
+        _report(
+            f"backfill {table_name}",
+            rows=rows,
+            batches=total_batches,
+            estimated_seconds=round(total_batches * (batch_seconds + throttle_seconds), 3),
+        )
+        return 0
+
+    updated = 0
+    started = time.perf_counter()
+    with op.get_context().autocommit_block():
+        for batch, batch_low in enumerate(range(low, high + 1, batch_size), start=1):
+            result = bind.execute(
+                statement, {"low": batch_low, "high": batch_low + batch_size}
+            )
+            updated += max(result.rowcount, 0)
+            elapsed = time.perf_counter() - started
+            remaining = elapsed / batch * (total_batches - batch)
+            logger.info(
+                f"백필 진행 - Table: {table_name}, Batch: {batch}/{total_batches}, "
+                f"Updated: {updated}, Elapsed: {elapsed:.1f}s, ETA: {remaining:.1f}s"
+            )
+            if throttle_seconds and batch < total_batches:
+                time.sleep(throttle_seconds)
+    return updated
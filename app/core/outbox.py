@@ -0,0 +1,450 @@
+"""트랜잭션 아웃박스.
+
+서비스가 도메인 변경과 같은 트랜잭션에서 outbox_events 행을 쓰고,
+백그라운드 발행기가 미발행 행을 배치로 Redis 스트림에 발행한다.
+발행은 최소 한 번(at-least-once)이며 소비자는 event_id로 중복을 제거한다.
+
+변경 피드(SSE)를 위해 PostgreSQL에서는 같은 트랜잭션에서 pg_notify를 호출해
+커밋 시점에 알림이 전달되고, 그 외 환경에서는 발행기가 Redis pub/sub으로
+같은 메시지를 함께 발행한다.
+
+사용자 샤딩 시 이벤트는 사용자와 같은 샤드에 쓰이고, 발행기와 이어받기 조회는
+모든 샤드를 돈다. 이벤트 ID는 샤드 번호를 섞은 전역 ID(app.core.sharding)이다.
+샤드 간 이벤트 ID에는 순서가 없으므로 변경 피드 이어받기는 샤드마다 마지막으로
+보낸 ID를 담은 커서(EventCursor)를 쓴다.
+"""
+import heapq
+import json
+import logging
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Any, Optional
+
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Column,
+    Engine,
+    Index,
+    Integer,
+    delete,
+    func,
+    text,
+)
+from sqlmodel import Field, Session, SQLModel, select
+
+from app.core.config import settings
+from app.core.database import engine, shard_engines, user_shards
+from app.core.sharding import (
+    global_event_id,
+    local_event_cursor,
+    shard_for_user,
+    shard_index,
+    split_event_id,
+)
+
+logger = logging.getLogger(__name__)
+
+# 여러 워커 중 하나만 발행하도록 하는 PostgreSQL advisory lock 키
+_PUBLISHER_LOCK_KEY = 0x6F7574626F78  # "outbox"
+# 발행된 이벤트 정리도 한 워커만 하도록 하는 advisory lock 키
+_PURGE_LOCK_KEY = 0x6F7574707267  # "outprg"
+
+# Redis 스트림 ID 커서 (<밀리초>-<순번>, 처음부터 읽을 때는 "0")
+_STREAM_CURSOR_RE = re.compile(r"\d+(-\d+)?")
+
+# 샤딩 시 변경 피드 커서 (<샤드 번호>:<샤드 내 이벤트 ID>를 쉼표로 연결, 예: "0:12,1:40")
+_SHARD_CURSOR_RE = re.compile(r"\d+:\d+(,\d+:\d+)*")
+
+# 변경 피드 이어받기 커서 (샤드 ID → 마지막으로 보낸 샤드 내 이벤트 ID)
+# 샤딩하지 않으면 키는 None 하나이고 값은 이벤트 ID와 같다
+EventCursor = dict[str | None, int]
+
+
+class OutboxEvent(SQLModel, table=True):
+    """발행 대기 중인 도메인 이벤트."""
+
+    __tablename__ = "outbox_events"
+
+    id: Optional[int] = Field(
+        default=None,
+        # SQLite는 INTEGER PRIMARY KEY만 자동 증가하므로 변형 타입 사용
+        sa_column=Column(
+            BigInteger().with_variant(Integer, "sqlite"),
+            primary_key=True,
+            autoincrement=True,
+        ),
+    )
+    aggregate_type: str = Field(max_length=50, description="이벤트 대상 종류")
+    aggregate_id: int = Field(description="이벤트 대상 ID")
+    event_type: str = Field(max_length=100, description="이벤트 종류")
+    payload: dict = Field(default_factory=dict, sa_column=Column(JSON, nullable=False))
+    created_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        description="생성 시간",
+    )
+    published_at: Optional[datetime] = Field(default=None, description="발행 시간")
+
+    __table_args__ = (
+        # 미발행 이벤트만 담는 부분 인덱스 (발행된 행은 인덱스 유지 비용 없음)
+        Index(
+            "idx_outbox_unpublished",
+            "id",
+            postgresql_where=text("published_at IS NULL"),
+            sqlite_where=text("published_at IS NULL"),
+        ),
+    )
+
+
+def add_outbox_event(
+    session: Session,
+    aggregate_type: str,
+    aggregate_id: int,
+    event_type: str,
+    payload: dict[str, Any],
+) -> OutboxEvent:
+    """현재 트랜잭션에 아웃박스 이벤트를 추가 (커밋은 호출자가 수행)."""
+    event = OutboxEvent(
+        aggregate_type=aggregate_type,
+        aggregate_id=aggregate_id,
+        event_type=event_type,
+        payload=payload,
+    )
+    session.add(event)
+    if change_feed_backend() == "postgres":
+        # NOTIFY는 커밋될 때 전달되고 롤백되면 버려짐 (ID가 필요하므로 flush)
+        session.flush()
+        shard_id = shard_for_user(aggregate_id) if shard_engines else None
+        session.execute(
+            text("SELECT pg_notify(:channel, :message)"),
+            {
+                "channel": settings.CHANGE_FEED_CHANNEL,
+                "message": json.dumps(event_message(event, shard_id)),
+            },
+            bind_arguments={"shard_id": shard_id} if shard_id else None,
+        )
+    return event
+
+
+def add_outbox_events(
+    session: Session,
+    aggregate_type: str,
+    event_type: str,
+    payloads: dict[int, dict[str, Any]],
+) -> list[OutboxEvent]:
+    """같은 종류의 이벤트 여러 개를 현재 트랜잭션에 한 번에 추가 (대상 ID → payload).
+
+    이벤트 행은 한 번의 flush로 일괄 INSERT되고, PostgreSQL 알림도 한 문으로 보낸다.
+    샤딩 시 대상들은 모두 같은 샤드에 있어야 한다.
+    """
+    events = [
+        OutboxEvent(
+            aggregate_type=aggregate_type,
+            aggregate_id=aggregate_id,
+            event_type=event_type,
+            payload=payload,
+        )
+        for aggregate_id, payload in payloads.items()
+    ]
+    session.add_all(events)
+    if events and change_feed_backend() == "postgres":
+        session.flush()
+        shard_id = shard_for_user(events[0].aggregate_id) if shard_engines else None
+        session.execute(
+            text("SELECT pg_notify(:channel, message) FROM unnest(:messages) AS message"),
+            {
+                "channel": settings.CHANGE_FEED_CHANNEL,
+                "messages": [json.dumps(event_message(event, shard_id)) for event in events],
+            },
+            bind_arguments={"shard_id": shard_id} if shard_id else None,
+        )
+    return events
+
+
+def change_feed_backend() -> str:
+    """변경 알림을 전달할 경로 ("postgres" 또는 "redis")."""
+    if settings.CHANGE_FEED_BACKEND != "auto":
+        return settings.CHANGE_FEED_BACKEND
+    # 샤딩 시에는 알림이 여러 DB에서 오므로 Redis 한 채널로 모음
+    if shard_engines or engine.dialect.name != "postgresql":
+        return "redis"
+    return "postgres"
+
+
+def event_message(event: OutboxEvent, shard_id: str | None = None) -> dict[str, Any]:
+    """변경 피드로 전달할 이벤트 메시지."""
+    return {
+        "event_id": global_event_id(event.id, shard_id),
+        "user_id": event.aggregate_id,
+        "event_type": event.event_type,
+        "payload": event.payload,
+        "created_at": event.created_at.isoformat(),
+    }
+
+
+def parse_event_cursor(value: str) -> EventCursor:
+    """Last-Event-ID(또는 after) 값을 이어받기 커서로 변환 (형식이 잘못되면 ValueError).
+
+    샤딩하지 않으면 이벤트 ID 하나, 샤딩 시 format_event_cursor가 만든 샤드별 커서다.
+    샤딩 시 이벤트 ID 하나만 받으면(이전 형식) 모든 샤드에 같은 기준을 적용하므로
+    다른 샤드보다 늦게 증가한 샤드의 이벤트를 놓칠 수 있다.
+    """
+    if value.isascii() and value.isdigit():
+        event_id = int(value)
+        return {
+            shard_id: local_event_cursor(event_id, shard_id) for shard_id, _ in user_shards()
+        }
+    if not shard_engines or not _SHARD_CURSOR_RE.fullmatch(value):
+        raise ValueError(f"잘못된 이벤트 커서: {value}")
+    cursor: EventCursor = {}
+    for part in value.split(","):
+        index, local_id = part.split(":")
+        shard_id = f"shard_{int(index)}"
+        # 샤드 구성이 바뀌어 없어진 샤드는 무시 (새 샤드는 처음부터 읽음)
+        if shard_id in shard_engines:
+            cursor[shard_id] = int(local_id)
+    return cursor
+
+
+def format_event_cursor(cursor: EventCursor) -> str:
+    """이어받기 커서를 SSE id 값으로 변환 (parse_event_cursor의 역)."""
+    if not shard_engines:
+        return str(cursor.get(None, 0))
+    return ",".join(
+        f"{shard_index(shard_id)}:{cursor.get(shard_id, 0)}" for shard_id in shard_engines
+    )
+
+
+def advance_event_cursor(cursor: EventCursor, event_id: int) -> None:
+    """보낸 이벤트를 커서에 반영 (샤드마다 보낸 것 중 가장 큰 ID)."""
+    shard_id, local_id = split_event_id(event_id)
+    cursor[shard_id] = max(cursor.get(shard_id, 0), local_id)
+
+
+def current_event_cursor() -> EventCursor:
+    """샤드마다 지금까지 쓰인 마지막 이벤트 ID (처음 구독할 때의 이어받기 기준)."""
+    cursor: EventCursor = {}
+    for shard_id, shard_engine in user_shards():
+        with Session(shard_engine) as session:
+            cursor[shard_id] = session.exec(select(func.max(OutboxEvent.id))).one() or 0
+    return cursor
+
+
+def load_events_after(
+    cursor: EventCursor, limit: int, lookback: int = 0
+) -> list[dict[str, Any]]:
+    """DB에서 커서 이후의 이벤트를 읽음 (변경 피드 이어받기용).
+
+    샤드마다 커서의 ID 이후를 ID 순서로 읽고, 샤드 안의 순서를 지킨 채 생성 시각
+    순으로 합친다. ID는 커밋 순서와 다를 수 있어 커서보다 작은 ID가 나중에 커밋될
+    수 있으므로, lookback을 주면 커서보다 그만큼 앞선 ID부터 다시 읽는다 (이미 보낸
+    이벤트가 다시 포함되며 소비자가 event_id로 중복을 거른다).
+    """
+    per_shard: list[list[dict[str, Any]]] = []
+    for shard_id, shard_engine in user_shards():
+        with Session(shard_engine) as session:
+            events = session.exec(
+                select(OutboxEvent)
+                .where(OutboxEvent.id > max(cursor.get(shard_id, 0) - lookback, 0))
+                .order_by(OutboxEvent.id)
+                .limit(limit)
+            ).all()
+            per_shard.append([event_message(event, shard_id) for event in events])
+    merged = heapq.merge(*per_shard, key=lambda message: message["created_at"])
+    return list(islice(merged, limit))
+
+
+def _stream_fields(event: OutboxEvent, shard_id: str | None) -> dict[str, str]:
+    return {
+        "event_id": str(global_event_id(event.id, shard_id)),
+        "aggregate_type": event.aggregate_type,
+        "aggregate_id": str(event.aggregate_id),
+        "event_type": event.event_type,
+        "payload": json.dumps(event.payload),
+        "created_at": event.created_at.isoformat(),
+    }
+
+
+class OutboxPublisher:
+    """미발행 아웃박스 이벤트를 배치로 Redis 스트림에 발행하는 발행기.
+
+    이벤트는 id 순서로 발행되고 한 번에 하나의 발행기만 동작한다. 시퀀스 id는
+    커밋 순서와 다를 수 있어 서로 다른 사용자의 이벤트는 id 순서와 다르게 보일 수
+    있다. 같은 사용자에 대한 수정/삭제는 이벤트 id를 받기 전에 users 행을 잠그므로
+    (UserService.update_user/delete_user의 SELECT ... FOR UPDATE, 일괄 삭제의 DELETE)
+    앞선 변경이 커밋된 뒤에 다음 id가 발급되어 사용자(aggregate)별 순서는 유지된다.
+    """
+
+    def __init__(self, poll_interval: float, batch_size: int):
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def publish_batch(self) -> int:
+        """샤드마다 미발행 이벤트 한 배치를 발행하고 발행한 수를 반환."""
+        return sum(
+            self._publish_shard(shard_id, shard_engine)
+            for shard_id, shard_engine in user_shards()
+        )
+
+    def _publish_shard(self, shard_id: str | None, shard_engine: Engine) -> int:
+        from app.core.redis_queue import redis_conn
+
+        with Session(shard_engine) as session:
+            if shard_engine.dialect.name == "postgresql":
+                # 다른 워커가 발행 중이면 건너뜀 (트랜잭션 종료 시 자동 해제)
+                locked = session.execute(
+                    text("SELECT pg_try_advisory_xact_lock(:key)"),
+                    {"key": _PUBLISHER_LOCK_KEY},
+                ).scalar()
+                if not locked:
+                    return 0
+
+            events = session.exec(
+                select(OutboxEvent)
+                .where(OutboxEvent.published_at.is_(None))
+                .order_by(OutboxEvent.id)
+                .limit(self.batch_size)
+            ).all()
+            if not events:
+                return 0
+
+            notify_redis = change_feed_backend() == "redis"
+            pipeline = redis_conn.pipeline(transaction=False)
+            for event in events:
+                pipeline.xadd(
+                    settings.OUTBOX_STREAM_NAME,
+                    _stream_fields(event, shard_id),
+                    maxlen=settings.OUTBOX_STREAM_MAXLEN,
+                    approximate=True,
+                )
+                if notify_redis:
+                    pipeline.publish(
+                        settings.CHANGE_FEED_CHANNEL,
+                        json.dumps(event_message(event, shard_id)),
+                    )
+            pipeline.execute()
+
+            # 여기서 실패하면 다음 배치에서 다시 발행됨 (at-least-once)
+            published_at = datetime.utcnow()
+            for event in events:
+                event.published_at = published_at
+                session.add(event)
+            session.commit()
+            return len(events)
+
+    def purge_published(self) -> int:
+        """보존 기간이 지난 발행 완료 이벤트를 삭제하고 삭제한 수를 반환.
+
+        샤드마다 OUTBOX_PURGE_BATCH_SIZE개씩 짧은 트랜잭션으로 나눠 지운다.
+        """
+        if settings.OUTBOX_RETENTION_SECONDS <= 0:
+            return 0
+        retention = timedelta(seconds=settings.OUTBOX_RETENTION_SECONDS)
+        cutoff = datetime.utcnow() - retention
+        deleted = 0
+        for _, shard_engine in user_shards():
+            while not self._stop.is_set():
+                count = self._purge_shard(shard_engine, cutoff)
+                deleted += count
+                if count < settings.OUTBOX_PURGE_BATCH_SIZE:
+                    break
+        return deleted
+
+    def _purge_shard(self, shard_engine: Engine, cutoff: datetime) -> int:
+        with Session(shard_engine) as session:
+            if shard_engine.dialect.name == "postgresql":
+                # 다른 워커가 정리 중이면 건너뜀 (트랜잭션 종료 시 자동 해제)
+                locked = session.execute(
+                    text("SELECT pg_try_advisory_xact_lock(:key)"),
+                    {"key": _PURGE_LOCK_KEY},
+                ).scalar()
+                if not locked:
+                    return 0
+
+            # 발행은 id 순서로 진행되므로 오래된 발행 완료 행은 id 앞쪽에 모여 있음
+            batch = (
+                select(OutboxEvent.id)
+                .where(OutboxEvent.published_at.is_not(None))
+                .where(OutboxEvent.published_at < cutoff)
+                .order_by(OutboxEvent.id)
+                .limit(settings.OUTBOX_PURGE_BATCH_SIZE)
+            )
+            result = session.execute(
+                delete(OutboxEvent).where(OutboxEvent.id.in_(batch))
+            )
+            session.commit()
+            return result.rowcount
+
+    def _run(self) -> None:
+        next_purge = 0.0
+        while not self._stop.is_set():
+            try:
+                published = self.publish_batch()
+            except Exception as e:
+                logger.error(f"아웃박스 발행 실패 - Error: {str(e)}")
+                published = 0
+            if time.monotonic() >= next_purge:
+                next_purge = time.monotonic() + settings.OUTBOX_PURGE_INTERVAL_SECONDS
+                try:
+                    purged = self.purge_published()
+                    if purged:
+                        logger.info(f"발행된 아웃박스 이벤트 정리 - Count: {purged}")
+                except Exception as e:
+                    logger.error(f"아웃박스 정리 실패 - Error: {str(e)}")
+            # 배치가 가득 찼으면 밀린 이벤트가 있으므로 바로 다음 배치 진행
+            if published < self.batch_size:
+                self._stop.wait(self.poll_interval)
+
+    def start(self) -> None:
+        """발행 스레드 시작."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="outbox-publisher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """발행 스레드 종료."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def read_events(after: str = "0", limit: int = 100) -> tuple[list[dict], str]:
+    """스트림에서 커서 이후의 이벤트를 읽고 다음 커서를 반환 (증분 소비용).
+
+    커서가 스트림 ID 형식이 아니면 ValueError가 발생한다.
+    """
+    from app.core.redis_queue import redis_conn
+
+    if not _STREAM_CURSOR_RE.fullmatch(after):
+        raise ValueError(f"잘못된 이벤트 커서: {after}")
+
+    entries = redis_conn.xrange(
+        settings.OUTBOX_STREAM_NAME, min=f"({after}", max="+", count=limit
+    )
+    events = []
+    cursor = after
+    for stream_id, fields in entries:
+        cursor = stream_id.decode()
+        decoded = {key.decode(): value.decode() for key, value in fields.items()}
+        events.append(
+            {
+                "cursor": cursor,
+                "event_id": int(decoded["event_id"]),
+                "user_id": int(decoded["aggregate_id"]),
+                "event_type": decoded["event_type"],
+                "payload": json.loads(decoded["payload"]),
+                "created_at": decoded["created_at"],
+            }
+        )
+    return events, cursor
+
+
+outbox_publisher = OutboxPublisher(settings.OUTBOX_POLL_SECONDS, settings.OUTBOX_BATCH_SIZE)
@@ -0,0 +1,261 @@
+"""요청 단위 프로파일링.
+
+샘플링(비율, 헤더, 지연 시간 임계값)된 요청에 대해 DB, bcrypt, 직렬화에 쓴
+시간과 SQL 문 개수를 기록하고 Request ID를 키로 보관한다.
+"""
+import cProfile
+import json
+import logging
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.database import add_query_timer
+from app.core.middleware import get_request_id
+
+logger = logging.getLogger(__name__)
+
+# 구간 이름 (speedscope 프레임 이름으로도 사용)
+SPAN_DB = "db"
+SPAN_BCRYPT = "bcrypt"
+SPAN_SERIALIZATION = "serialization"
+
+
+@dataclass
+class RequestProfile:
+    """한 요청의 시간 분해 결과."""
+
+    request_id: str
+    method: str
+    path: str
+    started_at: float = field(default_factory=time.time)
+    start: float = field(default_factory=time.perf_counter)
+    duration_ms: float = 0.0
+    status_code: int = 0
+    sql_count: int = 0
+    totals_ms: dict[str, float] = field(default_factory=dict)
+    spans: list[tuple[str, float, float]] = field(default_factory=list)
+    forced: bool = False
+
+    def add_span(self, name: str, start: float, end: float) -> None:
+        """구간 시간을 누적하고 타임라인에 기록."""
+        self.totals_ms[name] = self.totals_ms.get(name, 0.0) + (end - start) * 1000
+        self.spans.append((name, start - self.start, end - self.start))
+
+    def summary(self) -> dict[str, Any]:
+        """목록 조회용 요약."""
+        accounted = sum(self.totals_ms.values())
+        return {
+            "request_id": self.request_id,
+            "method": self.method,
+            "path": self.path,
+            "status_code": self.status_code,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration_ms, 3),
+            "sql_count": self.sql_count,
+            "db_ms": round(self.totals_ms.get(SPAN_DB, 0.0), 3),
+            "bcrypt_ms": round(self.totals_ms.get(SPAN_BCRYPT, 0.0), 3),
+            "serialization_ms": round(self.totals_ms.get(SPAN_SERIALIZATION, 0.0), 3),
+            "other_ms": round(max(self.duration_ms - accounted, 0.0), 3),
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        """상세 조회용 전체 데이터."""
+        data = self.summary()
+        data["spans"] = [
+            {"name": name, "start_ms": start * 1000, "end_ms": end * 1000}
+            for name, start, end in self.spans
+        ]
+        return data
+
+    def to_speedscope(self) -> dict[str, Any]:
+        """speedscope(evented) 포맷으로 변환."""
+        frame_names = ["request", SPAN_DB, SPAN_BCRYPT, SPAN_SERIALIZATION]
+        frame_index = {name: index for index, name in enumerate(frame_names)}
+        end_of_request = self.duration_ms
+
+        events: list[dict[str, Any]] = [{"type": "O", "frame": 0, "at": 0.0}]
+        for name, start, end in sorted(self.spans, key=lambda span: span[1]):
+            frame = frame_index.get(name)
+            if frame is None:
+                continue
+            events.append({"type": "O", "frame": frame, "at": start * 1000})
+            events.append({"type": "C", "frame": frame, "at": end * 1000})
+        events.append({"type": "C", "frame": 0, "at": end_of_request})
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": [{"name": name} for name in frame_names]},
+            "profiles": [
+                {
+                    "type": "evented",
+                    "name": f"{self.method} {self.path} ({self.request_id})",
+                    "unit": "milliseconds",
+                    "startValue": 0.0,
+                    "endValue": end_of_request,
+                    "events": events,
+                }
+            ],
+            "name": self.request_id,
+            "exporter": settings.PROJECT_NAME,
+        }
+
+
+# 현재 요청의 프로파일 (프로파일링 대상이 아니면 None)
+profile_var: ContextVar[RequestProfile | None] = ContextVar(
+    "request_profile", default=None
+)
+
+
+class ProfileStore:
+    """최근 프로파일 리포트를 Request ID 기준으로 보관하는 저장소."""
+
+    def __init__(self, max_reports: int):
+        self.max_reports = max_reports
+        self._reports: OrderedDict[str, RequestProfile] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._reports[profile.request_id] = profile
+            self._reports.move_to_end(profile.request_id)
+            while len(self._reports) > self.max_reports:
+                self._reports.popitem(last=False)
+
+    def get(self, request_id: str) -> RequestProfile | None:
+        with self._lock:
+            return self._reports.get(request_id)
+
+    def list(self) -> list[RequestProfile]:
+        with self._lock:
+            return list(reversed(self._reports.values()))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reports.clear()
+
+
+profile_store = ProfileStore(settings.PROFILING_MAX_REPORTS)
+
+# cProfile은 프로세스 전체에서 하나만 활성화할 수 있음
+_cprofile_lock = threading.Lock()
+
+
+@contextmanager
+def track(span_name: str):
+    """현재 요청이 프로파일링 중이면 블록 실행 시간을 기록."""
+    profile = profile_var.get()
+    if profile is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_span(span_name, start, time.perf_counter())
+
+
+class ProfiledJSONResponse(JSONResponse):
+    """JSON 렌더링 시간을 직렬화 구간으로 기록하는 응답 클래스."""
+
+    def render(self, content: Any) -> bytes:
+        with track(SPAN_SERIALIZATION):
+            return super().render(content)
+
+
+def _record_query(conn, cursor, statement, parameters, executemany, start, end):
+    """SQL 실행 시간과 문장 수를 현재 요청 프로파일에 누적."""
+    profile = profile_var.get()
+    if profile is None:
+        return
+    profile.add_span(SPAN_DB, start, end)
+    profile.sql_count += 1
+
+
+add_query_timer(_record_query)
+
+
+def _dump_report(profile: RequestProfile, profiler: cProfile.Profile | None) -> None:
+    """리포트를 speedscope/pstats 파일로 저장."""
+    dump_dir = Path(settings.PROFILING_DUMP_DIR)
+    dump_dir.mkdir(parents=True, exist_ok=True)
+    # 클라이언트가 보낸 Request ID를 파일명으로 쓰므로 안전한 문자만 남김
+    file_stem = re.sub(r"[^A-Za-z0-9_.-]", "_", profile.request_id)
+    speedscope_path = dump_dir / f"{file_stem}.speedscope.json"
+    speedscope_path.write_text(json.dumps(profile.to_speedscope()), encoding="utf-8")
+    if profiler is not None:
+        profiler.dump_stats(str(dump_dir / f"{file_stem}.pstats"))
+
+
+class ProfilingMiddleware:
+    """샘플링된 요청의 시간 분해를 기록하는 ASGI 미들웨어.
+
+    RequestIDMiddleware 안쪽에 배치해야 Request ID를 키로 사용할 수 있다.
+    비율/헤더로 선택되지 않은 요청도 가볍게 측정하다가 지연 시간 임계값을
+    넘기면 기록한다. 헤더로 강제된 요청은 cProfile도 함께 수행한다.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.header = settings.PROFILING_HEADER.lower().encode("latin-1")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        forced = any(
+            name == self.header and value not in (b"", b"0", b"false")
+            for name, value in scope["headers"]
+        )
+        sampled = forced or random.random() < settings.PROFILING_SAMPLE_RATE
+        profile = RequestProfile(
+            request_id=get_request_id() or "unknown",
+            method=scope["method"],
+            path=scope["path"],
+            forced=forced,
+        )
+        token = profile_var.set(profile)
+
+        profiler = None
+        if forced and _cprofile_lock.acquire(blocking=False):
+            profiler = cProfile.Profile()
+            profiler.enable()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                profile.status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                _cprofile_lock.release()
+            profile_var.reset(token)
+            profile.duration_ms = (time.perf_counter() - profile.start) * 1000
+
+            if sampled or profile.duration_ms >= settings.PROFILING_SLOW_THRESHOLD_MS:
+                profile_store.add(profile)
+                logger.info(f"요청 프로파일 기록 - {profile.summary()}")
+                if settings.PROFILING_DUMP_DIR:
+                    # 파일 쓰기가 이벤트 루프를 막지 않도록 스레드 풀에서 저장
+                    # (응답은 이미 전송되었으므로 클라이언트 지연에는 영향 없음)
+                    try:
+                        await run_in_threadpool(_dump_report, profile, profiler)
+                    except OSError as e:
+                        logger.error(f"프로파일 리포트 저장 실패 - Error: {str(e)}")
@@ -0,0 +1,156 @@
+"""쿼리 계측.
+
+DATABASE_ECHO 대신 엔진 이벤트 훅으로 요청별 SQL 문 개수를 세고,
+같은 형태의 쿼리 반복(N+1)과 느린 쿼리를 탐지한다.
+"""
+import logging
+import re
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.database import add_query_timer
+from app.core.middleware import get_request_id
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+_EXPLAIN_SAVEPOINT = "query_explain"  # 느린 쿼리 EXPLAIN을 감싸는 세이브포인트
+
+_WHITESPACE_RE = re.compile(r"\s+")
+# IN (?, ?, ?) / IN (%(p1)s, %(p2)s) 처럼 길이가 달라지는 목록을 하나로 묶음
+_PLACEHOLDER_LIST_RE = re.compile(r"\((?:\s*(?:\?|%\(\w+\)s|%s|:\w+)\s*,)+\s*(?:\?|%\(\w+\)s|%s|:\w+)\s*\)")
+
+
+@dataclass
+class QueryStats:
+    """한 요청에서 실행된 쿼리 통계."""
+
+    request_id: str
+    count: int = 0
+    shapes: Counter = field(default_factory=Counter)
+
+    def repeated_shapes(self, threshold: int) -> list[tuple[str, int]]:
+        """임계값 이상 반복된 쿼리 형태 목록."""
+        return [
+            (shape, count)
+            for shape, count in self.shapes.most_common()
+            if count >= threshold
+        ]
+
+
+# 현재 요청의 쿼리 통계 (요청 밖에서 실행된 쿼리는 None)
+query_stats_var: ContextVar[QueryStats | None] = ContextVar(
+    "query_stats", default=None
+)
+
+
+def statement_shape(statement: str) -> str:
+    """SQL 문을 비교 가능한 형태로 정규화."""
+    shape = _WHITESPACE_RE.sub(" ", statement).strip()
+    return _PLACEHOLDER_LIST_RE.sub("(...)", shape)
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> Any:
+    """바인딩 파라미터 값을 숨기고 타입 구조만 남김."""
+    if executemany and parameters:
+        return f"{len(parameters)} x {parameter_shape(parameters[0])}"
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _explain(cursor, statement: str, parameters: Any) -> str | None:
+    """같은 DBAPI 연결에서 실행 계획을 조회 (PostgreSQL SELECT만 지원).
+
+    요청의 트랜잭션 안에서 실행되므로 SAVEPOINT로 감싼다. EXPLAIN이 실패해도
+    (잠금 대기 시간 초과 등) 세이브포인트까지만 되돌려 트랜잭션이 중단(aborted)
+    상태로 남지 않는다. 엔진을 거치지 않으므로 쿼리 수에는 포함되지 않는다.
+    """
+    explain_cursor = cursor.connection.cursor()
+    try:
+        explain_cursor.execute(f"SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+        try:
+            explain_cursor.execute(f"EXPLAIN {statement}", parameters)
+            plan = "\n".join(row[0] for row in explain_cursor.fetchall())
+        except Exception:
+            explain_cursor.execute(f"ROLLBACK TO SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+            raise
+        explain_cursor.execute(f"RELEASE SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+        return plan
+    finally:
+        explain_cursor.close()
+
+
+def _record_query(conn, cursor, statement, parameters, executemany, start, end):
+    """요청별 쿼리 수를 세고 느린 쿼리를 로깅."""
+    elapsed_ms = (end - start) * 1000
+
+    stats = query_stats_var.get()
+    if stats is not None:
+        stats.count += 1
+        stats.shapes[statement_shape(statement)] += 1
+
+    if elapsed_ms < settings.QUERY_SLOW_THRESHOLD_MS:
+        return
+
+    logger.warning(
+        f"느린 쿼리 - {elapsed_ms:.1f}ms, SQL: {statement_shape(statement)}, "
+        f"Params: {parameter_shape(parameters, executemany)}"
+    )
+    if (
+        settings.QUERY_EXPLAIN_SLOW
+        and conn.dialect.name == "postgresql"
+        and not executemany
+        and statement.lstrip().upper().startswith("SELECT")
+    ):
+        try:
+            plan = _explain(cursor, statement, parameters)
+            logger.warning(f"느린 쿼리 실행 계획:\n{plan}")
+        except Exception as e:
+            logger.warning(f"실행 계획 조회 실패 - Error: {str(e)}")
+
+
+add_query_timer(_record_query)
+
+
+class QueryStatsMiddleware:
+    """요청별 쿼리 통계를 수집하는 ASGI 미들웨어.
+
+    RequestIDMiddleware 안쪽에 배치한다. 같은 형태의 쿼리가
+    QUERY_REPEAT_THRESHOLD 이상 반복되면 N+1 의심 경고를 남기고,
+    DEBUG 모드에서는 응답 헤더에 쿼리 수를 추가한다.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(request_id=get_request_id() or "unknown")
+        token = query_stats_var.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and settings.DEBUG:
+                headers = MutableHeaders(scope=message)
+                headers[QUERY_COUNT_HEADER] = str(stats.count)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            query_stats_var.reset(token)
+            for shape, count in stats.repeated_shapes(settings.QUERY_REPEAT_THRESHOLD):
+                logger.warning(
+                    f"N+1 의심 쿼리 - {count}회 반복, Path: {scope['path']}, SQL: {shape}"
+                )
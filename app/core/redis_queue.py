@@ -1,12 +1,28 @@
 import redis
+import redis.asyncio
 from rq import Queue
 
 from app.core.config import settings
+from app.core.resources import budget
 
 
 def get_redis_connection():
-    """Redis 연결 생성."""
-    return redis.from_url(settings.REDIS_URL)
+    """Redis 연결 생성.
+
+    풀 크기를 넘으면 예외 대신 빈 연결이 생길 때까지 대기한다.
+    """
+    pool = redis.BlockingConnectionPool.from_url(
+        settings.REDIS_URL, max_connections=budget.redis_max_connections
+    )
+    return redis.Redis(connection_pool=pool)
+
+
+def get_async_redis_connection():
+    """비동기 Redis 연결 생성 (이벤트 루프 안에서 사용하는 미들웨어/라우트용)."""
+    pool = redis.asyncio.BlockingConnectionPool.from_url(
+        settings.REDIS_URL, max_connections=budget.redis_max_connections
+    )
+    return redis.asyncio.Redis(connection_pool=pool)
 
 
 # Redis 연결
@@ -0,0 +1,97 @@
+"""프로세스별 리소스 예산.
+
+DB/Redis 연결 수와 bcrypt 스레드 수는 프로세스마다 적용되므로 워커 수만큼
+곱해진다. 전체 예산과 워커 수로부터 프로세스별 크기를 계산한다.
+"""
+import logging
+import os
+from dataclasses import asdict, dataclass
+
+from app.core.config import SERVER_WORKERS_ENV, Settings, settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ResourceBudget:
+    """프로세스 하나가 사용할 리소스 크기."""
+
+    workers: int
+    db_pool_size: int
+    db_max_overflow: int
+    redis_max_connections: int
+    hash_workers: int
+
+    @property
+    def db_max_connections(self) -> int:
+        return self.db_pool_size + self.db_max_overflow
+
+    def as_dict(self) -> dict:
+        data = asdict(self)
+        data["db_max_connections"] = self.db_max_connections
+        data["total_db_connections"] = self.db_max_connections * self.workers
+        data["total_redis_connections"] = self.redis_max_connections * self.workers
+        return data
+
+
+def resolve_workers(config: Settings = settings) -> int:
+    """이 프로세스와 함께 실행되는 워커 수 (리소스 예산을 나눌 수).
+
+    WEB_CONCURRENCY가 있으면 그 값, app.server로 실행했으면 app.server가 정한 값,
+    그 외(uvicorn app.main:app처럼 단독 실행)에는 1이다.
+    """
+    if config.WEB_CONCURRENCY > 0:
+        return config.WEB_CONCURRENCY
+    server_workers = os.environ.get(SERVER_WORKERS_ENV)
+    if server_workers:
+        return max(int(server_workers), 1)
+    return 1
+
+
+def _per_process_share(total_budget: int, workers: int, name: str) -> int:
+    """전체 예산의 프로세스 몫 (프로세스마다 최소 1개가 필요하므로 예산보다 워커가 많으면 경고)."""
+    if total_budget < workers:
+        logger.warning(
+            f"{name}({total_budget})가 워커 수({workers})보다 작아 프로세스마다 1개씩 "
+            f"사용합니다 - 실제 합계 {workers}개가 예산을 넘으므로 WEB_CONCURRENCY를 "
+            f"줄이거나 예산을 늘리세요"
+        )
+    return max(total_budget // workers, 1)
+
+
+def compute_budget(config: Settings = settings) -> ResourceBudget:
+    """전체 예산을 워커 수로 나눠 프로세스별 리소스 크기를 계산."""
+    workers = resolve_workers(config)
+
+    pool_size = config.DATABASE_POOL_SIZE
+    max_overflow = config.DATABASE_MAX_OVERFLOW
+    if config.DATABASE_CONNECTION_BUDGET > 0:
+        # 설정된 pool_size : max_overflow 비율을 유지하며 프로세스 몫을 나눔
+        per_process = _per_process_share(
+            config.DATABASE_CONNECTION_BUDGET, workers, "DATABASE_CONNECTION_BUDGET"
+        )
+        configured_total = max(pool_size + max_overflow, 1)
+        pool_size = max(per_process * pool_size // configured_total, 1)
+        max_overflow = max(per_process - pool_size, 0)
+
+    redis_max_connections = config.REDIS_MAX_CONNECTIONS
+    if config.REDIS_CONNECTION_BUDGET > 0:
+        redis_max_connections = _per_process_share(
+            config.REDIS_CONNECTION_BUDGET, workers, "REDIS_CONNECTION_BUDGET"
+        )
+
+    hash_workers = config.PASSWORD_HASH_WORKERS
+    if hash_workers <= 0:
+        hash_workers = max((os.cpu_count() or 1) // workers, 1)
+
+    return ResourceBudget(
+        workers=workers,
+        db_pool_size=pool_size,
+        db_max_overflow=max_overflow,
+        redis_max_connections=redis_max_connections,
+        hash_workers=hash_workers,
+    )
+
+
+# 현재 프로세스의 리소스 예산
+budget = compute_budget()
@@ -1,21 +1,32 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from sqlmodel import Session, select
 
-from app.api.users.models import User
+from app.api.users.queries import UserRow, user_row_by_email
+from app.core.admission import ensure_deadline, remaining_time
 from app.core.config import settings
-from app.core.database import get_session
+from app.core.database import LazySession, get_session
+from app.core.exceptions import ServiceOverloadedError
+from app.core.hashing import password_hasher
+from app.core.profiling import SPAN_BCRYPT, track
+from app.core.resources import budget
 
 # HTTP Bearer 스킴
 security = HTTPBearer()
 
-# Passlib CryptContext 설정 (bcrypt 사용)
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Passlib CryptContext (시작 시 호스트 측정 결과로 방식과 비용이 정해짐, app.core.hashing)
+pwd_context = password_hasher.context
+
+# 패스워드 해싱 전용 스레드 풀 (프로세스별 동시 bcrypt 연산 수 제한)
+hash_executor = ThreadPoolExecutor(
+    max_workers=budget.hash_workers, thread_name_prefix="password-hash"
+)
 
 
 class TokenData:
@@ -25,14 +36,68 @@ class TokenData:
         self.email = email
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+class InFlightCounter:
+    """해싱 스레드 풀에 제출되어 아직 끝나지 않은 작업 수 (실행 중 + 대기 중)."""
+
+    def __init__(self):
+        self._count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def track(self, future: Future) -> None:
+        """작업이 끝나거나 취소될 때까지 개수에 포함 (완료 콜백은 해싱 스레드에서 실행)."""
+        with self._lock:
+            self._count += 1
+        future.add_done_callback(self._done)
+
+    def _done(self, future: Future) -> None:
+        with self._lock:
+            self._count -= 1
+
+
+hash_in_flight = InFlightCounter()
+
+
+def hash_queue_size() -> int:
+    """해싱 스레드 풀에 제출되어 아직 끝나지 않은 작업 수."""
+    return hash_in_flight.count
+
+
+async def _run_hash(func, *args):
+    """요청 마감 시간 안에서 해싱 스레드 풀로 실행 (이벤트 루프는 기다리는 동안 다른 요청 처리)."""
+    ensure_deadline("hash")
+    future = hash_executor.submit(func, *args)
+    hash_in_flight.track(future)
+    try:
+        with track(SPAN_BCRYPT):
+            # 시간 초과 시 아직 시작하지 않은 작업은 취소되어 스레드를 쓰지 않음
+            return await asyncio.wait_for(asyncio.wrap_future(future), remaining_time())
+    except TimeoutError as e:
+        raise ServiceOverloadedError(
+            "hash_deadline_exceeded", settings.ADMISSION_RETRY_AFTER_SECONDS
+        ) from e
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """평문 패스워드와 해시된 패스워드 비교."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return await _run_hash(pwd_context.verify, plain_password, hashed_password)
+
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """패스워드를 검증하고, 해시가 현재 정책보다 약하면 새 정책의 해시도 반환."""
+    return await _run_hash(
+        password_hasher.verify_and_update, plain_password, hashed_password
+    )
 
 
-def get_password_hash(password: str) -> str:
+async def get_password_hash(password: str) -> str:
     """패스워드를 해시합니다."""
-    return pwd_context.hash(password)
+    return await _run_hash(pwd_context.hash, password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -55,9 +120,9 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    session: Session = Depends(get_session),
-) -> User:
-    """Bearer 토큰으로부터 현재 사용자를 가져옵니다."""
+    session: LazySession = Depends(get_session),
+) -> UserRow:
+    """Bearer 토큰으로부터 현재 사용자를 가져옵니다 (읽기 전용 행)."""
     token = credentials.credentials
     credential_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -76,9 +141,21 @@ def get_current_user(
     except JWTError:
         raise credential_exception
 
-    user = session.exec(select(User).where(User.email == token_data.email)).first()
+    user = user_row_by_email(session, token_data.email)
+    # 인증 조회가 끝나면 연결을 반환 (같은 요청의 다음 쿼리는 다시 체크아웃)
+    session.release()
 
     if user is None:
         raise credential_exception
 
     return user
+
+
+def get_current_admin(current_user: UserRow = Depends(get_current_user)) -> UserRow:
+    """현재 사용자가 관리자(ADMIN_USER_IDS)인지 확인합니다."""
+    if current_user.id not in settings.ADMIN_USER_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="관리자 권한이 필요합니다",
+        )
+    return current_user
@@ -0,0 +1,245 @@
+"""사용자 테이블 수평 샤딩.
+
+DATABASE_SHARD_URLS를 설정하면 users와 outbox_events 행을 여러 DB에 나눠 담는다.
+사용자 ID는 일관된 해시 링으로 샤드에 대응되고, 이메일로 찾는 조회(로그인,
+토큰 인증)는 DATABASE_URL의 user_directory 테이블에서 샤드를 찾는다.
+user_directory는 전역 사용자 ID 발급과 이메일 유일성 보장도 맡는다.
+
+요청 세션(ShardedLazySession)은 SQLAlchemy 수평 샤딩 확장으로 쿼리 조건의
+User.id/User.email을 보고 해당 샤드에만 보내고, 조건이 없는 조회는 모든 샤드에
+보낸 뒤 결과를 합친다. 아웃박스 이벤트는 사용자와 같은 샤드·같은 트랜잭션에 쓴다.
+
+디렉터리와 샤드는 서로 다른 DB라 한 트랜잭션으로 묶이지 않는다. 가입과 이메일
+변경은 디렉터리를 먼저 쓰고(ID 발급, 이메일 선점) 샤드 커밋이 실패하면 되돌리며,
+삭제는 샤드 행을 지운 뒤 디렉터리 항목을 지운다. 그 사이에 프로세스가 죽어 남은
+불일치는 repair_user_directory(app.api.users.jobs)가 샤드 행을 기준으로 정리한다.
+"""
+import bisect
+import hashlib
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import Engine, Index, delete, update
+from sqlalchemy.ext.horizontal_shard import ShardedSession
+from sqlalchemy.orm import ORMExecuteState
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter, BooleanClauseList
+from sqlmodel import Field, Session, SQLModel, select
+
+from app.core.config import settings
+from app.core.database import LazySession, engine, shard_engines
+
+# 전역 이벤트 ID = 샤드 내 ID * MAX_SHARDS + 샤드 번호 (샤드 수 상한)
+MAX_SHARDS = 1024
+
+
+class UserDirectory(SQLModel, table=True):
+    """이메일 → 샤드 디렉터리 (DATABASE_URL에 저장, id가 전역 사용자 ID)."""
+
+    __tablename__ = "user_directory"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    email: str = Field(max_length=255, description="사용자 이메일 주소")
+    shard_id: str = Field(max_length=50, description="사용자 행이 있는 샤드")
+    created_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        description="생성 시간",
+    )
+
+    __table_args__ = (
+        # 모든 샤드에 걸친 이메일 유일성 보장
+        Index("idx_user_directory_email", "email", unique=True),
+    )
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """일관된 해시 링.
+
+    샤드마다 가상 노드 여러 개를 링에 올려 키를 고르게 나누고, 샤드를 추가해도
+    약 1/N의 키만 새 샤드로 옮겨지게 한다.
+    """
+
+    def __init__(self, nodes: Iterable[str], vnodes: int):
+        points = sorted(
+            (_hash(f"{node}#{replica}"), node) for node in nodes for replica in range(vnodes)
+        )
+        self._hashes = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def get(self, key: Any) -> str:
+        """키를 담당하는 노드 (링에서 키의 해시 다음에 오는 첫 노드)."""
+        index = bisect.bisect(self._hashes, _hash(str(key))) % len(self._hashes)
+        return self._nodes[index]
+
+
+ring = HashRing(shard_engines, settings.DATABASE_SHARD_VNODES)
+
+
+def shard_for_user(user_id: int) -> str:
+    """사용자 ID의 샤드 ID."""
+    return ring.get(user_id)
+
+
+def engine_for_user(user_id: int) -> Engine:
+    """사용자 행이 있는 엔진 (샤딩하지 않으면 전역 엔진)."""
+    return shard_engines[shard_for_user(user_id)] if shard_engines else engine
+
+
+def shard_index(shard_id: str) -> int:
+    return int(shard_id.removeprefix("shard_"))
+
+
+def global_event_id(local_id: int, shard_id: str | None) -> int:
+    """샤드 내 아웃박스 ID를 모든 샤드에서 유일한 이벤트 ID로 변환."""
+    if shard_id is None:
+        return local_id
+    return local_id * MAX_SHARDS + shard_index(shard_id)
+
+
+def split_event_id(event_id: int) -> tuple[str | None, int]:
+    """전역 이벤트 ID를 (샤드 ID, 샤드 내 아웃박스 ID)로 분리 (global_event_id의 역)."""
+    if not shard_engines:
+        return None, event_id
+    return f"shard_{event_id % MAX_SHARDS}", event_id // MAX_SHARDS
+
+
+def local_event_cursor(event_id: int, shard_id: str | None) -> int:
+    """전역 이벤트 ID 이후의 이벤트를 찾을 샤드 내 ID 기준 (이 값보다 큰 ID)."""
+    if shard_id is None:
+        return event_id
+    return (event_id - shard_index(shard_id)) // MAX_SHARDS
+
+
+# --- 이메일 디렉터리 ---
+
+
+def allocate_user(email: str) -> tuple[int, str]:
+    """이메일을 디렉터리에 등록하고 (새 사용자 ID, 샤드 ID)를 반환.
+
+    이메일이 이미 등록되어 있으면 IntegrityError가 발생한다.
+    """
+    with Session(engine) as session:
+        entry = UserDirectory(email=email, shard_id="")
+        session.add(entry)
+        session.flush()  # 전역 사용자 ID 할당
+        entry.shard_id = shard_for_user(entry.id)
+        session.commit()
+        return entry.id, entry.shard_id
+
+
+def lookup_email(email: str) -> str | None:
+    """이메일의 샤드 ID (등록되지 않았으면 None)."""
+    with Session(engine) as session:
+        return session.exec(
+            select(UserDirectory.shard_id).where(UserDirectory.email == email)
+        ).first()
+
+
+def rename_email(user_id: int, email: str) -> None:
+    """디렉터리의 이메일 변경 (이미 사용 중인 이메일이면 IntegrityError)."""
+    with Session(engine) as session:
+        session.execute(
+            update(UserDirectory).where(UserDirectory.id == user_id).values(email=email)
+        )
+        session.commit()
+
+
+def release_user(user_id: int) -> None:
+    """디렉터리에서 사용자를 제거 (삭제 또는 생성 실패 시)."""
+    with Session(engine) as session:
+        session.execute(delete(UserDirectory).where(UserDirectory.id == user_id))
+        session.commit()
+
+
+def release_users(user_ids: list[int]) -> None:
+    """디렉터리에서 여러 사용자를 한 번에 제거 (일괄 삭제 시)."""
+    with Session(engine) as session:
+        session.execute(delete(UserDirectory).where(UserDirectory.id.in_(user_ids)))
+        session.commit()
+
+
+# --- 세션 라우팅 ---
+
+
+def _criteria_values(context: ORMExecuteState, column: Any) -> list[Any]:
+    """WHERE 절의 최상위 AND 조건에서 column = 값 / column IN (값...)의 값들."""
+    whereclause = getattr(context.statement, "whereclause", None)
+    if whereclause is None:
+        return []
+    if isinstance(whereclause, BooleanClauseList) and whereclause.operator is operators.and_:
+        conditions = whereclause.clauses
+    else:
+        conditions = [whereclause]
+
+    parameters = context.parameters or {}
+    values: list[Any] = []
+    for condition in conditions:
+        if not isinstance(condition, BinaryExpression):
+            continue
+        left, right = condition.left, condition.right
+        if not isinstance(right, BindParameter):
+            continue
+        if getattr(left, "table", None) is not column.table or left.name != column.name:
+            continue
+        # session.get()은 값 없는 바인드 파라미터에 실행 파라미터로 값을 넘김
+        value = parameters.get(right.key, right.effective_value)
+        if condition.operator is operators.eq:
+            values.append(value)
+        elif condition.operator is operators.in_op:
+            values.extend(value or [])
+    return values
+
+
+def _shard_chooser(mapper, instance, clause=None) -> str:
+    """flush할 객체의 샤드 (사용자와 그 이벤트는 사용자 ID로 결정)."""
+    if mapper is not None and instance is not None:
+        table = mapper.local_table.name
+        if table == "users":
+            return shard_for_user(instance.id)
+        if table == "outbox_events":
+            return shard_for_user(instance.aggregate_id)
+    raise RuntimeError(
+        "샤드를 결정할 수 없음 - bind_arguments={'shard_id': ...}로 샤드를 지정하세요"
+    )
+
+
+def _identity_chooser(mapper, primary_key, **kw) -> list[str]:
+    """기본 키 조회(session.get)를 보낼 샤드."""
+    if mapper.local_table.name == "users":
+        return [shard_for_user(primary_key[0])]
+    return list(shard_engines)
+
+
+def _execute_chooser(context: ORMExecuteState) -> list[str]:
+    """쿼리를 보낼 샤드 (User.id/User.email 조건이 없으면 모든 샤드)."""
+    mapper = context.bind_mapper
+    if mapper is not None and mapper.local_table.name == "users":
+        columns = mapper.local_table.c
+        user_ids = _criteria_values(context, columns.id)
+        if user_ids:
+            return sorted({shard_for_user(user_id) for user_id in user_ids})
+        emails = _criteria_values(context, columns.email)
+        if emails:
+            shards = {lookup_email(email) for email in emails} - {None}
+            # 등록되지 않은 이메일은 어느 샤드에도 없으므로 한 샤드만 조회 (빈 결과)
+            return sorted(shards) or [next(iter(shard_engines))]
+    return list(shard_engines)
+
+
+class ShardedLazySession(ShardedSession, LazySession):
+    """쿼리를 사용자 샤드로 라우팅하는 요청 세션 (LazySession과 같은 연결 사용 방식)."""
+
+    @classmethod
+    def create(cls) -> "ShardedLazySession":
+        return cls(
+            shards=shard_engines,
+            shard_chooser=_shard_chooser,
+            identity_chooser=_identity_chooser,
+            execute_chooser=_execute_chooser,
+            expire_on_commit=False,
+        )
@@ -0,0 +1,163 @@
+"""시작 시 워밍업.
+
+배포 직후 첫 요청들이 DB/Redis 연결 수립, 응답 스키마 생성, OpenAPI 생성,
+bcrypt 백엔드 로딩 비용을 떠안지 않도록 트래픽을 받기 전에 미리 수행한다.
+워밍업은 백그라운드 스레드에서 돌고, 모든 단계가 성공하기 전에는 준비 상태
+(readiness)를 보고하지 않는다. 실패한 단계는 성공할 때까지 다시 시도한다.
+"""
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from fastapi import FastAPI
+from passlib.context import CryptContext
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import all_engines
+from app.core.resources import budget
+
+logger = logging.getLogger(__name__)
+
+# 백엔드 로딩용 최저 비용 bcrypt (실제 해싱 정책과 무관)
+_warmup_context = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=4)
+
+
+class WarmupState:
+    """워밍업 진행 상태와 단계별 소요 시간."""
+
+    def __init__(self):
+        self.ready = False
+        self.steps_ms: dict[str, float] = {}
+        self.errors: dict[str, str] = {}
+
+    def as_dict(self) -> dict:
+        return {
+            "ready": self.ready,
+            "steps_ms": self.steps_ms,
+            "errors": self.errors,
+        }
+
+
+warmup_state = WarmupState()
+
+
+def _warm_db_pool() -> None:
+    """엔진(샤딩 시 샤드 포함)마다 풀 크기만큼 연결을 동시에 열어 풀에 채워 둠."""
+    size = budget.db_pool_size
+    for target in all_engines():
+        # 모든 연결을 동시에 잡고 있어야 서로 다른 연결이 열림
+        connections = []
+        try:
+            with ThreadPoolExecutor(max_workers=size) as executor:
+                futures = [executor.submit(target.connect) for _ in range(size)]
+                error: Exception | None = None
+                # 하나가 실패해도 이미 열린 연결은 모두 모아 아래에서 반납
+                for future in futures:
+                    try:
+                        connections.append(future.result())
+                    except Exception as e:
+                        error = error or e
+            if error is not None:
+                raise error
+            for conn in connections:
+                conn.execute(text("SELECT 1"))
+        finally:
+            for conn in connections:
+                conn.close()
+
+
+def _warm_redis() -> None:
+    from app.core.redis_queue import redis_conn
+
+    redis_conn.ping()
+
+
+def _warm_serializers() -> None:
+    """주요 스키마의 검증/직렬화 경로를 한 번씩 실행."""
+    from app.api.auth.schemas import Token, UserLogin
+    from app.api.users.schemas import UserCreate, UserResponse, UserUpdate
+
+    now = datetime.utcnow()
+    UserCreate(email="warmup@example.com", password="warmup-password", name="warmup")
+    UserUpdate(name="warmup")
+    UserLogin(email="warmup@example.com", password="warmup-password")
+    Token(access_token="warmup", token_type="bearer")
+    UserResponse(
+        id=0, email="warmup@example.com", name="warmup", created_at=now, updated_at=now
+    ).model_dump_json()
+
+
+def _warm_password_hashing() -> None:
+    """bcrypt 백엔드를 로딩하고 해싱 스레드를 모두 띄워 둠."""
+    from app.core.security import hash_executor
+
+    # 가장 낮은 비용으로 해싱해 백엔드만 로딩 (실제 비용은 스레드 생성 정도)
+    # argon2 백엔드는 시작 시 해싱 정책 측정에서 이미 로딩됨
+    futures = [
+        hash_executor.submit(_warmup_context.hash, "warmup")
+        for _ in range(budget.hash_workers)
+    ]
+    for future in futures:
+        future.result()
+
+
+class WarmupRunner:
+    """워밍업 단계를 백그라운드 스레드에서 실행하고 준비 상태를 관리."""
+
+    def __init__(self, retry_interval: float):
+        self.retry_interval = retry_interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _run_steps(self, steps: list[tuple[str, Callable[[], object]]]) -> None:
+        for name, step in steps:
+            start = time.perf_counter()
+            try:
+                step()
+            except Exception as e:
+                warmup_state.errors[name] = str(e)
+                logger.error(f"워밍업 실패 - Step: {name}, Error: {str(e)}")
+            else:
+                warmup_state.errors.pop(name, None)
+            warmup_state.steps_ms[name] = round((time.perf_counter() - start) * 1000, 3)
+
+    def _run(self, app: FastAPI) -> None:
+        steps: list[tuple[str, Callable[[], object]]] = [
+            ("db_pool", _warm_db_pool),
+            ("redis", _warm_redis),
+            ("serializers", _warm_serializers),
+            ("openapi", app.openapi),
+            ("password_hashing", _warm_password_hashing),
+        ]
+        self._run_steps(steps)
+        # 실패한 단계가 남아 있으면 준비 상태로 전환하지 않고 그 단계만 다시 시도
+        while warmup_state.errors and not self._stop.wait(self.retry_interval):
+            self._run_steps([(name, step) for name, step in steps if name in warmup_state.errors])
+        if warmup_state.errors:
+            return
+        warmup_state.ready = True
+        logger.info(f"워밍업 완료 - {warmup_state.steps_ms}")
+
+    def start(self, app: FastAPI) -> None:
+        """워밍업 스레드 시작 (완료 전까지 /readyz는 503)."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(app,), name="warmup", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """워밍업 스레드 종료 (진행 중인 단계는 끝날 때까지 기다림)."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+warmup_runner = WarmupRunner(settings.WARMUP_RETRY_INTERVAL_SECONDS)
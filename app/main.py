@@ -1,15 +1,38 @@
 import logging
 
-from fastapi import FastAPI
+from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 
 from app.api.auth import router as auth_router
+from app.api.auth.activity import login_activity
+from app.api.diagnostics import router as diagnostics_router
 from app.api.users import router as users_router
+from app.core.admission import AdmissionControlMiddleware
+from app.core.change_feed import change_feed
 from app.core.config import settings
-from app.core.database import create_db_and_tables
-from app.core.exception_handlers import http_exception_handler
+from app.core.database import all_engines, create_db_and_tables
+from app.core.exception_handlers import (
+    http_exception_handler,
+    overload_exception_handler,
+    pool_timeout_exception_handler,
+)
+from app.core.exceptions import ServiceOverloadedError
+from app.core.hashing import password_hasher
+from app.core.health import health_monitor
+from app.core.idempotency import REPLAYED_HEADER, IdempotencyMiddleware
 from app.core.logging_config import setup_logging
-from app.core.middleware import RequestIDMiddleware, ResponseTimeMiddleware
+from app.core.middleware import (
+    CompressionMiddleware,
+    RequestIDMiddleware,
+    ResponseTimeMiddleware,
+)
+from app.core.outbox import outbox_publisher
+from app.core.profiling import ProfiledJSONResponse, ProfilingMiddleware
+from app.core.query_instrumentation import QUERY_COUNT_HEADER, QueryStatsMiddleware
+from app.core.resources import budget
+from app.core.warmup import warmup_runner, warmup_state
 
 # 로깅 설정
 setup_logging()
@@ -19,10 +42,13 @@ app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     description=settings.DESCRIPTION,
+    default_response_class=ProfiledJSONResponse,
 )
 
 # 예외 핸들러 추가
 app.add_exception_handler(Exception, http_exception_handler)
+app.add_exception_handler(ServiceOverloadedError, overload_exception_handler)
+app.add_exception_handler(PoolTimeoutError, pool_timeout_exception_handler)
 
 # CORS 미들웨어 추가
 app.add_middleware(
@@ -31,15 +57,39 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["X-Request-ID", "X-Process-Time"],
+    expose_headers=[
+        "X-Request-ID",
+        "X-Process-Time",
+        QUERY_COUNT_HEADER,
+        REPLAYED_HEADER,
+    ],
 )
 
+# 어드미션 컨트롤 미들웨어 추가 (Request ID 미들웨어 안쪽에서 동작해야 함)
+if settings.ADMISSION_ENABLED:
+    app.add_middleware(AdmissionControlMiddleware)
+
+# Idempotency-Key 미들웨어 추가 (재생 응답은 어드미션 컨트롤을 거치지 않음)
+if settings.IDEMPOTENCY_ENABLED:
+    app.add_middleware(IdempotencyMiddleware)
+
+# 쿼리 통계 미들웨어 추가 (Request ID 미들웨어 안쪽에서 동작해야 함)
+app.add_middleware(QueryStatsMiddleware)
+
+# 프로파일링 미들웨어 추가 (Request ID 미들웨어 안쪽에서 동작해야 함)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
 # Request ID 미들웨어 추가
 app.add_middleware(RequestIDMiddleware)
 
 # 응답 시간 측정 미들웨어 추가
 app.add_middleware(ResponseTimeMiddleware)
 
+# 응답 압축 미들웨어 추가 (가장 바깥에서 최종 응답을 압축)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
 
 # 애플리케이션 시작 시 데이터베이스 테이블 생성
 @app.on_event("startup")
@@ -48,16 +98,52 @@ def on_startup():
     logger.info("애플리케이션 시작 중...")
     # 모델을 import하여 SQLModel이 인식하도록 함
     from app.api.users.models import User  # noqa
+    from app.core.outbox import OutboxEvent  # noqa
+    from app.core.sharding import UserDirectory  # noqa
 
     create_db_and_tables()
     logger.info("데이터베이스 테이블 생성 완료")
     logger.info(f"CORS 설정: {settings.BACKEND_CORS_ORIGINS}")
+    logger.info(f"프로세스 리소스 예산: {budget.as_dict()}")
+    # 워밍업의 해싱 단계보다 먼저 호스트에 맞는 해싱 비용을 정함
+    # (app.server로 여러 워커를 띄우면 마스터가 이미 정해 두어 건너뜀)
+    password_hasher.configure()
+    if settings.WARMUP_ENABLED:
+        # 워밍업이 끝나고 모든 단계가 성공해야 /readyz가 준비 상태를 보고함
+        warmup_runner.start(app)
+    else:
+        warmup_state.ready = True
+    # 첫 프로브가 빈 결과를 보지 않도록 한 번 점검한 뒤 주기 점검 시작
+    health_monitor.run_checks()
+    health_monitor.start()
+    login_activity.start()
+    if settings.OUTBOX_PUBLISHER_ENABLED:
+        outbox_publisher.start()
     logger.info("애플리케이션 시작 완료")
 
 
+# 애플리케이션 종료 시 커넥션 정리
+@app.on_event("shutdown")
+def on_shutdown():
+    """애플리케이션 종료 시 실행."""
+    from app.core.redis_queue import redis_conn
+
+    logger.info("애플리케이션 종료 중...")
+    warmup_runner.stop()
+    health_monitor.stop()
+    login_activity.stop()
+    outbox_publisher.stop()
+    change_feed.stop()
+    for target in all_engines():
+        target.dispose()
+    redis_conn.close()
+    logger.info("데이터베이스 커넥션 풀 및 Redis 연결 정리 완료")
+
+
 # Include routers
 app.include_router(auth_router, prefix="/api/v1")
 app.include_router(users_router, prefix="/api/v1")
+app.include_router(diagnostics_router, prefix="/api/v1")
 
 
 @app.get("/")
@@ -72,10 +158,33 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    logger.info("Health check 엔드포인트 호출됨")
+    """하위 호환용 헬스 체크 (프로브는 /livez, /readyz 사용)."""
+    if settings.HEALTH_PROBE_LOGGING:
+        logger.info("Health check 엔드포인트 호출됨")
     return {"status": "healthy"}
 
 
+@app.get("/livez")
+async def liveness_check():
+    """프로세스와 이벤트 루프가 응답하는지만 확인합니다 (의존성 점검 없음)."""
+    return {"status": "alive"}
+
+
+@app.get("/readyz")
+async def readiness_check():
+    """워밍업 완료 여부와 캐시된 DB/Redis/작업 큐 점검 결과로 준비 상태를 보고합니다."""
+    checks_ready, health = health_monitor.snapshot()
+    ready = warmup_state.ready and checks_ready
+    content = {
+        "status": "ready" if ready else "not_ready",
+        "warmup": warmup_state.as_dict(),
+        **health,
+    }
+    if not ready:
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=content)
+    return content
+
+
 if __name__ == "__main__":
     import uvicorn
 
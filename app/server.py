@@ -0,0 +1,205 @@
+"""프로덕션 서버 실행 모듈.
+
+    python -m app.server
+
+마스터 프로세스에서 앱을 미리 import하고 소켓을 연 뒤 워커를 fork하므로
+import된 코드와 객체가 copy-on-write로 공유된다. uvloop/httptools가 설치되어
+있으면 사용하고, 없으면 asyncio/h11로 대체한다.
+"""
+import contextlib
+import gc
+import importlib.util
+import json
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+
+from app.core.config import SERVER_WORKERS_ENV, settings
+
+logger = logging.getLogger(__name__)
+
+# 비정상 종료한 워커의 재시작 대기 시간 (부팅 중 죽는 워커가 fork를 반복하지 않도록)
+RESTART_BACKOFF_INITIAL_SECONDS = 1.0
+RESTART_BACKOFF_MAX_SECONDS = 60.0
+# 이 시간 이상 실행된 뒤 죽은 워커는 일시적 장애로 보고 대기 없이 재시작
+WORKER_STABLE_UPTIME_SECONDS = 30.0
+
+
+def _event_loop() -> str:
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def _http_protocol() -> str:
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def build_config(app) -> uvicorn.Config:
+    """Settings 값으로 uvicorn 설정 생성."""
+    return uvicorn.Config(
+        app,
+        host=settings.HOST,
+        port=settings.PORT,
+        loop=_event_loop(),
+        http=_http_protocol(),
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE_TIMEOUT,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT,
+        access_log=settings.SERVER_ACCESS_LOG,
+        log_config=None,  # app.core.logging_config 설정 유지
+    )
+
+
+def _run_worker(config: uvicorn.Config, sock: socket.socket) -> None:
+    """fork된 워커 프로세스에서 서버 실행."""
+    # 터미널의 Ctrl+C는 마스터만 받고, 워커에는 마스터가 SIGTERM을 한 번 전달
+    os.setpgid(0, 0)
+    # 마스터의 시그널 핸들러를 되돌려 uvicorn이 직접 처리하도록 함
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+    # fork 이전에 열린 커넥션은 프로세스 간에 공유하면 안 되므로 버림
+    from app.core.database import all_engines
+
+    for engine in all_engines():
+        engine.dispose(close=False)
+
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class WorkerSupervisor:
+    """워커 프로세스를 fork하고 종료 시그널을 전달하는 마스터 프로세스."""
+
+    def __init__(self, config: uvicorn.Config, workers: int):
+        self.config = config
+        self.workers = workers
+        self.children: dict[int, float] = {}  # PID -> 시작 시각 (monotonic)
+        self.shutting_down = False
+        self.restart_delay = 0.0
+
+    def spawn(self, sock: socket.socket) -> None:
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0
+            try:
+                _run_worker(self.config, sock)
+            except BaseException:
+                logger.exception("워커 프로세스 비정상 종료")
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+        self.children[pid] = time.monotonic()
+        logger.info(f"워커 시작 - PID: {pid}")
+
+    def handle_signal(self, signum, frame) -> None:
+        """종료 시그널을 모든 워커에 전달 (워커는 진행 중인 요청을 마친 뒤 종료)."""
+        self.shutting_down = True
+        for pid in list(self.children):
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, signal.SIGTERM)
+
+    def next_restart_delay(self, uptime: float) -> float:
+        """연달아 빨리 죽을수록 재시작 대기 시간을 두 배씩 늘림 (최대값까지)."""
+        if uptime >= WORKER_STABLE_UPTIME_SECONDS:
+            return 0.0
+        return min(
+            max(self.restart_delay * 2, RESTART_BACKOFF_INITIAL_SECONDS),
+            RESTART_BACKOFF_MAX_SECONDS,
+        )
+
+    def wait_before_restart(self, delay: float) -> None:
+        """대기 중에 종료 시그널을 받으면 바로 멈춤."""
+        deadline = time.monotonic() + delay
+        while not self.shutting_down and time.monotonic() < deadline:
+            time.sleep(max(min(0.5, deadline - time.monotonic()), 0.0))
+
+    def run(self) -> None:
+        sock = self.config.bind_socket()
+        signal.signal(signal.SIGTERM, self.handle_signal)
+        signal.signal(signal.SIGINT, self.handle_signal)
+
+        # 이후 생성되는 객체만 GC 대상으로 두어 fork 후 페이지 복사를 줄임
+        gc.collect()
+        gc.freeze()
+
+        for _ in range(self.workers):
+            self.spawn(sock)
+
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            started_at = self.children.pop(pid, None)
+            if self.shutting_down:
+                logger.info(f"워커 종료 - PID: {pid}")
+                continue
+            uptime = time.monotonic() - started_at if started_at is not None else 0.0
+            self.restart_delay = self.next_restart_delay(uptime)
+            logger.warning(
+                f"워커가 예기치 않게 종료되어 재시작 - PID: {pid}, "
+                f"ExitCode: {os.waitstatus_to_exitcode(status)}, "
+                f"Uptime: {uptime:.1f}s, RestartDelay: {self.restart_delay:.1f}s"
+            )
+            self.wait_before_restart(self.restart_delay)
+            if not self.shutting_down:
+                self.spawn(sock)
+
+        sock.close()
+        logger.info("모든 워커 종료 완료")
+
+
+def main() -> None:
+    """워커 수에 맞춰 서버를 실행."""
+    workers = settings.WEB_CONCURRENCY if settings.WEB_CONCURRENCY > 0 else os.cpu_count() or 1
+    # 앱을 import할 때 프로세스별 리소스 예산(app.core.resources)이 계산되므로 먼저 전달
+    # (fork/spawn된 워커도 같은 환경 변수를 물려받음)
+    os.environ[SERVER_WORKERS_ENV] = str(workers)
+
+    # fork 이전에 앱을 로드하여 워커 간 메모리를 공유
+    from app.main import app
+
+    config = build_config(app)
+    logger.info(
+        f"서버 시작 - Workers: {workers}, Loop: {config.loop}, HTTP: {config.http}, "
+        f"Backlog: {config.backlog}, KeepAlive: {config.timeout_keep_alive}s"
+    )
+
+    if workers == 1:
+        uvicorn.Server(config).run()
+        return
+
+    # 워커들이 시작하면서 동시에 측정하면 서로 CPU를 나눠 써 해싱 시간이 부풀려지므로
+    # 마스터에서 한 번만 측정 (fork된 워커는 적용된 정책을 물려받음)
+    from app.core.hashing import password_hasher
+
+    policy = password_hasher.configure()
+    if hasattr(os, "fork"):
+        WorkerSupervisor(config, workers).run()
+    else:
+        # fork를 지원하지 않는 플랫폼은 uvicorn 멀티프로세스 모드로 대체 (사전 로드 없음)
+        # 새로 시작하는 워커에는 측정한 정책을 환경 변수로 고정해 전달
+        os.environ["PASSWORD_HASH_POLICY"] = json.dumps(policy.as_dict())
+        uvicorn.run(
+            "app.main:app",
+            host=settings.HOST,
+            port=settings.PORT,
+            workers=workers,
+            loop=config.loop,
+            http=config.http,
+            backlog=settings.SERVER_BACKLOG,
+            timeout_keep_alive=settings.SERVER_KEEPALIVE_TIMEOUT,
+            timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT,
+            access_log=settings.SERVER_ACCESS_LOG,
+            log_config=None,
+        )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,32 @@
-"""Database migration helper script"""
+"""Database migration runner (non-interactive).
+
+    python migrate.py status
+    python migrate.py upgrade [--revision head] [--dry-run] [--lock-timeout 5s]
+                              [--batch-size 5000] [--throttle 0.1]
+    python migrate.py downgrade <revision> [--yes]
+    python migrate.py sql [--revision head]
+    python migrate.py audit-indexes [--write-migration] [--include-unused]
+    python migrate.py repair-directory [--dry-run] [--grace 300]
+
+--dry-run connects to the live database and runs every pending migration
+inside a transaction that is rolled back. Plain DDL and the first batch of
+each backfill really execute, so their locks are held until the rollback;
+use it off-peak with a short --lock-timeout. Concurrent index builds are not
+run, only estimated, and the report lists estimated durations for index
+builds and batched backfills (see app.core.migrations).
+
+sql prints the upgrade SQL offline, without connecting to the database.
+
+audit-indexes compares the model metadata, the Alembic head schema and the
+live database, reports redundant and unused indexes, and can write a
+migration that drops them concurrently.
+
+repair-directory (sharding only) makes the user_directory table in
+DATABASE_URL match the users rows in the shards. It removes entries whose
+user no longer exists, fixes emails left behind by an interrupted email
+change, and restores missing entries (see app.api.users.jobs).
+"""
+import argparse
 import sys
 from pathlib import Path
 
@@ -8,85 +36,201 @@ sys.path.insert(0, str(Path(__file__).parent))
 from alembic import command
 from alembic.config import Config
 
+PROJECT_ROOT = Path(__file__).parent
 
-def main():
-    """Run database migrations."""
-    alembic_cfg = Config("alembic.ini")
 
-    print("=" * 60)
-    print("Database Migration Tool")
-    print("=" * 60)
-    print()
+def _config(args) -> Config:
+    alembic_cfg = Config(str(PROJECT_ROOT / "alembic.ini"))
+    alembic_cfg.set_main_option("script_location", str(PROJECT_ROOT / "alembic"))
+    # env.py와 app.core.migrations 헬퍼가 읽는 실행 옵션
+    for name in ("dry_run", "lock_timeout", "batch_size", "throttle_seconds"):
+        alembic_cfg.attributes[name] = getattr(args, name, None)
+    return alembic_cfg
 
-    # Show current version
-    print("Current migration status:")
-    try:
-        command.current(alembic_cfg, verbose=True)
-    except Exception as e:
-        print(f"  No migrations applied yet or database not initialized")
-    print()
 
-    # Show available migrations
-    print("Available migrations:")
-    command.history(alembic_cfg, verbose=False)
-    print()
+def _print_report() -> None:
+    from app.core.migrations import migration_report
 
-    # Prompt user
-    print("What would you like to do?")
-    print("1. Upgrade to latest (alembic upgrade head)")
-    print("2. Downgrade one version (alembic downgrade -1)")
-    print("3. Show SQL only (alembic upgrade head --sql)")
-    print("4. Reset to base (alembic downgrade base)")
-    print("5. Exit")
-    print()
+    if not migration_report:
+        print("No long-running steps (concurrent index / backfill) found.")
+        return
+    print(f"{'step':<40} {'rows':>12} {'batches':>8} {'est(s)':>10}")
+    for entry in migration_report:
+        print(
+            f"{entry['step']:<40} {entry.get('rows', '-')!s:>12} "
+            f"{entry.get('batches', '-')!s:>8} {entry['estimated_seconds']:>10.2f}"
+        )
+    total = sum(entry["estimated_seconds"] for entry in migration_report)
+    print(f"{'total':<40} {'':>12} {'':>8} {total:>10.2f}")
 
-    choice = input("Enter your choice (1-5): ").strip()
-    print()
 
-    try:
-        if choice == "1":
-            print("Upgrading to latest version...")
-            command.upgrade(alembic_cfg, "head")
-            print("✅ Migration completed successfully!")
-
-        elif choice == "2":
-            print("Downgrading one version...")
-            command.downgrade(alembic_cfg, "-1")
-            print("✅ Downgrade completed successfully!")
-
-        elif choice == "3":
-            print("Showing SQL for upgrade to head:")
-            print("-" * 60)
-            command.upgrade(alembic_cfg, "head", sql=True)
-            print("-" * 60)
-
-        elif choice == "4":
-            confirm = input("⚠️  This will reset all migrations. Are you sure? (yes/no): ")
-            if confirm.lower() == "yes":
-                print("Resetting to base...")
-                command.downgrade(alembic_cfg, "base")
-                print("✅ Reset completed successfully!")
-            else:
-                print("❌ Operation cancelled")
-
-        elif choice == "5":
-            print("Exiting...")
-            return
-
-        else:
-            print("❌ Invalid choice")
+def cmd_status(args) -> None:
+    alembic_cfg = _config(args)
+    print("Current revision:")
+    command.current(alembic_cfg, verbose=False)
+    print()
+    print("History:")
+    command.history(alembic_cfg, indicate_current=True)
+
+
+def cmd_upgrade(args) -> None:
+    alembic_cfg = _config(args)
+    if args.dry_run:
+        print(f"Dry run: upgrade to {args.revision} (rolled back)")
+        command.upgrade(alembic_cfg, args.revision)
+        _print_report()
+        return
+    print(f"Upgrading to {args.revision}...")
+    command.upgrade(alembic_cfg, args.revision)
+    command.current(alembic_cfg, verbose=False)
+
+
+def cmd_downgrade(args) -> None:
+    if args.revision == "base" and not args.yes:
+        print("Refusing to downgrade to base without --yes", file=sys.stderr)
+        sys.exit(2)
+    alembic_cfg = _config(args)
+    print(f"Downgrading to {args.revision}...")
+    command.downgrade(alembic_cfg, args.revision)
+    command.current(alembic_cfg, verbose=False)
+
+
+def cmd_sql(args) -> None:
+    command.upgrade(_config(args), args.revision, sql=True)
+
+
+def _format_index(index) -> str:
+    kind = "unique " if index.unique else ""
+    where = f" WHERE {index.where}" if index.where else ""
+    return f"{index.table}.{index.name} {kind}({', '.join(index.columns)}){where}"
+
+
+def cmd_audit_indexes(args) -> None:
+    from app.core.database import engine
+    from app.core.index_audit import audit, write_drop_migration
+
+    report = audit(engine)
+
+    print("Model metadata vs Alembic head:")
+    for line in report.metadata_vs_head or ["(in sync)"]:
+        print(f"  {line}")
+
+    print("Live database vs model metadata:")
+    for index in report.missing_in_db:
+        print(f"  missing:    {_format_index(index)}")
+    for index in report.unexpected_in_db:
+        print(f"  unexpected: {_format_index(index)}")
+    if not (report.missing_in_db or report.unexpected_in_db):
+        print("  (in sync)")
+
+    print("Redundant indexes (covered by another index):")
+    for index, keeper in report.redundant:
+        usage = report.usage.get(index.name)
+        size = f", {usage.size_bytes} bytes, {usage.scans} scans" if usage else ""
+        print(f"  {_format_index(index)} -> covered by {keeper.name}{size}")
+    if not report.redundant:
+        print("  (none)")
+
+    print("Unused indexes (idx_scan = 0 since stats reset):")
+    for index, usage in report.unused:
+        print(f"  {_format_index(index)}, {usage.size_bytes} bytes")
+    if not report.unused:
+        print("  (none, or statistics unavailable on this database)")
+
+    if args.write_migration:
+        to_drop = [index for index, _ in report.redundant]
+        if args.include_unused:
+            dropped = {index.name for index in to_drop}
+            to_drop += [index for index, _ in report.unused if index.name not in dropped]
+        if not to_drop:
+            print("Nothing to drop; no migration written.")
             return
-
-        # Show current version after operation
-        print()
-        print("Current migration status:")
-        command.current(alembic_cfg, verbose=True)
-
+        print(f"Wrote {write_drop_migration(to_drop)}")
+
+
+def cmd_repair_directory(args) -> None:
+    from app.api.users.jobs import repair_user_directory
+    from app.core.database import shard_engines
+
+    if not shard_engines:
+        print("DATABASE_SHARD_URLS is not set; nothing to repair.")
+        return
+    counts = repair_user_directory(dry_run=args.dry_run, grace_seconds=args.grace)
+    prefix = "Would fix" if args.dry_run else "Fixed"
+    print(
+        f"Checked {counts['checked']} entries. {prefix}: "
+        f"{counts['removed']} removed, {counts['renamed']} renamed, "
+        f"{counts['restored']} restored."
+    )
+    if counts["conflicts"]:
+        print(f"{counts['conflicts']} entries conflict with another email; see the log.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="\n".join(__doc__.splitlines()[1:]),
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("status", help="show current revision and history")
+
+    upgrade = subparsers.add_parser("upgrade", help="apply migrations")
+    upgrade.add_argument("--revision", default="head")
+    upgrade.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="run DDL and the first backfill batch for real in a rolled-back "
+        "transaction (takes locks) and estimate the rest",
+    )
+    upgrade.add_argument("--lock-timeout", help="max wait for table locks (e.g. 5s)")
+    upgrade.add_argument("--batch-size", type=int, help="backfill key range per batch")
+    upgrade.add_argument(
+        "--throttle", dest="throttle_seconds", type=float, help="sleep between batches"
+    )
+
+    downgrade = subparsers.add_parser("downgrade", help="revert migrations")
+    downgrade.add_argument("revision", help="target revision (e.g. -1, 002, base)")
+    downgrade.add_argument("--lock-timeout", help="max wait for table locks (e.g. 5s)")
+    downgrade.add_argument("--yes", action="store_true", help="confirm downgrade to base")
+
+    sql = subparsers.add_parser("sql", help="print SQL offline without connecting")
+    sql.add_argument("--revision", default="head")
+
+    audit = subparsers.add_parser("audit-indexes", help="find redundant/unused indexes")
+    audit.add_argument(
+        "--write-migration", action="store_true", help="write a migration dropping them"
+    )
+    audit.add_argument(
+        "--include-unused", action="store_true", help="also drop unused (0 scan) indexes"
+    )
+
+    repair = subparsers.add_parser(
+        "repair-directory", help="sync the user directory with the shards"
+    )
+    repair.add_argument("--dry-run", action="store_true", help="only count what to fix")
+    repair.add_argument(
+        "--grace",
+        type=float,
+        help="keep orphan entries younger than this many seconds (signups in progress)",
+    )
+
+    args = parser.parse_args()
+    handlers = {
+        "status": cmd_status,
+        "upgrade": cmd_upgrade,
+        "downgrade": cmd_downgrade,
+        "sql": cmd_sql,
+        "audit-indexes": cmd_audit_indexes,
+        "repair-directory": cmd_repair_directory,
+    }
+    try:
+        handlers[args.command](args)
     except Exception as e:
-        print(f"❌ Error: {e}")
+        print(f"❌ Error: {e}", file=sys.stderr)
         sys.exit(1)
 
 
 if __name__ == "__main__":
     main()
-
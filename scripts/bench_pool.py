@@ -0,0 +1,105 @@
+"""요청당 DB 연결 점유 시간 벤치마크.
+
+    DATABASE_URL=... python scripts/bench_pool.py --requests 200
+
+요청 처리 시간과 그중 풀 연결을 점유한 시간을 측정한다.
+기존 방식(의존성 종료 시까지 연결 점유)과 LazySession(서비스 호출 직후
+반환)을 같은 요청 시나리오로 비교한다.
+"""
+import argparse
+import statistics
+import time
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.core.database import LazySession, engine, get_session
+from app.core.resources import budget
+from app.main import app
+
+
+class HoldingSession(LazySession):
+    """기존 동작 재현: 의존성이 끝날 때까지 연결을 반환하지 않음."""
+
+    def release(self) -> None:
+        pass
+
+
+def holding_session():
+    session = HoldingSession(engine)
+    try:
+        yield session
+    finally:
+        Session.close(session)
+
+
+class HoldTimer:
+    """풀 체크아웃부터 체크인까지의 시간을 누적."""
+
+    def __init__(self):
+        self.total = 0.0
+        self._started: dict[int, float] = {}
+        event.listen(engine, "checkout", self.on_checkout)
+        event.listen(engine, "checkin", self.on_checkin)
+
+    def on_checkout(self, dbapi_conn, record, proxy):
+        self._started[id(record)] = time.perf_counter()
+
+    def on_checkin(self, dbapi_conn, record):
+        started = self._started.pop(id(record), None)
+        if started is not None:
+            self.total += time.perf_counter() - started
+
+
+def run_scenario(client: TestClient, timer: HoldTimer, count: int) -> tuple[list, list]:
+    """회원가입 → 로그인 → 내 정보 → 단건 조회 → 목록 조회 반복."""
+    holds, durations = [], []
+    password = "password123"
+    for _ in range(count):
+        email = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+        steps = [
+            ("post", "/api/v1/auth/register", {"json": {"email": email, "password": password, "name": "bench"}}),
+            ("post", "/api/v1/auth/login", {"json": {"email": email, "password": password}}),
+        ]
+        responses = []
+        for method, path, kwargs in steps:
+            before, start = timer.total, time.perf_counter()
+            responses.append(getattr(client, method)(path, **kwargs))
+            durations.append(time.perf_counter() - start)
+            holds.append(timer.total - before)
+
+        user_id = responses[0].json()["id"]
+        headers = {"Authorization": f"Bearer {responses[1].json()['access_token']}"}
+        for path in ("/api/v1/auth/me", f"/api/v1/users/{user_id}", "/api/v1/users"):
+            before, start = timer.total, time.perf_counter()
+            client.get(path, headers=headers)
+            durations.append(time.perf_counter() - start)
+            holds.append(timer.total - before)
+    return holds, durations
+
+
+def report(name: str, holds: list, durations: list) -> None:
+    hold_ms = statistics.mean(holds) * 1000
+    duration_ms = statistics.mean(durations) * 1000
+    print(f"{name:>10} {duration_ms:>12.2f} {hold_ms:>12.2f} {hold_ms / duration_ms:>9.1%}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=50, help="시나리오 반복 횟수")
+    args = parser.parse_args()
+
+    timer = HoldTimer()
+    print(f"pool_size={budget.db_pool_size}")
+    print(f"{'session':>10} {'request(ms)':>12} {'held(ms)':>12} {'held/req':>9}")
+    with TestClient(app) as client:
+        app.dependency_overrides[get_session] = holding_session
+        report("holding", *run_scenario(client, timer, args.requests))
+        app.dependency_overrides.clear()
+        report("lazy", *run_scenario(client, timer, args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""사용자 단건 조회 경로별 CPU 시간 벤치마크 (ORM vs lean).
+
+    DATABASE_URL=... python scripts/bench_reads.py --users 1000 --queries 5000
+
+users 테이블에 임시 사용자를 넣고 ID/이메일 단건 조회를 ORM 경로
+(select(User), session.get)와 lean 경로(app.api.users.queries)로 번갈아 실행해
+조회 1회당 프로세스 CPU 시간(µs)을 잰다. 요청처럼 조회마다 세션을 새로 연다.
+DB 대기 시간은 빼고 파이썬 쪽 비용만 보기 위해 time.process_time을 쓴다.
+끝나면 넣은 사용자를 지우지만 스크래치 DB에서 실행한다.
+"""
+import argparse
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import delete, insert
+from sqlmodel import select
+
+from app.api.users.models import User
+from app.api.users.queries import user_row_by_email, user_row_by_id
+from app.core.database import (
+    create_db_and_tables,
+    create_session,
+    engine,
+    shard_engines,
+    user_shards,
+)
+from app.core.sharding import UserDirectory, shard_for_user
+
+
+def orm_by_id(session, user_id):
+    return session.get(User, user_id)
+
+
+def orm_by_email(session, email):
+    return session.exec(select(User).where(User.email == email)).first()
+
+
+QUERIES = {
+    "by id": (orm_by_id, user_row_by_id, "id"),
+    "by email": (orm_by_email, user_row_by_email, "email"),
+}
+
+
+def _seed(count: int) -> tuple[str, list[dict]]:
+    """접두사가 붙은 임시 사용자를 모든 샤드에 나눠 넣고 (접두사, 행 목록) 반환."""
+    now = datetime.utcnow()
+    prefix = f"bench-{uuid.uuid4().hex[:8]}"
+    base_id = random.randrange(10**9, 2 * 10**9)
+    rows = [
+        {
+            "id": base_id + i,
+            "email": f"{prefix}-{i}@example.com",
+            "hashed_password": "x" * 60,
+            "name": f"user {i}",
+            "created_at": now,
+            "updated_at": now,
+            "login_count": 0,
+        }
+        for i in range(count)
+    ]
+    # 조회는 ID 해시로 정해진 샤드로 가므로 행도 그 샤드에 넣음
+    for shard_id, shard_engine in user_shards():
+        shard_rows = [
+            row for row in rows if shard_id is None or shard_for_user(row["id"]) == shard_id
+        ]
+        if shard_rows:
+            with shard_engine.begin() as conn:
+                conn.execute(insert(User.__table__), shard_rows)
+    if shard_engines:
+        # 이메일 조회가 샤드를 찾을 수 있도록 디렉터리에도 등록
+        with engine.begin() as conn:
+            conn.execute(
+                insert(UserDirectory.__table__),
+                [
+                    {
+                        "id": row["id"],
+                        "email": row["email"],
+                        "shard_id": shard_for_user(row["id"]),
+                        "created_at": now,
+                    }
+                    for row in rows
+                ],
+            )
+    return prefix, rows
+
+
+def _cleanup(prefix: str) -> None:
+    if shard_engines:
+        with engine.begin() as conn:
+            conn.execute(
+                delete(UserDirectory.__table__).where(UserDirectory.email.startswith(prefix))
+            )
+    for _, shard_engine in user_shards():
+        with shard_engine.begin() as conn:
+            conn.execute(delete(User.__table__).where(User.email.startswith(prefix)))
+
+
+def _measure(lookup, keys: list) -> float:
+    """조회 1회당 CPU 시간 (µs)."""
+    start = time.process_time()
+    for key in keys:
+        with create_session() as session:
+            lookup(session, key)
+    return (time.process_time() - start) / len(keys) * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=5000, help="경로별 조회 횟수")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    create_db_and_tables()
+    prefix, rows = _seed(args.users)
+    try:
+        for name, (orm_lookup, lean_lookup, column) in QUERIES.items():
+            keys = [random.choice(rows)[column] for _ in range(args.queries)]
+            # 연결 풀과 문 캐시를 채운 뒤 측정
+            _measure(orm_lookup, keys[:100])
+            _measure(lean_lookup, keys[:100])
+            orm = statistics.median(_measure(orm_lookup, keys) for _ in range(args.runs))
+            lean = statistics.median(_measure(lean_lookup, keys) for _ in range(args.runs))
+            print(
+                f"{name}: orm {orm:.0f} µs/query, lean {lean:.0f} µs/query "
+                f"({(1 - lean / orm) * 100:.0f}% less CPU)"
+            )
+    finally:
+        _cleanup(prefix)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""워밍업 여부에 따른 첫 요청 지연 시간 비교.
+
+    python scripts/bench_warmup.py --runs 5
+
+WARMUP_ENABLED를 켜고/끈 상태로 app.server(워커 1개)를 매번 새로 띄우고,
+포트가 열리자마자 회원가입 -> 로그인 -> 사용자 목록 -> OpenAPI 순서로 첫 요청을
+보내 각각의 지연 시간을 잰다. 준비 확인 요청 자체가 워밍업이 되지 않도록
+HTTP 대신 TCP 연결로만 서버 기동을 확인한다.
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _wait_for_port(port: int, timeout: float = 30.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        with socket.socket() as sock:
+            if sock.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.05)
+    raise RuntimeError(f"서버가 {timeout}초 안에 포트 {port}를 열지 않았습니다")
+
+
+def _first_requests(base_url: str) -> dict[str, float]:
+    email = f"warmup-{uuid.uuid4().hex[:12]}@example.com"
+    password = "password123"
+    requests = [
+        ("register", "POST", "/api/v1/auth/register",
+         {"email": email, "password": password, "name": "warmup"}),
+        ("login", "POST", "/api/v1/auth/login", {"email": email, "password": password}),
+        ("list_users", "GET", "/api/v1/users?limit=10", None),
+        ("openapi", "GET", "/openapi.json", None),
+    ]
+    latencies = {}
+    with httpx.Client(base_url=base_url, timeout=30) as client:
+        for name, method, path, body in requests:
+            start = time.perf_counter()
+            response = client.request(method, path, json=body)
+            latencies[name] = (time.perf_counter() - start) * 1000
+            response.raise_for_status()
+    return latencies
+
+
+def run_once(warmup: bool, args) -> dict[str, float]:
+    env = {
+        **os.environ,
+        "WEB_CONCURRENCY": "1",
+        "PORT": str(args.port),
+        "SERVER_ACCESS_LOG": "false",
+        "WARMUP_ENABLED": str(warmup).lower(),
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.server"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_for_port(args.port)
+        return _first_requests(f"http://127.0.0.1:{args.port}")
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="설정별 서버 기동 횟수")
+    parser.add_argument("--port", type=int, default=8012)
+    args = parser.parse_args()
+
+    results = {}
+    for warmup in (False, True):
+        runs = [run_once(warmup, args) for _ in range(args.runs)]
+        results[warmup] = {
+            name: statistics.median(run[name] for run in runs) for name in runs[0]
+        }
+
+    print(f"{'request':>12} {'cold(ms)':>10} {'warm(ms)':>10}")
+    for name in results[False]:
+        print(f"{name:>12} {results[False][name]:>10.2f} {results[True][name]:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""워커 수별 처리량 벤치마크.
+
+    python scripts/bench_workers.py --workers 1 4 --path /health --duration 10
+
+각 워커 수마다 app.server를 띄우고 동시 요청을 보내 초당 처리량과
+지연 시간 백분위를 출력한다. 부하 생성기 자체가 병목이 되지 않도록
+클라이언트도 여러 프로세스로 실행한다.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _client_process(url: str, concurrency: int, duration: float, queue) -> None:
+    async def run() -> list[float]:
+        latencies: list[float] = []
+        deadline = time.perf_counter() + duration
+        async with httpx.AsyncClient(timeout=10) as client:
+
+            async def worker() -> None:
+                while time.perf_counter() < deadline:
+                    start = time.perf_counter()
+                    response = await client.get(url)
+                    if response.status_code < 500:
+                        latencies.append(time.perf_counter() - start)
+
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return latencies
+
+    queue.put(asyncio.run(run()))
+
+
+def _wait_until_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            httpx.get(url, timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f"서버가 {timeout}초 안에 준비되지 않았습니다: {url}")
+
+
+def bench(workers: int, args) -> dict:
+    url = f"http://127.0.0.1:{args.port}{args.path}"
+    env = {
+        **os.environ,
+        "WEB_CONCURRENCY": str(workers),
+        "PORT": str(args.port),
+        "SERVER_ACCESS_LOG": "false",
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.server"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_until_ready(url)
+        queue = multiprocessing.Queue()
+        clients = [
+            multiprocessing.Process(
+                target=_client_process,
+                args=(url, args.concurrency, args.duration, queue),
+            )
+            for _ in range(args.clients)
+        ]
+        for client in clients:
+            client.start()
+        latencies = [latency for _ in clients for latency in queue.get()]
+        for client in clients:
+            client.join()
+    finally:
+        server.terminate()
+        server.wait(timeout=args.duration + 30)
+
+    latencies.sort()
+    return {
+        "workers": workers,
+        "rps": len(latencies) / args.duration,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--path", default="/")
+    parser.add_argument("--port", type=int, default=8011)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--clients", type=int, default=4, help="부하 생성 프로세스 수")
+    parser.add_argument("--concurrency", type=int, default=32, help="프로세스당 동시 요청 수")
+    args = parser.parse_args()
+
+    print(f"{'workers':>8} {'req/s':>10} {'p50(ms)':>10} {'p99(ms)':>10}")
+    for workers in args.workers:
+        result = bench(workers, args)
+        print(
+            f"{result['workers']:>8} {result['rps']:>10.1f} "
+            f"{result['p50_ms']:>10.2f} {result['p99_ms']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
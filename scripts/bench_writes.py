@@ -0,0 +1,93 @@
+"""users 테이블 인덱스 구성별 쓰기 처리량 벤치마크.
+
+    DATABASE_URL=... python scripts/bench_writes.py --rows 20000
+    DATABASE_URL=... python scripts/bench_writes.py --rows 20000 --duplicate-email-index
+
+User 모델 정의를 그대로 복제한 임시 테이블(bench_users)에 INSERT와 이메일
+UPDATE를 배치로 실행해 초당 처리 행 수를 잰다. --duplicate-email-index는
+정리 전 상태(email에 B-tree가 하나 더 있음)를 재현한다. 실제 users 테이블은
+건드리지 않지만 임시 테이블을 만들고 지우므로 스크래치 DB에서 실행한다.
+"""
+import argparse
+import statistics
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Index, MetaData, update
+
+from app.api.users.models import User
+from app.core.database import engine
+
+
+def _bench_table(duplicate_email_index: bool):
+    table = User.__table__.to_metadata(MetaData(), name="bench_users")
+    # PostgreSQL은 인덱스 이름이 스키마 전체에서 유일해야 하므로 접두사를 붙임
+    for index in table.indexes:
+        index.name = f"bench_{index.name}"
+    if duplicate_email_index:
+        Index("bench_ix_email_duplicate", table.c.email)
+    return table
+
+
+def run_once(args) -> tuple[float, float]:
+    table = _bench_table(args.duplicate_email_index)
+    table.drop(engine, checkfirst=True)
+    table.create(engine)
+    try:
+        now = datetime.utcnow()
+        prefix = uuid.uuid4().hex[:8]
+        rows = [
+            {
+                "email": f"{prefix}-{i}@example.com",
+                "hashed_password": "x" * 60,
+                "name": f"user {i}",
+                "created_at": now,
+                "updated_at": now,
+                "login_count": 0,
+            }
+            for i in range(args.rows)
+        ]
+
+        start = time.perf_counter()
+        for offset in range(0, args.rows, args.batch):
+            with engine.begin() as conn:
+                conn.execute(table.insert(), rows[offset : offset + args.batch])
+        insert_rate = args.rows / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for offset in range(0, args.rows, args.batch):
+            with engine.begin() as conn:
+                for i in range(offset + 1, min(offset + args.batch, args.rows) + 1):
+                    conn.execute(
+                        update(table)
+                        .where(table.c.id == i)
+                        .values(email=f"{prefix}-changed-{i}@example.com")
+                    )
+        update_rate = args.rows / (time.perf_counter() - start)
+        return insert_rate, update_rate
+    finally:
+        table.drop(engine, checkfirst=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--batch", type=int, default=500, help="트랜잭션당 행 수")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument(
+        "--duplicate-email-index",
+        action="store_true",
+        help="email에 중복 인덱스를 하나 더 만들어 정리 전 상태를 재현",
+    )
+    args = parser.parse_args()
+
+    results = [run_once(args) for _ in range(args.runs)]
+    inserts = statistics.median(result[0] for result in results)
+    updates = statistics.median(result[1] for result in results)
+    indexes = "duplicate email index" if args.duplicate_email_index else "current indexes"
+    print(f"{indexes}: insert {inserts:.0f} rows/s, email update {updates:.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()